@@ -15,8 +15,9 @@ from app.core.config import settings
 # Import all models so Alembic can detect them
 from app.models.oauth import GHLApplication, GHLAgencyToken, GHLLocationToken
 from app.models.location import Location, LocationDetail
-from app.models.contact import Contact, Opportunity, Task, Conversation
+from app.models.contact import Contact, Opportunity, Task, Conversation, Message
 from app.models.webhook import WebhookEvent
+from app.models.auth import APIKey, TokenBlacklist, UserSession, TwoFactorAuth, IPWhitelist
 
 # this is the Alembic Config object
 config = context.config
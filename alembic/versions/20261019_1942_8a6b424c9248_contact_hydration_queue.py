@@ -0,0 +1,46 @@
+"""contact hydration queue
+
+Revision ID: 8a6b424c9248
+Revises: dc7102e388ba
+Create Date: 2026-10-19 19:42:30.000000
+
+Partial index of contacts still waiting for details, and the claim
+timestamp the hydration worker uses instead of holding row locks. The
+index is built concurrently so contact writes aren't blocked.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a6b424c9248'
+down_revision = 'dc7102e388ba'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'contacts', sa.Column('hydration_claimed_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'idx_contact_unhydrated',
+                'contacts',
+                [
+                    'location_id',
+                    sa.text('last_touch_date DESC NULLS LAST'),
+                    sa.text('date_added DESC NULLS LAST'),
+                    'id',
+                ],
+                unique=False,
+                postgresql_where=sa.text("details_fetched = 'false'"),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        op.drop_index('idx_contact_unhydrated', table_name='contacts')
+    op.drop_column('contacts', 'hydration_claimed_at')
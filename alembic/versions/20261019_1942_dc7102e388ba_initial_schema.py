@@ -0,0 +1,406 @@
+"""initial schema
+
+Revision ID: dc7102e388ba
+Revises: 
+Create Date: 2026-10-19 19:42:00.000000
+
+Tables as they were before schema changes shipped with migrations.
+Databases created earlier with init_db() (Base.metadata.create_all)
+already have them: when any table exists, this revision only records
+itself and later revisions upgrade from there.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dc7102e388ba'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not op.get_context().as_sql:
+        existing = set(sa.inspect(op.get_bind()).get_table_names()) - {'alembic_version'}
+        if existing:
+            return  # Created by init_db(); adopt as is
+
+    op.create_table('api_keys',
+    sa.Column('key_hash', sa.String(length=255), nullable=False),
+    sa.Column('key_prefix', sa.String(length=16), nullable=False),
+    sa.Column('owner_id', sa.String(length=255), nullable=False),
+    sa.Column('owner_type', sa.String(length=50), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('scopes', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('allowed_ips', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_apikey_active', 'api_keys', ['is_active', 'expires_at'], unique=False)
+    op.create_index('idx_apikey_owner', 'api_keys', ['owner_id', 'owner_type'], unique=False)
+    op.create_index(op.f('ix_api_keys_id'), 'api_keys', ['id'], unique=False)
+    op.create_index(op.f('ix_api_keys_key_hash'), 'api_keys', ['key_hash'], unique=True)
+    op.create_index(op.f('ix_api_keys_owner_id'), 'api_keys', ['owner_id'], unique=False)
+    op.create_table('ghl_agency_tokens',
+    sa.Column('company_id', sa.String(length=255), nullable=False),
+    sa.Column('app_id', sa.String(length=255), nullable=False),
+    sa.Column('access_token', sa.String(length=1024), nullable=False),
+    sa.Column('refresh_token', sa.String(length=1024), nullable=False),
+    sa.Column('token_expiry', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_company_app', 'ghl_agency_tokens', ['company_id', 'app_id'], unique=True)
+    op.create_index(op.f('ix_ghl_agency_tokens_app_id'), 'ghl_agency_tokens', ['app_id'], unique=False)
+    op.create_index(op.f('ix_ghl_agency_tokens_company_id'), 'ghl_agency_tokens', ['company_id'], unique=False)
+    op.create_index(op.f('ix_ghl_agency_tokens_id'), 'ghl_agency_tokens', ['id'], unique=False)
+    op.create_table('ghl_applications',
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('app_id', sa.String(length=255), nullable=False),
+    sa.Column('client_id', sa.String(length=255), nullable=False),
+    sa.Column('client_secret', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_app_id_active', 'ghl_applications', ['app_id', 'is_active'], unique=False)
+    op.create_index(op.f('ix_ghl_applications_app_id'), 'ghl_applications', ['app_id'], unique=True)
+    op.create_index(op.f('ix_ghl_applications_id'), 'ghl_applications', ['id'], unique=False)
+    op.create_table('ghl_location_tokens',
+    sa.Column('location_id', sa.String(length=255), nullable=False),
+    sa.Column('app_id', sa.String(length=255), nullable=False),
+    sa.Column('access_token', sa.String(length=1024), nullable=False),
+    sa.Column('refresh_token', sa.String(length=1024), nullable=True),
+    sa.Column('token_expiry', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_location_app', 'ghl_location_tokens', ['location_id', 'app_id'], unique=True)
+    op.create_index(op.f('ix_ghl_location_tokens_app_id'), 'ghl_location_tokens', ['app_id'], unique=False)
+    op.create_index(op.f('ix_ghl_location_tokens_id'), 'ghl_location_tokens', ['id'], unique=False)
+    op.create_index(op.f('ix_ghl_location_tokens_location_id'), 'ghl_location_tokens', ['location_id'], unique=False)
+    op.create_table('ip_whitelist',
+    sa.Column('ip_address', sa.String(length=45), nullable=False),
+    sa.Column('cidr_range', sa.String(length=50), nullable=True),
+    sa.Column('owner_id', sa.String(length=255), nullable=False),
+    sa.Column('owner_type', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_whitelist_ip_active', 'ip_whitelist', ['ip_address', 'is_active'], unique=False)
+    op.create_index(op.f('ix_ip_whitelist_id'), 'ip_whitelist', ['id'], unique=False)
+    op.create_index(op.f('ix_ip_whitelist_ip_address'), 'ip_whitelist', ['ip_address'], unique=False)
+    op.create_index(op.f('ix_ip_whitelist_owner_id'), 'ip_whitelist', ['owner_id'], unique=False)
+    op.create_table('locations',
+    sa.Column('location_id', sa.String(length=255), nullable=False),
+    sa.Column('company_id', sa.String(length=255), nullable=True),
+    sa.Column('app_id', sa.String(length=255), nullable=True),
+    sa.Column('name', sa.String(length=500), nullable=False),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('city', sa.String(length=255), nullable=True),
+    sa.Column('state', sa.String(length=100), nullable=True),
+    sa.Column('country', sa.String(length=100), nullable=True),
+    sa.Column('postal_code', sa.String(length=50), nullable=True),
+    sa.Column('timezone', sa.String(length=100), nullable=True),
+    sa.Column('is_installed', sa.Boolean(), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('website', sa.String(length=500), nullable=True),
+    sa.Column('contacts_count', sa.Integer(), nullable=True),
+    sa.Column('opportunities_count', sa.Integer(), nullable=True),
+    sa.Column('openai_api_key', sa.String(length=255), nullable=True),
+    sa.Column('automation_template', sa.String(length=255), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_locations_app_id'), 'locations', ['app_id'], unique=False)
+    op.create_index(op.f('ix_locations_company_id'), 'locations', ['company_id'], unique=False)
+    op.create_index(op.f('ix_locations_id'), 'locations', ['id'], unique=False)
+    op.create_index(op.f('ix_locations_location_id'), 'locations', ['location_id'], unique=True)
+    op.create_table('token_blacklist',
+    sa.Column('jti', sa.String(length=255), nullable=False),
+    sa.Column('token_type', sa.String(length=20), nullable=False),
+    sa.Column('user_id', sa.String(length=255), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('reason', sa.String(length=255), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_blacklist_expiry', 'token_blacklist', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_token_blacklist_id'), 'token_blacklist', ['id'], unique=False)
+    op.create_index(op.f('ix_token_blacklist_jti'), 'token_blacklist', ['jti'], unique=True)
+    op.create_index(op.f('ix_token_blacklist_user_id'), 'token_blacklist', ['user_id'], unique=False)
+    op.create_table('two_factor_auth',
+    sa.Column('user_id', sa.String(length=255), nullable=False),
+    sa.Column('totp_secret', sa.String(length=255), nullable=False),
+    sa.Column('backup_codes', sa.Text(), nullable=True),
+    sa.Column('is_enabled', sa.Boolean(), nullable=True),
+    sa.Column('verified_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('recovery_email', sa.String(length=255), nullable=True),
+    sa.Column('recovery_phone', sa.String(length=50), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_two_factor_auth_id'), 'two_factor_auth', ['id'], unique=False)
+    op.create_index(op.f('ix_two_factor_auth_user_id'), 'two_factor_auth', ['user_id'], unique=True)
+    op.create_table('user_sessions',
+    sa.Column('session_id', sa.String(length=255), nullable=False),
+    sa.Column('user_id', sa.String(length=255), nullable=False),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.Text(), nullable=True),
+    sa.Column('location', sa.String(length=255), nullable=True),
+    sa.Column('refresh_token_hash', sa.String(length=255), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('last_activity', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('requires_2fa', sa.Boolean(), nullable=True),
+    sa.Column('is_2fa_verified', sa.Boolean(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_session_expiry', 'user_sessions', ['expires_at'], unique=False)
+    op.create_index('idx_session_user_active', 'user_sessions', ['user_id', 'is_active'], unique=False)
+    op.create_index(op.f('ix_user_sessions_id'), 'user_sessions', ['id'], unique=False)
+    op.create_index(op.f('ix_user_sessions_session_id'), 'user_sessions', ['session_id'], unique=True)
+    op.create_index(op.f('ix_user_sessions_user_id'), 'user_sessions', ['user_id'], unique=False)
+    op.create_table('webhook_events',
+    sa.Column('event_type', sa.String(length=100), nullable=False),
+    sa.Column('location_id', sa.String(length=255), nullable=True),
+    sa.Column('company_id', sa.String(length=255), nullable=True),
+    sa.Column('user_id', sa.String(length=255), nullable=True),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('event_timestamp', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('processed', sa.String(length=20), nullable=True),
+    sa.Column('error_message', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_webhook_processed', 'webhook_events', ['processed', 'created_at'], unique=False)
+    op.create_index('idx_webhook_type_location', 'webhook_events', ['event_type', 'location_id'], unique=False)
+    op.create_index(op.f('ix_webhook_events_company_id'), 'webhook_events', ['company_id'], unique=False)
+    op.create_index(op.f('ix_webhook_events_event_type'), 'webhook_events', ['event_type'], unique=False)
+    op.create_index(op.f('ix_webhook_events_id'), 'webhook_events', ['id'], unique=False)
+    op.create_index(op.f('ix_webhook_events_location_id'), 'webhook_events', ['location_id'], unique=False)
+    op.create_table('contacts',
+    sa.Column('external_id', sa.String(length=255), nullable=False),
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('contact_name', sa.String(length=500), nullable=True),
+    sa.Column('first_name', sa.String(length=255), nullable=True),
+    sa.Column('last_name', sa.String(length=255), nullable=True),
+    sa.Column('email', sa.String(length=255), nullable=True),
+    sa.Column('phone', sa.String(length=50), nullable=True),
+    sa.Column('timezone', sa.String(length=100), nullable=True),
+    sa.Column('country', sa.String(length=100), nullable=True),
+    sa.Column('address', sa.String(length=500), nullable=True),
+    sa.Column('source', sa.String(length=255), nullable=True),
+    sa.Column('date_added', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('business_id', sa.String(length=255), nullable=True),
+    sa.Column('tags', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=255), nullable=True),
+    sa.Column('channel', sa.String(length=255), nullable=True),
+    sa.Column('assigned_to', sa.String(length=255), nullable=True),
+    sa.Column('created_by', sa.String(length=255), nullable=True),
+    sa.Column('ai_status', sa.String(length=100), nullable=True),
+    sa.Column('ai_summary', sa.Text(), nullable=True),
+    sa.Column('ai_quality_grade', sa.String(length=50), nullable=True),
+    sa.Column('ai_sales_grade', sa.String(length=50), nullable=True),
+    sa.Column('touch_summary', sa.String(length=255), nullable=True),
+    sa.Column('engagement_summary', sa.Text(), nullable=True),
+    sa.Column('last_touch_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_message', sa.Text(), nullable=True),
+    sa.Column('speed_to_lead', sa.String(length=100), nullable=True),
+    sa.Column('crm_tasks', sa.String(length=100), nullable=True),
+    sa.Column('opportunities_count', sa.Integer(), nullable=True),
+    sa.Column('total_pipeline_value', sa.Float(), nullable=True),
+    sa.Column('attribution', sa.Text(), nullable=True),
+    sa.Column('followers', sa.Text(), nullable=True),
+    sa.Column('details_fetched', sa.String(length=20), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_contact_date', 'contacts', ['location_id', 'date_added'], unique=False)
+    op.create_index('idx_contact_location', 'contacts', ['external_id', 'location_id'], unique=True)
+    op.create_index(op.f('ix_contacts_date_added'), 'contacts', ['date_added'], unique=False)
+    op.create_index(op.f('ix_contacts_email'), 'contacts', ['email'], unique=False)
+    op.create_index(op.f('ix_contacts_external_id'), 'contacts', ['external_id'], unique=False)
+    op.create_index(op.f('ix_contacts_id'), 'contacts', ['id'], unique=False)
+    op.create_index(op.f('ix_contacts_location_id'), 'contacts', ['location_id'], unique=False)
+    op.create_table('location_details',
+    sa.Column('location_id', sa.Integer(), nullable=False),
+    sa.Column('business_name', sa.String(length=500), nullable=True),
+    sa.Column('logo_url', sa.String(length=1000), nullable=True),
+    sa.Column('domain', sa.String(length=500), nullable=True),
+    sa.Column('facebook_url', sa.String(length=500), nullable=True),
+    sa.Column('instagram', sa.String(length=255), nullable=True),
+    sa.Column('linkedin', sa.String(length=500), nullable=True),
+    sa.Column('twitter', sa.String(length=255), nullable=True),
+    sa.Column('youtube', sa.String(length=500), nullable=True),
+    sa.Column('settings_json', sa.Text(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['location_id'], ['locations.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('location_id')
+    )
+    op.create_index(op.f('ix_location_details_id'), 'location_details', ['id'], unique=False)
+    op.create_table('conversations',
+    sa.Column('external_id', sa.String(length=255), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.Column('channel', sa.String(length=100), nullable=True),
+    sa.Column('last_message_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('unread_count', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_conversations_contact_id'), 'conversations', ['contact_id'], unique=False)
+    op.create_index(op.f('ix_conversations_external_id'), 'conversations', ['external_id'], unique=True)
+    op.create_index(op.f('ix_conversations_id'), 'conversations', ['id'], unique=False)
+    op.create_table('opportunities',
+    sa.Column('external_id', sa.String(length=255), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=500), nullable=True),
+    sa.Column('pipeline_id', sa.String(length=255), nullable=True),
+    sa.Column('pipeline_stage_id', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=100), nullable=True),
+    sa.Column('monetary_value', sa.Float(), nullable=True),
+    sa.Column('created_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_updated', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_opportunities_contact_id'), 'opportunities', ['contact_id'], unique=False)
+    op.create_index(op.f('ix_opportunities_external_id'), 'opportunities', ['external_id'], unique=True)
+    op.create_index(op.f('ix_opportunities_id'), 'opportunities', ['id'], unique=False)
+    op.create_table('tasks',
+    sa.Column('external_id', sa.String(length=255), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=500), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=100), nullable=True),
+    sa.Column('priority', sa.String(length=50), nullable=True),
+    sa.Column('assigned_to', sa.String(length=255), nullable=True),
+    sa.Column('due_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('completed_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tasks_contact_id'), 'tasks', ['contact_id'], unique=False)
+    op.create_index(op.f('ix_tasks_external_id'), 'tasks', ['external_id'], unique=True)
+    op.create_index(op.f('ix_tasks_id'), 'tasks', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tasks_id'), table_name='tasks')
+    op.drop_index(op.f('ix_tasks_external_id'), table_name='tasks')
+    op.drop_index(op.f('ix_tasks_contact_id'), table_name='tasks')
+    op.drop_table('tasks')
+    op.drop_index(op.f('ix_opportunities_id'), table_name='opportunities')
+    op.drop_index(op.f('ix_opportunities_external_id'), table_name='opportunities')
+    op.drop_index(op.f('ix_opportunities_contact_id'), table_name='opportunities')
+    op.drop_table('opportunities')
+    op.drop_index(op.f('ix_conversations_id'), table_name='conversations')
+    op.drop_index(op.f('ix_conversations_external_id'), table_name='conversations')
+    op.drop_index(op.f('ix_conversations_contact_id'), table_name='conversations')
+    op.drop_table('conversations')
+    op.drop_index(op.f('ix_location_details_id'), table_name='location_details')
+    op.drop_table('location_details')
+    op.drop_index(op.f('ix_contacts_location_id'), table_name='contacts')
+    op.drop_index(op.f('ix_contacts_id'), table_name='contacts')
+    op.drop_index(op.f('ix_contacts_external_id'), table_name='contacts')
+    op.drop_index(op.f('ix_contacts_email'), table_name='contacts')
+    op.drop_index(op.f('ix_contacts_date_added'), table_name='contacts')
+    op.drop_index('idx_contact_location', table_name='contacts')
+    op.drop_index('idx_contact_date', table_name='contacts')
+    op.drop_table('contacts')
+    op.drop_index(op.f('ix_webhook_events_location_id'), table_name='webhook_events')
+    op.drop_index(op.f('ix_webhook_events_id'), table_name='webhook_events')
+    op.drop_index(op.f('ix_webhook_events_event_type'), table_name='webhook_events')
+    op.drop_index(op.f('ix_webhook_events_company_id'), table_name='webhook_events')
+    op.drop_index('idx_webhook_type_location', table_name='webhook_events')
+    op.drop_index('idx_webhook_processed', table_name='webhook_events')
+    op.drop_table('webhook_events')
+    op.drop_index(op.f('ix_user_sessions_user_id'), table_name='user_sessions')
+    op.drop_index(op.f('ix_user_sessions_session_id'), table_name='user_sessions')
+    op.drop_index(op.f('ix_user_sessions_id'), table_name='user_sessions')
+    op.drop_index('idx_session_user_active', table_name='user_sessions')
+    op.drop_index('idx_session_expiry', table_name='user_sessions')
+    op.drop_table('user_sessions')
+    op.drop_index(op.f('ix_two_factor_auth_user_id'), table_name='two_factor_auth')
+    op.drop_index(op.f('ix_two_factor_auth_id'), table_name='two_factor_auth')
+    op.drop_table('two_factor_auth')
+    op.drop_index(op.f('ix_token_blacklist_user_id'), table_name='token_blacklist')
+    op.drop_index(op.f('ix_token_blacklist_jti'), table_name='token_blacklist')
+    op.drop_index(op.f('ix_token_blacklist_id'), table_name='token_blacklist')
+    op.drop_index('idx_blacklist_expiry', table_name='token_blacklist')
+    op.drop_table('token_blacklist')
+    op.drop_index(op.f('ix_locations_location_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_company_id'), table_name='locations')
+    op.drop_index(op.f('ix_locations_app_id'), table_name='locations')
+    op.drop_table('locations')
+    op.drop_index(op.f('ix_ip_whitelist_owner_id'), table_name='ip_whitelist')
+    op.drop_index(op.f('ix_ip_whitelist_ip_address'), table_name='ip_whitelist')
+    op.drop_index(op.f('ix_ip_whitelist_id'), table_name='ip_whitelist')
+    op.drop_index('idx_whitelist_ip_active', table_name='ip_whitelist')
+    op.drop_table('ip_whitelist')
+    op.drop_index(op.f('ix_ghl_location_tokens_location_id'), table_name='ghl_location_tokens')
+    op.drop_index(op.f('ix_ghl_location_tokens_id'), table_name='ghl_location_tokens')
+    op.drop_index(op.f('ix_ghl_location_tokens_app_id'), table_name='ghl_location_tokens')
+    op.drop_index('idx_location_app', table_name='ghl_location_tokens')
+    op.drop_table('ghl_location_tokens')
+    op.drop_index(op.f('ix_ghl_applications_id'), table_name='ghl_applications')
+    op.drop_index(op.f('ix_ghl_applications_app_id'), table_name='ghl_applications')
+    op.drop_index('idx_app_id_active', table_name='ghl_applications')
+    op.drop_table('ghl_applications')
+    op.drop_index(op.f('ix_ghl_agency_tokens_id'), table_name='ghl_agency_tokens')
+    op.drop_index(op.f('ix_ghl_agency_tokens_company_id'), table_name='ghl_agency_tokens')
+    op.drop_index(op.f('ix_ghl_agency_tokens_app_id'), table_name='ghl_agency_tokens')
+    op.drop_index('idx_company_app', table_name='ghl_agency_tokens')
+    op.drop_table('ghl_agency_tokens')
+    op.drop_index(op.f('ix_api_keys_owner_id'), table_name='api_keys')
+    op.drop_index(op.f('ix_api_keys_key_hash'), table_name='api_keys')
+    op.drop_index(op.f('ix_api_keys_id'), table_name='api_keys')
+    op.drop_index('idx_apikey_owner', table_name='api_keys')
+    op.drop_index('idx_apikey_active', table_name='api_keys')
+    op.drop_table('api_keys')
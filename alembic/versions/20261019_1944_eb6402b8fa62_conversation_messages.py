@@ -0,0 +1,53 @@
+"""conversation messages
+
+Revision ID: eb6402b8fa62
+Revises: 8a6b424c9248
+Create Date: 2026-10-19 19:44:00.000000
+
+Messages ingested with their conversations, read by the touch metrics
+in SQL. Foreign keys are named so a later revision can replace them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'eb6402b8fa62'
+down_revision = '8a6b424c9248'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('messages',
+    sa.Column('external_id', sa.String(length=255), nullable=False),
+    sa.Column('conversation_id', sa.Integer(), nullable=False),
+    sa.Column('contact_id', sa.Integer(), nullable=False),
+    sa.Column('direction', sa.String(length=20), nullable=True),
+    sa.Column('message_type', sa.String(length=100), nullable=True),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('date_added', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(),
+              nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(),
+              nullable=False),
+    sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], name='messages_contact_id_fkey'),
+    sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'],
+                            name='messages_conversation_id_fkey'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_message_contact_date', 'messages', ['contact_id', 'date_added'],
+                    unique=False)
+    op.create_index(op.f('ix_messages_conversation_id'), 'messages', ['conversation_id'],
+                    unique=False)
+    op.create_index(op.f('ix_messages_external_id'), 'messages', ['external_id'], unique=True)
+    op.create_index(op.f('ix_messages_id'), 'messages', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_messages_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_external_id'), table_name='messages')
+    op.drop_index(op.f('ix_messages_conversation_id'), table_name='messages')
+    op.drop_index('idx_message_contact_date', table_name='messages')
+    op.drop_table('messages')
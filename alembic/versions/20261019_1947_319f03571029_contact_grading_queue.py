@@ -0,0 +1,40 @@
+"""contact grading queue
+
+Revision ID: 319f03571029
+Revises: eb6402b8fa62
+Create Date: 2026-10-19 19:47:00.000000
+
+Hash of the last graded input and when it was graded, plus a partial
+index of contacts waiting to be (re)graded, built concurrently.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '319f03571029'
+down_revision = 'eb6402b8fa62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('ai_input_hash', sa.String(length=32), nullable=True))
+    op.add_column('contacts', sa.Column('ai_graded_at', sa.DateTime(timezone=True), nullable=True))
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'idx_contact_ungraded',
+                'contacts',
+                ['location_id'],
+                unique=False,
+                postgresql_where=sa.text("ai_graded_at IS NULL OR updated_at > ai_graded_at"),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        op.drop_index('idx_contact_ungraded', table_name='contacts')
+    op.drop_column('contacts', 'ai_graded_at')
+    op.drop_column('contacts', 'ai_input_hash')
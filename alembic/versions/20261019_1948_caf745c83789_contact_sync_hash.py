@@ -0,0 +1,26 @@
+"""contact sync hash
+
+Revision ID: caf745c83789
+Revises: 319f03571029
+Create Date: 2026-10-19 19:48:00.000000
+
+Digest of the synced GHL fields; contact upserts skip rows whose
+digest is unchanged.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'caf745c83789'
+down_revision = '319f03571029'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('sync_hash', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('contacts', 'sync_hash')
@@ -0,0 +1,48 @@
+"""contact sync generations
+
+Revision ID: 0f6f09f38e9c
+Revises: caf745c83789
+Create Date: 2026-10-19 19:49:00.000000
+
+Full contact syncs stamp each contact with the location's current
+generation and then sweep contacts from older ones. The sweep is a
+single DELETE, so the contact children now cascade on Postgres.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0f6f09f38e9c'
+down_revision = 'caf745c83789'
+branch_labels = None
+depends_on = None
+
+# (constraint, table, column, referenced table)
+CASCADES = [
+    ('opportunities_contact_id_fkey', 'opportunities', 'contact_id', 'contacts'),
+    ('tasks_contact_id_fkey', 'tasks', 'contact_id', 'contacts'),
+    ('conversations_contact_id_fkey', 'conversations', 'contact_id', 'contacts'),
+    ('messages_conversation_id_fkey', 'messages', 'conversation_id', 'conversations'),
+    ('messages_contact_id_fkey', 'messages', 'contact_id', 'contacts'),
+]
+
+
+def _replace_foreign_keys(ondelete) -> None:
+    for name, table, column, referent in CASCADES:
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referent, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('sync_generation', sa.Integer(), nullable=True))
+    op.add_column('locations', sa.Column('contact_sync_generation', sa.Integer(), nullable=True))
+    if op.get_context().dialect.name == 'postgresql':
+        _replace_foreign_keys('CASCADE')
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        _replace_foreign_keys(None)
+    op.drop_column('locations', 'contact_sync_generation')
+    op.drop_column('contacts', 'sync_generation')
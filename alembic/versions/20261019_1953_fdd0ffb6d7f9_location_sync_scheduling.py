@@ -0,0 +1,36 @@
+"""location sync scheduling
+
+Revision ID: fdd0ffb6d7f9
+Revises: 0f6f09f38e9c
+Create Date: 2026-10-19 19:53:00.000000
+
+Tier, last and in-flight sync times, and the observed change rate the
+scheduler uses to order location syncs.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fdd0ffb6d7f9'
+down_revision = '0f6f09f38e9c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('locations', sa.Column('sync_tier', sa.Integer(), nullable=True))
+    op.add_column(
+        'locations', sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        'locations', sa.Column('sync_started_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column('locations', sa.Column('sync_change_rate', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('locations', 'sync_change_rate')
+    op.drop_column('locations', 'sync_started_at')
+    op.drop_column('locations', 'last_synced_at')
+    op.drop_column('locations', 'sync_tier')
@@ -0,0 +1,26 @@
+"""location sync fence
+
+Revision ID: 97642b48d110
+Revises: fdd0ffb6d7f9
+Create Date: 2026-10-19 19:54:00.000000
+
+Fencing token of the latest sync lease, incremented in the database
+when a lease is taken; writes from a stale lease holder are rejected.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '97642b48d110'
+down_revision = 'fdd0ffb6d7f9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('locations', sa.Column('sync_fence', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('locations', 'sync_fence')
@@ -0,0 +1,142 @@
+"""
+Analytics API Endpoints
+Columnar (Parquet / Arrow) snapshots of contacts and opportunities
+"""
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from typing import Iterator, Optional
+import asyncio
+import logging
+import os
+import tempfile
+
+from celery.result import AsyncResult
+
+from app.core.database import get_db, SessionLocal
+from app.core.config import settings
+from app.models.location import Location
+from app.services.columnar_export import EXPORT_TABLES, iter_arrow_stream, write_parquet
+from app.workers.analytics_jobs import export_snapshot_task
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def _check_request(db: Session, table: str, location_id: Optional[str]) -> None:
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
+
+    if (
+        location_id
+        and not db.query(Location.id).filter(Location.location_id == location_id).first()
+    ):
+        raise HTTPException(status_code=404, detail="Location not found")
+
+
+def _write_parquet_file(table: str, location_id: Optional[str]) -> str:
+    """Write a snapshot to a temporary file (own session, runs off the event loop)"""
+    fd, path = tempfile.mkstemp(prefix=f"{table}-", suffix=".parquet")
+    os.close(fd)
+
+    db = SessionLocal()
+    try:
+        write_parquet(db, table, path, location_id)
+    except Exception:
+        os.unlink(path)
+        raise
+    finally:
+        db.close()
+
+    return path
+
+
+def _arrow_stream(table: str, location_id: Optional[str]) -> Iterator[bytes]:
+    """Arrow IPC stream with its own session (request sessions close before streaming)"""
+    db = SessionLocal()
+    try:
+        yield from iter_arrow_stream(db, table, location_id)
+    finally:
+        db.close()
+
+
+@router.get("/export/{table}")
+async def export_table(
+    table: str,
+    location_id: Optional[str] = Query(None),
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    db: Session = Depends(get_db),
+):
+    """
+    Download a columnar snapshot of contacts or opportunities
+
+    Parameters:
+    - table: contacts or opportunities
+    - location_id: GHL location ID (omit for all locations)
+    - format: parquet (default) or arrow (IPC stream, sent as rows are read)
+
+    Example:
+        GET /api/v1/analytics/export/contacts?location_id=ABC123
+
+        >>> pandas.read_parquet("contacts-ABC123.parquet")
+    """
+    _check_request(db, table, location_id)
+    filename = f"{table}-{location_id or 'all'}"
+
+    if format == "arrow":
+        return StreamingResponse(
+            _arrow_stream(table, location_id),
+            media_type="application/vnd.apache.arrow.stream",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.arrows"'},
+        )
+
+    # Parquet's footer is written last, so the file is built before sending
+    try:
+        path = await asyncio.to_thread(_write_parquet_file, table, location_id)
+    except Exception as e:
+        logger.error(f"Error exporting {table}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return FileResponse(
+        path,
+        media_type="application/vnd.apache.parquet",
+        filename=f"{filename}.parquet",
+        background=BackgroundTask(os.unlink, path),
+    )
+
+
+@router.post("/snapshots")
+async def create_snapshot(
+    table: str = Query(...),
+    location_id: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Queue a Parquet snapshot to ANALYTICS_EXPORT_URI (local or S3-compatible)
+
+    Parameters:
+    - table: contacts or opportunities
+    - location_id: GHL location ID (omit for all locations)
+    """
+    _check_request(db, table, location_id)
+
+    if not settings.ANALYTICS_EXPORT_URI:
+        raise HTTPException(status_code=400, detail="ANALYTICS_EXPORT_URI is not configured")
+
+    task = export_snapshot_task.delay(table, location_id)
+    return {"success": True, "taskId": task.id}
+
+
+@router.get("/snapshots/{task_id}")
+async def get_snapshot(task_id: str):
+    """Status (and on success, path and row count) of a queued snapshot"""
+    result = AsyncResult(task_id, app=celery_app)
+
+    response = {"taskId": task_id, "status": result.status}
+    if result.successful():
+        response["snapshot"] = result.result
+    elif result.failed():
+        response["error"] = str(result.result)
+    return response
@@ -2,7 +2,7 @@
 Authentication Endpoints
 Login, logout, token refresh, 2FA
 """
-from fastapi import APIRouter, HTTPException, Depends, status, Response
+from fastapi import APIRouter, HTTPException, Depends, status, Response, Query, Request
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from typing import Optional
@@ -12,9 +12,10 @@ from app.core.auth import (
     create_token_pair,
     verify_refresh_token,
     get_current_user,
-    hash_password,
-    verify_password
+    start_session,
+    end_session,
 )
+from app.core.ip_filter import IPFilter
 from app.core.two_factor import two_factor_auth
 from app.models.auth import TwoFactorAuth as TwoFactorModel
 
@@ -45,6 +46,11 @@ class Setup2FAResponse(BaseModel):
     backup_codes: list
 
 
+class QRCodeResponse(BaseModel):
+    qr_code: str
+    provisioning_uri: str
+
+
 class Verify2FARequest(BaseModel):
     token: str
 
@@ -52,6 +58,7 @@ class Verify2FARequest(BaseModel):
 @router.post("/login", response_model=LoginResponse)
 async def login(
     credentials: LoginRequest,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -61,7 +68,7 @@ async def login(
     """
     # TODO: Fetch user from database
     # user = db.query(User).filter(User.email == credentials.email).first()
-    # if not user or not verify_password(credentials.password, user.password_hash):
+    # if not user or not await verify_password_async(credentials.password, user.password_hash):
     #     raise HTTPException(status_code=401, detail="Invalid credentials")
 
     # For now, demo implementation
@@ -83,8 +90,14 @@ async def login(
             "requires_2fa": True
         }
 
-    # Create token pair
-    tokens = create_token_pair(user_id, role)
+    # Start a tracked session and create token pair
+    session_id = start_session(
+        db,
+        user_id,
+        ip_address=IPFilter.get_client_ip(request),
+        user_agent=request.headers.get("User-Agent"),
+    )
+    tokens = create_token_pair(user_id, role, session_id=session_id)
 
     return {
         **tokens,
@@ -109,8 +122,8 @@ async def refresh_tokens(request: RefreshRequest):
     # if not user or not user.is_active:
     #     raise HTTPException(status_code=401, detail="User not found")
 
-    # Create new token pair
-    tokens = create_token_pair(user_id, role="user")
+    # Create new token pair (same session)
+    tokens = create_token_pair(user_id, role="user", session_id=payload.get("sid"))
 
     return tokens
 
@@ -137,6 +150,9 @@ async def logout(
     # db.add(blacklist_entry)
     # db.commit()
 
+    if current_user.get("session_id"):
+        end_session(db, current_user["session_id"])
+
     return {"message": "Logged out successfully"}
 
 
@@ -150,6 +166,7 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
 
 @router.post("/2fa/setup", response_model=Setup2FAResponse)
 async def setup_2fa(
+    qr_format: str = Query("svg", pattern="^(svg|png)$"),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -157,6 +174,9 @@ async def setup_2fa(
     Setup 2FA for current user
 
     Returns QR code and backup codes
+
+    Parameters:
+    - qr_format: "svg" (default, smaller and cheaper) or "png"
     """
     user_id = current_user["user_id"]
     user_email = "user@example.com"  # TODO: Fetch from user record
@@ -172,8 +192,8 @@ async def setup_2fa(
             detail="2FA already enabled"
         )
 
-    # Generate 2FA setup
-    setup_data = two_factor_auth.setup_2fa(user_email)
+    # Generate 2FA setup (QR rendering and backup code hashing run on the crypto pool)
+    setup_data = await two_factor_auth.setup_2fa_async(user_email, qr_format=qr_format)
 
     # Store in database (not enabled yet until verified)
     if existing_2fa:
@@ -198,6 +218,37 @@ async def setup_2fa(
     }
 
 
+@router.get("/2fa/qr", response_model=QRCodeResponse)
+async def get_2fa_qr_code(
+    qr_format: str = Query("svg", pattern="^(svg|png)$"),
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the QR code for a pending (not yet verified) 2FA setup
+
+    Served from cache during the setup window, so re-displaying the
+    code does not re-render it
+    """
+    user_id = current_user["user_id"]
+    user_email = "user@example.com"  # TODO: Fetch from user record
+
+    two_fa = db.query(TwoFactorModel).filter(
+        TwoFactorModel.user_id == user_id
+    ).first()
+
+    if not two_fa or two_fa.is_enabled:
+        raise HTTPException(status_code=404, detail="No pending 2FA setup")
+
+    uri = two_factor_auth.get_provisioning_uri(two_fa.totp_secret, user_email)
+    qr_code = await two_factor_auth.get_qr_code_async(two_fa.totp_secret, uri, qr_format)
+
+    return {
+        "qr_code": qr_code,
+        "provisioning_uri": uri,
+    }
+
+
 @router.post("/2fa/verify")
 async def verify_2fa(
     request: Verify2FARequest,
@@ -228,6 +279,9 @@ async def verify_2fa(
     two_fa.verified_at = datetime.now()
     db.commit()
 
+    # Setup is done, the QR code is no longer needed
+    two_factor_auth.forget_qr_code(two_fa.totp_secret)
+
     return {"message": "2FA enabled successfully"}
 
 
@@ -267,6 +321,7 @@ async def disable_2fa(
 async def login_with_2fa(
     credentials: LoginRequest,
     two_fa_token: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
@@ -290,8 +345,15 @@ async def login_with_2fa(
     if not two_factor_auth.verify_token(two_fa.totp_secret, two_fa_token):
         raise HTTPException(status_code=400, detail="Invalid 2FA token")
 
-    # Create token pair
-    tokens = create_token_pair(user_id, role="user")
+    # Start a tracked session and create token pair
+    session_id = start_session(
+        db,
+        user_id,
+        ip_address=IPFilter.get_client_ip(request),
+        user_agent=request.headers.get("User-Agent"),
+        requires_2fa=True,
+    )
+    tokens = create_token_pair(user_id, role="user", session_id=session_id)
 
     return tokens
 
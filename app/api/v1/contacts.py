@@ -2,17 +2,30 @@
 Contact Endpoints
 Manage GHL contacts
 """
-from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Request
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Iterator, Optional
+from datetime import datetime
+import csv
+import io
 import logging
+import zlib
 
-from app.core.database import get_db
+import orjson
+
+from app.core.database import get_db, SessionLocal
 from app.core.config import settings
+from app.core.cache import response_cache, contacts_tag
+from app.core.lease import LeaseHeld
 from app.models.contact import Contact
 from app.models.location import Location
-from app.models.oauth import GHLAgencyToken
-from app.services.ghl_client import GHLClient
+from app.schemas.contact import CONTACT_LIST, CONTACT_DETAIL, CONTACT_EXPORT
+from app.schemas.serializers import RowSerializer, fieldset
+from app.services.contact_sync import sync_contact_page
+from app.services.ghl_client import GHLUnavailable, get_location_client, unavailable_error
+from app.services.sync_lease import location_sync_lease
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -24,6 +37,7 @@ async def list_contacts(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = Query(None),
+    serializer: RowSerializer = Depends(fieldset(CONTACT_DETAIL, default=CONTACT_LIST)),
     db: Session = Depends(get_db),
 ):
     """
@@ -34,9 +48,11 @@ async def list_contacts(
     - page: Page number (default 1)
     - limit: Results per page (default 20, max 100)
     - search: Search by name or email
+    - fields: Comma-separated response fields (any contact detail field)
 
     Example:
         GET /api/v1/contacts?location_id=ABC123&page=1&limit=20&search=john
+        GET /api/v1/contacts?location_id=ABC123&fields=id,contactName,email
     """
     try:
         # Find location
@@ -63,39 +79,29 @@ async def list_contacts(
         # Get total count
         total = query.count()
 
-        # Apply pagination
+        # Join only when a requested field lives on Location
+        if serializer.uses(Location):
+            query = query.join(Location, Contact.location_id == Location.id)
+
+        # Apply pagination (requested columns only, no ORM entities)
         offset = (page - 1) * limit
-        contacts = query.order_by(Contact.date_added.desc()).offset(offset).limit(limit).all()
+        rows = (
+            query.with_entities(*serializer.columns)
+            .order_by(Contact.date_added.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
 
-        return {
-            "contacts": [
-                {
-                    "id": contact.id,
-                    "externalId": contact.external_id,
-                    "contactName": contact.contact_name,
-                    "firstName": contact.first_name,
-                    "lastName": contact.last_name,
-                    "email": contact.email,
-                    "phone": contact.phone,
-                    "source": contact.source,
-                    "dateAdded": contact.date_added.isoformat() if contact.date_added else None,
-                    "aiStatus": contact.ai_status,
-                    "aiQualityGrade": contact.ai_quality_grade,
-                    "aiSalesGrade": contact.ai_sales_grade,
-                    "opportunitiesCount": contact.opportunities_count,
-                    "totalPipelineValue": contact.total_pipeline_value,
-                    "assignedTo": contact.assigned_to,
-                    "lastTouchDate": contact.last_touch_date.isoformat() if contact.last_touch_date else None,
-                }
-                for contact in contacts
-            ],
+        return ORJSONResponse({
+            "contacts": serializer.many(rows),
             "pagination": {
                 "page": page,
                 "limit": limit,
                 "total": total,
                 "pages": (total + limit - 1) // limit,
             }
-        }
+        })
 
     except HTTPException:
         raise
@@ -104,62 +110,171 @@ async def list_contacts(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _export_rows(location_pk: int, serializer: RowSerializer) -> Iterator[tuple]:
+    """
+    Stream a location's contacts through a server-side cursor
+
+    Uses its own session: request-scoped sessions are closed before a
+    StreamingResponse body is sent.
+    """
+    db = SessionLocal()
+    try:
+        query = (
+            serializer.query(db)
+            .filter(Contact.location_id == location_pk)
+            .order_by(Contact.id)
+            .yield_per(settings.EXPORT_YIELD_PER)  # implies stream_results
+        )
+        for row in query:
+            yield row
+    finally:
+        db.close()
+
+
+def _encode_ndjson(rows: Iterator[tuple], serializer: RowSerializer) -> Iterator[bytes]:
+    """One JSON object per line"""
+    serialize = serializer.one
+    for row in rows:
+        yield orjson.dumps(serialize(row)) + b"\n"
+
+
+def _encode_csv(rows: Iterator[tuple], serializer: RowSerializer) -> Iterator[bytes]:
+    """Header line, then one CSV record per row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(serializer.keys)
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in row
+        ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def _chunked(parts: Iterator[bytes], gzip: bool) -> Iterator[bytes]:
+    """Coalesce small parts into EXPORT_CHUNK_BYTES chunks, optionally gzipped"""
+    compressor = (
+        zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        if gzip else None
+    )
+    pending = []
+    size = 0
+
+    for part in parts:
+        pending.append(part)
+        size += len(part)
+        if size >= settings.EXPORT_CHUNK_BYTES:
+            chunk = b"".join(pending)
+            pending, size = [], 0
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    chunk = b"".join(pending)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+@router.get("/export")
+async def export_contacts(
+    location_id: str = Query(...),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    gzip: bool = Query(False),
+    serializer: RowSerializer = Depends(fieldset(CONTACT_EXPORT)),
+    db: Session = Depends(get_db),
+):
+    """
+    Export all contacts of a location as a stream
+
+    Rows come from a server-side cursor and are written as they arrive,
+    so memory stays flat regardless of location size.
+
+    Parameters:
+    - location_id: GHL location ID (required)
+    - format: ndjson (default) or csv
+    - gzip: Compress the stream (Content-Encoding: gzip)
+    - fields: Comma-separated fields (default: all contact detail fields)
+
+    Example:
+        GET /api/v1/contacts/export?location_id=ABC123&format=csv&gzip=true
+    """
+    location = db.query(Location.id).filter(
+        Location.location_id == location_id
+    ).first()
+
+    if not location:
+        raise HTTPException(status_code=404, detail="Location not found")
+
+    rows = _export_rows(location.id, serializer)
+    if format == "csv":
+        parts = _encode_csv(rows, serializer)
+        media_type = "text/csv"
+    else:
+        parts = _encode_ndjson(rows, serializer)
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        _chunked(parts, gzip),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="contacts-{location_id}.{format}"',
+            # "identity" also keeps GZipMiddleware from re-compressing the stream
+            "Content-Encoding": "gzip" if gzip else "identity",
+        },
+    )
+
+
+def _contact_payload(db: Session, serializer: RowSerializer, contact_id: str) -> dict:
+    """Build the contact detail response"""
+    query = serializer.query(db).select_from(Contact)
+    if serializer.uses(Location):
+        query = query.join(Location, Contact.location_id == Location.id)
+
+    row = query.filter(Contact.external_id == contact_id).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Contact not found")
+
+    return serializer.one(row)
+
+
 @router.get("/{contact_id}")
 async def get_contact(
     contact_id: str,
+    request: Request,
+    serializer: RowSerializer = Depends(fieldset(CONTACT_DETAIL, required=("locationId",))),
     db: Session = Depends(get_db),
 ):
     """
     Get detailed contact information
 
+    Cached until the contact's location is re-synced; supports
+    ETag / If-None-Match.
+
+    Parameters:
+    - fields: Comma-separated response fields (default: all; locationId is always included)
+
     Example:
         GET /api/v1/contacts/contact_123
+        GET /api/v1/contacts/contact_123?fields=contactName,aiSummary
     """
     try:
-        contact = db.query(Contact).filter(
-            Contact.external_id == contact_id
-        ).first()
-
-        if not contact:
-            raise HTTPException(status_code=404, detail="Contact not found")
-
-        return {
-            "id": contact.id,
-            "externalId": contact.external_id,
-            "locationId": contact.location.location_id,
-            "contactName": contact.contact_name,
-            "firstName": contact.first_name,
-            "lastName": contact.last_name,
-            "email": contact.email,
-            "phone": contact.phone,
-            "address": contact.address,
-            "timezone": contact.timezone,
-            "country": contact.country,
-            "source": contact.source,
-            "dateAdded": contact.date_added.isoformat() if contact.date_added else None,
-            "category": contact.category,
-            "channel": contact.channel,
-            "assignedTo": contact.assigned_to,
-            "createdBy": contact.created_by,
-            "aiStatus": contact.ai_status,
-            "aiSummary": contact.ai_summary,
-            "aiQualityGrade": contact.ai_quality_grade,
-            "aiSalesGrade": contact.ai_sales_grade,
-            "touchSummary": contact.touch_summary,
-            "engagementSummary": contact.engagement_summary,
-            "lastTouchDate": contact.last_touch_date.isoformat() if contact.last_touch_date else None,
-            "lastMessage": contact.last_message,
-            "speedToLead": contact.speed_to_lead,
-            "crmTasks": contact.crm_tasks,
-            "opportunitiesCount": contact.opportunities_count,
-            "totalPipelineValue": contact.total_pipeline_value,
-            "tags": contact.tags,
-            "createdAt": contact.created_at.isoformat(),
-            "updatedAt": contact.updated_at.isoformat(),
-        }
+        return await response_cache.respond(
+            request,
+            lambda: _contact_payload(db, serializer, contact_id),
+            tags=lambda payload: [contacts_tag(payload["locationId"])],
+        )
 
     except HTTPException:
         raise
+    except GHLUnavailable as e:
+        raise unavailable_error(e)
     except Exception as e:
         logger.error(f"Error getting contact: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -177,7 +292,9 @@ async def sync_contacts(
     Sync contacts from GHL API
 
     For large contact lists, only syncs one page at a time
-    Use background_sync for full sync
+    Full syncs run in the sync_location worker job
+    If the location is already being synced, returns 202 with that
+    sync's progress instead
 
     Parameters:
     - location_id: GHL location ID
@@ -196,158 +313,110 @@ async def sync_contacts(
         if not location:
             raise HTTPException(status_code=404, detail="Location not found")
 
-        # Get token
-        token = db.query(GHLAgencyToken).filter(
-            GHLAgencyToken.company_id == location.company_id,
-            GHLAgencyToken.app_id == settings.GHL_APP_ID
-        ).first()
-
-        if not token:
-            raise HTTPException(
-                status_code=404,
-                detail="No OAuth token found"
-            )
-
-        # Get location-specific token
-        client = GHLClient(access_token=token.access_token)
-        location_token = await client.get_location_token(
-            company_id=location.company_id,
-            location_id=location_id
-        )
-
-        if not location_token:
+        location_client = await get_location_client(db, location)
+        if not location_client:
             raise HTTPException(
                 status_code=400,
                 detail="Failed to get location access token"
             )
 
-        # Search contacts
-        location_client = GHLClient(access_token=location_token)
-        contacts_data = await location_client.search_contacts(
-            location_id=location_id,
-            page=page,
-            limit=limit
-        )
+        async with location_sync_lease(db, location):
+            result = await sync_contact_page(db, location, location_client, page=page, limit=limit)
+        synced = result["synced"]
+        updated = result["updated"]
+        total_contacts = result["totalContacts"]
 
-        contacts_list = contacts_data.get("contacts", [])
-        total_contacts = contacts_data.get("total", 0)
-
-        # Process contacts
-        synced = 0
-        updated = 0
-
-        for contact_data in contacts_list:
-            external_id = contact_data.get("id")
-            if not external_id:
-                continue
-
-            # Check if contact exists
-            existing_contact = db.query(Contact).filter(
-                Contact.external_id == external_id,
-                Contact.location_id == location.id
-            ).first()
-
-            # Prepare contact values
-            contact_values = {
-                "contact_name": contact_data.get("contactName", "").title(),
-                "first_name": contact_data.get("firstName", "").title(),
-                "last_name": contact_data.get("lastName", "").title(),
-                "email": contact_data.get("email"),
-                "phone": contact_data.get("phone"),
-                "timezone": contact_data.get("timezone"),
-                "country": contact_data.get("country"),
-                "source": contact_data.get("source"),
-                "tags": str(contact_data.get("tags", [])),
-            }
-
-            if existing_contact:
-                for key, value in contact_values.items():
-                    if value is not None:
-                        setattr(existing_contact, key, value)
-                updated += 1
-            else:
-                new_contact = Contact(
-                    external_id=external_id,
-                    location_id=location.id,
-                    **contact_values
-                )
-                db.add(new_contact)
-                synced += 1
-
-        db.commit()
-
-        # Update location contact count
-        location.contacts_count = total_contacts
-        db.commit()
+        await response_cache.invalidate_location_async(location_id)
 
         return {
             "success": True,
             "synced": synced,
             "updated": updated,
-            "total": synced + updated,
+            "unchanged": result["unchanged"],
+            "total": synced + updated + result["unchanged"],
             "totalContacts": total_contacts,
             "page": page,
             "hasMore": (page * limit) < total_contacts,
         }
 
+    except LeaseHeld as e:
+        return JSONResponse(
+            status_code=202,
+            content={"success": True, "joined": True, "progress": e.progress},
+        )
     except HTTPException:
         raise
+    except GHLUnavailable as e:
+        raise unavailable_error(e)
     except Exception as e:
         logger.error(f"Error syncing contacts: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _contact_stats_payload(db: Session, location_id: str) -> dict:
+    """Build the contact statistics response"""
+    location = db.query(Location).filter(
+        Location.location_id == location_id
+    ).first()
+
+    if not location:
+        raise HTTPException(status_code=404, detail="Location not found")
+
+    total = db.query(Contact).filter(Contact.location_id == location.id).count()
+
+    # Count by AI status
+    statuses = {}
+    status_counts = db.query(
+        Contact.ai_status,
+        func.count(Contact.id)
+    ).filter(
+        Contact.location_id == location.id
+    ).group_by(Contact.ai_status).all()
+
+    for status, count in status_counts:
+        statuses[status] = count
+
+    # Count by grade
+    quality_grades = {}
+    quality_counts = db.query(
+        Contact.ai_quality_grade,
+        func.count(Contact.id)
+    ).filter(
+        Contact.location_id == location.id
+    ).group_by(Contact.ai_quality_grade).all()
+
+    for grade, count in quality_counts:
+        quality_grades[grade] = count
+
+    return {
+        "locationId": location_id,
+        "totalContacts": total,
+        "byStatus": statuses,
+        "byQualityGrade": quality_grades,
+    }
+
+
 @router.get("/stats/{location_id}")
 async def get_contact_stats(
     location_id: str,
+    request: Request,
     db: Session = Depends(get_db),
 ):
     """
     Get contact statistics for a location
 
+    Cached until the location's contacts change; supports
+    ETag / If-None-Match.
+
     Example:
         GET /api/v1/contacts/stats/ABC123
     """
     try:
-        location = db.query(Location).filter(
-            Location.location_id == location_id
-        ).first()
-
-        if not location:
-            raise HTTPException(status_code=404, detail="Location not found")
-
-        total = db.query(Contact).filter(Contact.location_id == location.id).count()
-
-        # Count by AI status
-        statuses = {}
-        status_counts = db.query(
-            Contact.ai_status,
-            db.func.count(Contact.id)
-        ).filter(
-            Contact.location_id == location.id
-        ).group_by(Contact.ai_status).all()
-
-        for status, count in status_counts:
-            statuses[status] = count
-
-        # Count by grade
-        quality_grades = {}
-        quality_counts = db.query(
-            Contact.ai_quality_grade,
-            db.func.count(Contact.id)
-        ).filter(
-            Contact.location_id == location.id
-        ).group_by(Contact.ai_quality_grade).all()
-
-        for grade, count in quality_counts:
-            quality_grades[grade] = count
-
-        return {
-            "locationId": location_id,
-            "totalContacts": total,
-            "byStatus": statuses,
-            "byQualityGrade": quality_grades,
-        }
+        return await response_cache.respond(
+            request,
+            lambda: _contact_stats_payload(db, location_id),
+            tags=[contacts_tag(location_id)],
+        )
 
     except HTTPException:
         raise
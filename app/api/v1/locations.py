@@ -2,27 +2,72 @@
 Location Endpoints
 Manage GHL locations
 """
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import logging
 
 from app.core.database import get_db
 from app.core.config import settings
+from app.core.cache import response_cache, LOCATIONS_TAG, location_tag
 from app.models.location import Location
 from app.models.oauth import GHLAgencyToken
-from app.services.ghl_client import GHLClient
+from app.schemas.location import LOCATION_LIST, LOCATION_DETAIL
+from app.schemas.serializers import RowSerializer, fieldset
+from app.services.ghl_client import GHLClient, GHLUnavailable, unavailable_error
+from app.services.location_sync import sync_company_locations
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _location_list_payload(
+    db: Session,
+    serializer: RowSerializer,
+    company_id: Optional[str],
+    is_installed: Optional[bool],
+    limit: int,
+    offset: int,
+) -> dict:
+    """Build the location list response"""
+    query = db.query(Location)
+
+    if company_id:
+        query = query.filter(Location.company_id == company_id)
+    if is_installed is not None:
+        query = query.filter(Location.is_installed == is_installed)
+
+    total = query.count()
+    rows = query.with_entities(*serializer.columns).offset(offset).limit(limit).all()
+
+    return {
+        "locations": serializer.many(rows),
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+    }
+
+
+def _location_payload(db: Session, serializer: RowSerializer, location_id: str) -> dict:
+    """Build the location detail response"""
+    row = serializer.query(db).filter(
+        Location.location_id == location_id
+    ).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Location not found")
+
+    return serializer.one(row)
+
+
 @router.get("/")
 async def list_locations(
+    request: Request,
     company_id: Optional[str] = Query(None),
     is_installed: Optional[bool] = Query(None),
     limit: int = Query(100, le=500),
     offset: int = Query(0),
+    serializer: RowSerializer = Depends(fieldset(LOCATION_DETAIL, default=LOCATION_LIST)),
     db: Session = Depends(get_db),
 ):
     """
@@ -33,45 +78,20 @@ async def list_locations(
     - is_installed: Filter by installation status
     - limit: Max results (default 100, max 500)
     - offset: Pagination offset
+    - fields: Comma-separated response fields (any location detail field)
+
+    Responses are cached until a location changes and carry an ETag
+    (send If-None-Match to get a 304).
 
     Example:
         GET /api/v1/locations?company_id=ABC123&is_installed=true&limit=50
     """
     try:
-        query = db.query(Location)
-
-        if company_id:
-            query = query.filter(Location.company_id == company_id)
-        if is_installed is not None:
-            query = query.filter(Location.is_installed == is_installed)
-
-        total = query.count()
-        locations = query.offset(offset).limit(limit).all()
-
-        return {
-            "locations": [
-                {
-                    "id": loc.id,
-                    "locationId": loc.location_id,
-                    "companyId": loc.company_id,
-                    "name": loc.name,
-                    "address": loc.address,
-                    "city": loc.city,
-                    "state": loc.state,
-                    "country": loc.country,
-                    "postalCode": loc.postal_code,
-                    "isInstalled": loc.is_installed,
-                    "contactsCount": loc.contacts_count,
-                    "opportunitiesCount": loc.opportunities_count,
-                    "createdAt": loc.created_at.isoformat(),
-                    "updatedAt": loc.updated_at.isoformat(),
-                }
-                for loc in locations
-            ],
-            "total": total,
-            "limit": limit,
-            "offset": offset,
-        }
+        return await response_cache.respond(
+            request,
+            lambda: _location_list_payload(db, serializer, company_id, is_installed, limit, offset),
+            tags=[LOCATIONS_TAG],
+        )
 
     except Exception as e:
         logger.error(f"Error listing locations: {e}")
@@ -81,46 +101,32 @@ async def list_locations(
 @router.get("/{location_id}")
 async def get_location(
     location_id: str,
+    request: Request,
+    serializer: RowSerializer = Depends(fieldset(LOCATION_DETAIL)),
     db: Session = Depends(get_db),
 ):
     """
     Get detailed information about a location
 
+    Cached until the location changes; supports ETag / If-None-Match.
+
+    Parameters:
+    - fields: Comma-separated response fields (default: all)
+
     Example:
-        GET /api/v1/locations/ABC123
+        GET /api/v1/locations/ABC123?fields=name,contactsCount
     """
     try:
-        location = db.query(Location).filter(
-            Location.location_id == location_id
-        ).first()
-
-        if not location:
-            raise HTTPException(status_code=404, detail="Location not found")
-
-        return {
-            "id": location.id,
-            "locationId": location.location_id,
-            "companyId": location.company_id,
-            "name": location.name,
-            "address": location.address,
-            "city": location.city,
-            "state": location.state,
-            "country": location.country,
-            "postalCode": location.postal_code,
-            "timezone": location.timezone,
-            "email": location.email,
-            "phone": location.phone,
-            "website": location.website,
-            "isInstalled": location.is_installed,
-            "contactsCount": location.contacts_count,
-            "opportunitiesCount": location.opportunities_count,
-            "automationTemplate": location.automation_template,
-            "createdAt": location.created_at.isoformat(),
-            "updatedAt": location.updated_at.isoformat(),
-        }
+        return await response_cache.respond(
+            request,
+            lambda: _location_payload(db, serializer, location_id),
+            tags=[location_tag(location_id)],
+        )
 
     except HTTPException:
         raise
+    except GHLUnavailable as e:
+        raise unavailable_error(e)
     except Exception as e:
         logger.error(f"Error getting location: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -151,62 +157,26 @@ async def sync_locations(
                 detail="No OAuth token found for this company"
             )
 
-        # Fetch locations from GHL
+        # Fetch all installed locations and bulk upsert them
         client = GHLClient(access_token=token.access_token)
-        ghl_locations = await client.get_installed_locations(
-            company_id=company_id,
-            app_id=settings.GHL_APP_ID,
-            limit=500
-        )
-
-        synced_count = 0
-        updated_count = 0
-
-        # Store/update each location
-        for loc_data in ghl_locations:
-            loc_id = loc_data.get("_id")
-            if not loc_id:
-                continue
-
-            location = db.query(Location).filter(
-                Location.location_id == loc_id
-            ).first()
-
-            location_values = {
-                "name": loc_data.get("name", f"Location {loc_id}"),
-                "address": loc_data.get("address"),
-                "city": loc_data.get("city"),
-                "state": loc_data.get("state"),
-                "country": loc_data.get("country"),
-                "postal_code": loc_data.get("postalCode"),
-                "company_id": company_id,
-                "app_id": settings.GHL_APP_ID,
-                "is_installed": loc_data.get("isInstalled", True),
-            }
-
-            if location:
-                for key, value in location_values.items():
-                    setattr(location, key, value)
-                updated_count += 1
-            else:
-                location = Location(
-                    location_id=loc_id,
-                    **location_values
-                )
-                db.add(location)
-                synced_count += 1
+        result = await sync_company_locations(db, company_id, client)
 
-        db.commit()
+        await response_cache.invalidate_tags_async(
+            [LOCATIONS_TAG] + [location_tag(loc_id) for loc_id in result["locationIds"]]
+        )
 
         return {
             "success": True,
-            "synced": synced_count,
-            "updated": updated_count,
-            "total": synced_count + updated_count,
+            "synced": result["synced"],
+            "updated": result["updated"],
+            "uninstalled": result["uninstalled"],
+            "total": result["synced"] + result["updated"],
         }
 
     except HTTPException:
         raise
+    except GHLUnavailable as e:
+        raise unavailable_error(e)
     except Exception as e:
         logger.error(f"Error syncing locations: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -245,7 +215,7 @@ async def refresh_location(
             )
 
         # Fetch fresh data from GHL
-        client = GHLClient(access_token=token.access_token)
+        client = GHLClient(access_token=token.access_token, hedge=True)
         location_data = await client.get_location_info(location_id)
 
         if not location_data:
@@ -269,6 +239,8 @@ async def refresh_location(
 
         db.commit()
 
+        await response_cache.invalidate_location_async(location_id, contacts=False)
+
         return {
             "success": True,
             "message": "Location refreshed successfully",
@@ -277,6 +249,8 @@ async def refresh_location(
 
     except HTTPException:
         raise
+    except GHLUnavailable as e:
+        raise unavailable_error(e)
     except Exception as e:
         logger.error(f"Error refreshing location: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -12,8 +12,9 @@ import logging
 from app.core.database import get_db
 from app.core.config import settings
 from app.models.oauth import GHLAgencyToken, GHLApplication
-from app.models.location import Location
 from app.services.ghl_client import GHLClient, GHLOAuthHelper
+from app.services import bootstrap
+from app.workers.bootstrap_jobs import bootstrap_company
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -117,39 +118,20 @@ async def oauth_callback(
 
         db.commit()
 
-        # If this is a company-level install, sync all locations
+        # Company-level install: locations and their contacts are synced
+        # in the background; the frontend polls /oauth/bootstrap/{company_id}
         if token_company_id and not location_id:
-            client_with_token = GHLClient(access_token=access_token)
-            locations = await client_with_token.get_installed_locations(
-                company_id=token_company_id,
-                app_id=settings.GHL_APP_ID
-            )
-
-            # Store/update locations
-            for loc_data in locations:
-                loc_id = loc_data.get("_id")
-                loc_name = loc_data.get("name", f"Location {loc_id}")
-
-                location = db.query(Location).filter(
-                    Location.location_id == loc_id
-                ).first()
-
-                if location:
-                    location.name = loc_name
-                    location.is_installed = True
-                    location.company_id = token_company_id
-                    location.app_id = settings.GHL_APP_ID
-                else:
-                    location = Location(
-                        location_id=loc_id,
-                        name=loc_name,
-                        is_installed=True,
-                        company_id=token_company_id,
-                        app_id=settings.GHL_APP_ID,
-                    )
-                    db.add(location)
-
-            db.commit()
+            # Progress is best effort: a Redis hiccup must not skip the bootstrap
+            try:
+                await bootstrap.mark_queued(token_company_id)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to record bootstrap progress for company {token_company_id}: {e}"
+                )
+            try:
+                bootstrap_company.delay(token_company_id)
+            except Exception as e:
+                logger.error(f"Failed to queue bootstrap for company {token_company_id}: {e}")
 
         # Redirect to frontend with success
         redirect_url = f"{settings.FRONTEND_URL}/oauth/success?companyId={token_company_id}"
@@ -167,6 +149,32 @@ async def oauth_callback(
         return RedirectResponse(url=error_url)
 
 
+@router.get("/bootstrap/{company_id}")
+async def bootstrap_status(company_id: str):
+    """
+    Progress of the post-install location bootstrap
+
+    Status goes queued -> syncing_locations -> syncing_contacts ->
+    completed (or failed); locationsDone / locationsFailed count the
+    initial contact syncs out of locationsTotal.
+
+    Example:
+        GET /api/v1/oauth/bootstrap/ABC123
+    """
+    try:
+        progress = await bootstrap.get_progress(company_id)
+        if progress is None:
+            raise HTTPException(status_code=404, detail="No bootstrap found for company")
+
+        return {"companyId": company_id, **progress}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting bootstrap status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/status")
 async def oauth_status(
     location_id: Optional[str] = Query(None),
@@ -0,0 +1,71 @@
+"""
+Opportunity API Endpoints
+Sync opportunities from GHL
+"""
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.database import get_db
+from app.core.cache import response_cache
+from app.core.lease import LeaseHeld
+from app.models.location import Location
+from app.services.ghl_client import GHLUnavailable, get_location_client, unavailable_error
+from app.services.opportunity_sync import sync_opportunities
+from app.services.sync_lease import location_sync_lease
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.post("/sync")
+async def sync_location_opportunities(
+    location_id: str = Query(...),
+    db: Session = Depends(get_db),
+):
+    """
+    Sync all opportunities of a location from GHL API
+
+    Updates contact opportunity counts / pipeline values and the
+    location's opportunity total. Contacts should be synced first;
+    opportunities of unknown contacts are skipped. If the location is
+    already being synced, returns 202 with that sync's progress instead.
+
+    Example:
+        POST /api/v1/opportunities/sync?location_id=ABC123
+    """
+    try:
+        location = db.query(Location).filter(
+            Location.location_id == location_id
+        ).first()
+
+        if not location:
+            raise HTTPException(status_code=404, detail="Location not found")
+
+        client = await get_location_client(db, location)
+        if not client:
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to get location access token"
+            )
+
+        async with location_sync_lease(db, location):
+            result = await sync_opportunities(db, location, client)
+
+        await response_cache.invalidate_location_async(location_id)
+
+        return {"success": True, **result}
+
+    except LeaseHeld as e:
+        return JSONResponse(
+            status_code=202,
+            content={"success": True, "joined": True, "progress": e.progress},
+        )
+    except HTTPException:
+        raise
+    except GHLUnavailable as e:
+        raise unavailable_error(e)
+    except Exception as e:
+        logger.error(f"Error syncing opportunities: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,6 +3,7 @@ Webhook Endpoints
 Handles incoming webhooks from GHL
 """
 from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Dict, Any
@@ -10,8 +11,11 @@ import logging
 import json
 
 from app.core.database import get_db
+from app.core.cache import response_cache, contacts_tag
 from app.models.webhook import WebhookEvent
 from app.models.location import Location
+from app.schemas.webhook import WEBHOOK_EVENT_LIST
+from app.services.conversation_sync import ingest_message_event
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -34,6 +38,7 @@ async def handle_webhook_event(
     - CONTACT_DELETE: Contact deleted
     - OPPORTUNITY_CREATE: New opportunity created
     - OPPORTUNITY_UPDATE: Opportunity updated
+    - InboundMessage / OutboundMessage: Conversation message (touch metrics)
 
     Example payload:
         {
@@ -88,6 +93,8 @@ async def handle_webhook_event(
                 await handle_uninstall_event(payload, db)
             elif event_type == "LOCATION_UPDATE":
                 await handle_location_update_event(payload, db)
+            elif event_type in ("InboundMessage", "OutboundMessage"):
+                await handle_message_event(payload, db)
             # Add more event handlers as needed
 
             # Mark as processed
@@ -134,6 +141,7 @@ async def handle_install_event(payload: Dict[str, Any], db: Session):
         db.add(location)
 
     db.commit()
+    await response_cache.invalidate_location_async(location_id, contacts=False)
     logger.info(f"App installed for location: {location_id}")
 
 
@@ -153,6 +161,7 @@ async def handle_uninstall_event(payload: Dict[str, Any], db: Session):
     if location:
         location.is_installed = False
         db.commit()
+        await response_cache.invalidate_location_async(location_id, contacts=False)
         logger.info(f"App uninstalled for location: {location_id}")
 
 
@@ -187,9 +196,21 @@ async def handle_location_update_event(payload: Dict[str, Any], db: Session):
             location.postal_code = location_data["postalCode"]
 
         db.commit()
+        await response_cache.invalidate_location_async(location_id, contacts=False)
         logger.info(f"Location updated: {location_id}")
 
 
+async def handle_message_event(payload: Dict[str, Any], db: Session):
+    """Handle inbound/outbound conversation message event"""
+    location_id = ingest_message_event(db, payload)
+
+    if location_id:
+        await response_cache.invalidate_tags_async([contacts_tag(location_id)])
+    else:
+        # Contact not synced yet; the next conversation sync picks it up
+        logger.info(f"Message event for unknown contact: {payload.get('contactId')}")
+
+
 @router.get("/events")
 async def list_webhook_events(
     limit: int = 50,
@@ -211,23 +232,17 @@ async def list_webhook_events(
         if location_id:
             query = query.filter(WebhookEvent.location_id == location_id)
 
-        events = query.order_by(WebhookEvent.created_at.desc()).limit(limit).all()
-
-        return {
-            "events": [
-                {
-                    "id": event.id,
-                    "type": event.event_type,
-                    "locationId": event.location_id,
-                    "companyId": event.company_id,
-                    "timestamp": event.event_timestamp.isoformat() if event.event_timestamp else None,
-                    "processed": event.processed,
-                    "createdAt": event.created_at.isoformat(),
-                }
-                for event in events
-            ],
-            "count": len(events),
-        }
+        rows = (
+            query.with_entities(*WEBHOOK_EVENT_LIST.columns)
+            .order_by(WebhookEvent.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+        return ORJSONResponse({
+            "events": WEBHOOK_EVENT_LIST.many(rows),
+            "count": len(rows),
+        })
 
     except Exception as e:
         logger.error(f"Error listing webhook events: {e}")
@@ -2,8 +2,9 @@
 JWT Authentication System
 Implements secure token-based authentication with refresh tokens
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+import secrets
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, Security, Depends, status
@@ -12,6 +13,9 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.crypto_executor import crypto_executor
+from app.core.session_tracker import session_tracker
+from app.models.auth import UserSession
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -35,6 +39,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the crypto pool (use from async handlers)"""
+    return await crypto_executor.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the crypto pool (use from async handlers)"""
+    return await crypto_executor.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -144,11 +158,17 @@ async def get_current_user(
     # if user is None:
     #     raise HTTPException(status_code=404, detail="User not found")
 
+    # Record session activity (buffered, flushed to the DB in batches)
+    session_id = payload.get("sid")
+    if session_id:
+        await session_tracker.touch(session_id)
+
     # For now, return the payload
     return {
         "user_id": user_id,
         "role": payload.get("role", "user"),
-        "permissions": payload.get("permissions", [])
+        "permissions": payload.get("permissions", []),
+        "session_id": session_id,
     }
 
 
@@ -196,7 +216,12 @@ def verify_refresh_token(token: str) -> Dict[str, Any]:
     return payload
 
 
-def create_token_pair(user_id: str, role: str = "user", permissions: list = None) -> Dict[str, str]:
+def create_token_pair(
+    user_id: str,
+    role: str = "user",
+    permissions: list = None,
+    session_id: Optional[str] = None,
+) -> Dict[str, str]:
     """
     Create both access and refresh tokens
 
@@ -204,6 +229,7 @@ def create_token_pair(user_id: str, role: str = "user", permissions: list = None
         user_id: User identifier
         role: User role (user, admin, etc.)
         permissions: List of permissions
+        session_id: Optional UserSession id, embedded as the "sid" claim
 
     Returns:
         Dict with access_token and refresh_token
@@ -213,9 +239,14 @@ def create_token_pair(user_id: str, role: str = "user", permissions: list = None
         "role": role,
         "permissions": permissions or []
     }
+    refresh_data = {"sub": user_id}
+
+    if session_id:
+        token_data["sid"] = session_id
+        refresh_data["sid"] = session_id
 
     access_token = create_access_token(token_data)
-    refresh_token = create_refresh_token({"sub": user_id})
+    refresh_token = create_refresh_token(refresh_data)
 
     return {
         "access_token": access_token,
@@ -223,3 +254,47 @@ def create_token_pair(user_id: str, role: str = "user", permissions: list = None
         "token_type": "bearer",
         "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60  # seconds
     }
+
+
+def start_session(
+    db: Session,
+    user_id: str,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+    requires_2fa: bool = False,
+) -> str:
+    """
+    Create a UserSession row for a new login
+
+    Activity after this point is tracked by the session tracker, which
+    batches last_activity updates instead of writing on every request.
+
+    Returns:
+        New session identifier (use as the "sid" token claim)
+    """
+    now = datetime.now(timezone.utc)
+    session_id = secrets.token_urlsafe(32)
+
+    db.add(UserSession(
+        session_id=session_id,
+        user_id=user_id,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        is_active=True,
+        last_activity=now,
+        expires_at=now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        requires_2fa=requires_2fa,
+        is_2fa_verified=requires_2fa,
+    ))
+    db.commit()
+
+    return session_id
+
+
+def end_session(db: Session, session_id: str) -> None:
+    """Deactivate a session (logout)"""
+    session_tracker.discard(session_id)
+    db.query(UserSession).filter(
+        UserSession.session_id == session_id
+    ).update({"is_active": False}, synchronize_session=False)
+    db.commit()
@@ -0,0 +1,311 @@
+"""
+Response Caching
+In-process LRU with an optional Redis tier, ETag support and tag invalidation
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import redis
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+from app.core.config import settings
+from app.core.redis import get_async_redis, get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_ENTRY_PREFIX = "rcache:entry:"
+REDIS_TAG_PREFIX = "rcache:tagver:"
+
+LOCATIONS_TAG = "locations"
+
+TagSpec = Union[List[str], Callable[[Any], List[str]]]
+
+
+def location_tag(location_id: str) -> str:
+    """Tag for a single location record (GHL location id)"""
+    return f"location:{location_id}"
+
+
+def contacts_tag(location_id: str) -> str:
+    """Tag for contact data scoped to a location (GHL location id)"""
+    return f"contacts:{location_id}"
+
+
+@dataclass
+class CachedResponse:
+    """A rendered response body plus the tag versions it was built against"""
+    body: bytes
+    etag: str
+    tag_versions: Dict[str, int]
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Two-tier cache for read endpoints
+
+    Invalidation is tag based: every tag carries a version counter, entries
+    remember the versions they were built against, and invalidating a tag
+    bumps its counter. A hit whose versions no longer match is a miss.
+    Tag versions live in Redis whenever `shared_tags` is on (even if
+    entries are only kept in process), so an invalidation in one process
+    or worker is seen by every other process on its next lookup.
+
+    Lookups run on the event loop and use the asyncio Redis client;
+    workers invalidate through the synchronous one.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: int = 300,
+        use_redis: bool = False,
+        shared_tags: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.shared_tags = shared_tags or use_redis
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._tag_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(request: Request) -> str:
+        """Cache key from route path and (sorted) query parameters"""
+        params = sorted(request.query_params.multi_items())
+        query = "&".join(f"{k}={v}" for k, v in params)
+        return f"{request.url.path}?{query}"
+
+    # Tag versions
+
+    async def _current_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        if not tags:
+            return {}
+
+        if self.shared_tags:
+            try:
+                values = await get_async_redis().mget([REDIS_TAG_PREFIX + tag for tag in tags])
+                return {tag: int(value or 0) for tag, value in zip(tags, values)}
+            except redis.RedisError as e:
+                logger.warning(f"Response cache Redis tier unavailable: {e}")
+
+        with self._lock:
+            return {tag: self._tag_versions.get(tag, 0) for tag in tags}
+
+    async def _is_fresh(self, entry: CachedResponse) -> bool:
+        if entry.expires_at < time.monotonic():
+            return False
+        return await self._current_versions(entry.tag_versions) == entry.tag_versions
+
+    # Storage
+
+    async def _get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None and self.use_redis:
+            entry = await self._get_from_redis(key)
+            if entry is not None:
+                self._put_local(key, entry)
+
+        if entry is None or not await self._is_fresh(entry):
+            return None
+        return entry
+
+    async def _get_from_redis(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = await get_async_redis().get(REDIS_ENTRY_PREFIX + key)
+        except redis.RedisError as e:
+            logger.warning(f"Response cache Redis tier unavailable: {e}")
+            return None
+
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        return CachedResponse(
+            body=data["body"].encode(),
+            etag=data["etag"],
+            tag_versions=data["tags"],
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+
+    def _put_local(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _store(self, key: str, body: bytes, tag_versions: Dict[str, int]) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag='"' + hashlib.sha1(body).hexdigest() + '"',
+            tag_versions=tag_versions,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._put_local(key, entry)
+
+        if self.use_redis:
+            try:
+                await get_async_redis().set(
+                    REDIS_ENTRY_PREFIX + key,
+                    json.dumps({"body": body.decode(), "etag": entry.etag, "tags": tag_versions}),
+                    ex=self.ttl_seconds,
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Response cache Redis tier unavailable: {e}")
+
+        return entry
+
+    # Public API
+
+    @staticmethod
+    def render(payload: Any) -> bytes:
+        """Serialize a payload the same way the route would"""
+        return ORJSONResponse(content=payload).body
+
+    async def respond(
+        self,
+        request: Request,
+        build: Callable[[], Any],
+        tags: TagSpec,
+    ) -> Response:
+        """
+        Serve a cached response, or build, cache and serve a fresh one
+
+        Args:
+            request: Incoming request (key and If-None-Match come from it)
+            build: Produces the payload on a miss (may raise HTTPException)
+            tags: Invalidation tags, or a callable deriving them from the payload
+
+        Returns:
+            200 response with ETag, or 304 if the client copy is current
+        """
+        key = self.make_key(request)
+        entry = await self._get(key) if settings.CACHE_ENABLED else None
+
+        if entry is None:
+            self.misses += 1
+
+            # Read versions before building so an invalidation that races
+            # with the build leaves the stored entry already stale.
+            # Payload-derived tags can only be read afterwards; the TTL
+            # bounds that (small) window.
+            if callable(tags):
+                payload = build()
+                tag_list = tags(payload)
+                versions = await self._current_versions(tag_list)
+            else:
+                versions = await self._current_versions(tags)
+                payload = build()
+
+            entry = await self._store(key, self.render(payload), versions)
+        else:
+            self.hits += 1
+
+        headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            if entry.etag in candidates or "*" in candidates:
+                self.not_modified += 1
+                return Response(status_code=304, headers=headers)
+
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def _bump_local(self, tags: Iterable[str]) -> List[str]:
+        tags = list(dict.fromkeys(tags))
+        self.invalidations += len(tags)
+        with self._lock:
+            for tag in tags:
+                self._tag_versions[tag] = self._tag_versions.get(tag, 0) + 1
+        return tags
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        """Invalidate every cached response built against any of the tags (workers, sync code)"""
+        tags = self._bump_local(tags)
+        if not tags or not self.shared_tags:
+            return
+
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for tag in tags:
+                pipe.incr(REDIS_TAG_PREFIX + tag)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Failed to invalidate cache tags in Redis: {e}")
+
+    async def invalidate_tags_async(self, tags: Iterable[str]) -> None:
+        """invalidate_tags() for request handlers, without blocking the event loop"""
+        tags = self._bump_local(tags)
+        if not tags or not self.shared_tags:
+            return
+
+        try:
+            async with get_async_redis().pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(REDIS_TAG_PREFIX + tag)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Failed to invalidate cache tags in Redis: {e}")
+
+    @staticmethod
+    def _location_tags(location_id: str, contacts: bool) -> List[str]:
+        tags = [LOCATIONS_TAG, location_tag(location_id)]
+        if contacts:
+            tags.append(contacts_tag(location_id))
+        return tags
+
+    def invalidate_location(self, location_id: str, contacts: bool = True) -> None:
+        """Invalidate a location record, the location list and (optionally) its contacts"""
+        self.invalidate_tags(self._location_tags(location_id, contacts))
+
+    async def invalidate_location_async(self, location_id: str, contacts: bool = True) -> None:
+        """invalidate_location() for request handlers"""
+        await self.invalidate_tags_async(self._location_tags(location_id, contacts))
+
+    def clear(self) -> None:
+        """Drop all local entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "entries": len(self._entries),
+            "redis": self.use_redis,
+            "sharedTags": self.shared_tags,
+            "hits": self.hits,
+            "misses": self.misses,
+            "notModified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+    use_redis=settings.CACHE_REDIS_ENABLED,
+    shared_tags=settings.CACHE_SHARED_INVALIDATION,
+)
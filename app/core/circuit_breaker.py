@@ -0,0 +1,159 @@
+"""
+Circuit Breakers
+Per-endpoint failure isolation for outbound API calls
+"""
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+from app.core.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Calls to the endpoint are being rejected until retry_after seconds pass"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit for {name} is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker
+
+    Closed: calls pass; outcomes in the last `window_seconds` are kept.
+    Once at least `min_requests` were seen and the failure share reaches
+    `failure_rate`, the breaker opens and rejects calls for
+    `open_seconds`. Then one probe call is let through (half-open): its
+    success closes the breaker, its failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float,
+        min_requests: int,
+        window_seconds: float,
+        open_seconds: float,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+
+        # Counters
+        self.rejected = 0
+        self.opened = 0
+
+    def _trim(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+
+    def allow(self) -> None:
+        """
+        Raises:
+            CircuitOpen: If the call must not be made
+        """
+        if self.state == CLOSED:
+            return
+
+        now = time.monotonic()
+        remaining = self._opened_at + self.open_seconds - now
+        if self.state == OPEN and remaining <= 0:
+            self.state = HALF_OPEN
+            self._probing = False
+
+        # One probe at a time; a probe that never reported back (e.g. was
+        # cancelled) is replaced after open_seconds
+        if self.state == HALF_OPEN and (
+            not self._probing or now - self._probe_started > self.open_seconds
+        ):
+            self._probing = True
+            self._probe_started = now
+            return
+
+        self.rejected += 1
+        raise CircuitOpen(self.name, max(remaining, 0.0))
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 unless open)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(self._opened_at + self.open_seconds - time.monotonic(), 0.0)
+
+    def record(self, success: bool) -> None:
+        now = time.monotonic()
+        if self.state == HALF_OPEN:
+            if success:
+                self.state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._open(now)
+            return
+        if self.state == OPEN:
+            return  # Late result of a call made before opening
+
+        self._outcomes.append((now, success))
+        self._trim(now)
+        if self.state == CLOSED and len(self._outcomes) >= self.min_requests:
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self._opened_at = now
+        self._probing = False
+        self._outcomes.clear()
+        self.opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return {
+            "state": self.state,
+            "requests": len(self._outcomes),
+            "failures": failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class BreakerRegistry:
+    """One breaker per endpoint name, created on first use"""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers[name] = CircuitBreaker(
+                name,
+                failure_rate=settings.GHL_BREAKER_FAILURE_RATE,
+                min_requests=settings.GHL_BREAKER_MIN_REQUESTS,
+                window_seconds=settings.GHL_BREAKER_WINDOW_SECONDS,
+                open_seconds=settings.GHL_BREAKER_OPEN_SECONDS,
+            )
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state per endpoint for monitoring"""
+        return {name: breaker.stats() for name, breaker in sorted(self._breakers.items())}
+
+
+# Global GHL circuit breaker registry
+ghl_breakers = BreakerRegistry()
@@ -21,6 +21,7 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = 1.0  # Seconds; an unreachable Redis fails fast
 
     # GHL OAuth
     GHL_CLIENT_ID: str
@@ -31,6 +32,22 @@ class Settings(BaseSettings):
     # GHL API
     GHL_API_BASE_URL: str = "https://services.leadconnectorhq.com"
     GHL_API_VERSION: str = "2021-07-28"
+    GHL_READ_CACHE_SECONDS: float = 5.0  # Location info / contact reads (0 disables)
+    GHL_LOCATION_TOKEN_CACHE_SECONDS: float = 300.0
+    GHL_CACHE_MAX_ENTRIES: int = 1024
+    GHL_CONNECT_TIMEOUT: float = 5.0
+    GHL_READ_TIMEOUT: float = 30.0
+    GHL_RETRY_ATTEMPTS: int = 3  # Idempotent requests only
+    GHL_RETRY_BASE_DELAY: float = 0.5  # Exponential backoff with full jitter
+    GHL_RETRY_MAX_DELAY: float = 8.0
+    GHL_BREAKER_FAILURE_RATE: float = 0.5  # Per endpoint, over the window below
+    GHL_BREAKER_MIN_REQUESTS: int = 20
+    GHL_BREAKER_WINDOW_SECONDS: float = 60.0
+    GHL_BREAKER_OPEN_SECONDS: float = 30.0
+    GHL_HEDGE_PERCENTILE: float = 0.95  # Hedged reads: backup request after this latency
+    GHL_HEDGE_BUDGET_PERCENT: float = 5.0  # Max share of hedged requests (0 disables)
+    GHL_HEDGE_MIN_SAMPLES: int = 20  # Latencies needed before hedging an endpoint
+    GHL_HEDGE_MIN_DELAY: float = 0.05
 
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
@@ -38,6 +55,16 @@ class Settings(BaseSettings):
     # OpenAI
     OPENAI_API_KEY: str = ""
 
+    # AI grading
+    AI_GRADING_BACKEND: str = "openai"  # openai or stub
+    AI_GRADING_MODEL: str = "gpt-4o-mini"
+    AI_GRADING_CONCURRENCY: int = 4  # Concurrent requests per API key
+    AI_GRADING_BATCH_SIZE: int = 50
+    AI_GRADING_MAX_BATCHES: int = 20  # Per location per job run
+    AI_GRADING_MAX_MESSAGES: int = 20  # Most recent messages included in the prompt
+    AI_GRADING_INTERVAL_MINUTES: int = 30
+    AI_GRADING_STUB_LATENCY: float = 0.0  # Seconds per stub completion
+
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
 
@@ -48,11 +75,75 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/1"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/2"
 
+    # GHL sync
+    GHL_SYNC_CONCURRENCY: int = 5  # Concurrent page requests per location
+    GHL_PAGE_SIZE: int = 100
+    GHL_LOCATIONS_PAGE_SIZE: int = 500  # /oauth/installedLocations page size
+    BULK_UPSERT_CHUNK_SIZE: int = 1000  # Rows per INSERT ... ON CONFLICT statement
+    LOCATION_SYNC_INTERVAL_MINUTES: int = 60  # Target sync interval of a standard-tier location
+    GHL_RATE_BUDGET_PER_SECOND: float = 8.0  # Per location; GHL allows 100 requests / 10s
+    GHL_RATE_BUDGET_BURST: int = 20
+
+    # Sync scheduler
+    SYNC_SCHEDULER_TICK_SECONDS: int = 60
+    SYNC_MIN_INTERVAL_MINUTES: int = 10  # Busiest locations
+    SYNC_MAX_INTERVAL_MINUTES: int = 24 * 60  # Dormant locations
+    SYNC_MAX_CONCURRENT_LOCATIONS: int = 20  # Global cap (shared GHL budget)
+    SYNC_MAX_CONCURRENT_PER_COMPANY: int = 3
+    SYNC_LEASE_MINUTES: int = 30  # In-flight marker expiry (crashed or failed syncs)
+    SYNC_CHANGE_RATE_ALPHA: float = 0.3  # Weight of the latest sync in the change rate average
+    LEASE_TTL_SECONDS: int = 60  # Per-location sync lease; renewed every TTL/3 while held
+
+    # Sync sharding (consistent hashing of locations over worker nodes)
+    SYNC_SHARDING: bool = True
+    SHARD_VNODES: int = 160  # Ring points per worker node
+    SHARD_HEARTBEAT_SECONDS: int = 15
+    SHARD_MEMBER_TIMEOUT_SECONDS: int = 45  # Nodes silent this long leave the ring
+
+    # Contact detail hydration
+    HYDRATION_BATCH_SIZE: int = 100  # Contacts claimed (and written back) per batch
+    HYDRATION_CONCURRENCY: int = 5
+    HYDRATION_MAX_BATCHES: int = 50  # Per location per job run; the rest waits for the next run
+    HYDRATION_INTERVAL_MINUTES: int = 10
+    HYDRATION_CLAIM_SECONDS: int = 600  # Claims of crashed workers expire after this
+
     # Security
     ALLOWED_HOSTS: List[str] = ["*"]  # Set to specific domains in production
     MAX_REQUEST_SIZE: int = 10 * 1024 * 1024  # 10 MB
     RATE_LIMIT_PER_MINUTE: int = 100
 
+    # Crypto thread pool (bcrypt / backup codes)
+    CRYPTO_POOL_SIZE: int = 4
+    CRYPTO_POOL_MAX_QUEUE: int = 32  # Requests beyond this get a 503
+
+    # 2FA
+    TWO_FACTOR_SETUP_TTL_SECONDS: int = 600  # How long setup QR codes stay cached
+
+    # Response cache (read endpoints)
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_TTL_SECONDS: int = 300  # Safety net; invalidation is tag based
+    CACHE_REDIS_ENABLED: bool = False  # Share entries across processes
+    # Tag versions in Redis, so worker syncs invalidate API caches
+    CACHE_SHARED_INVALIDATION: bool = True
+
+    # Contact export streaming
+    EXPORT_YIELD_PER: int = 1000  # Rows fetched per server-side cursor round trip
+    EXPORT_CHUNK_BYTES: int = 64 * 1024  # Response chunk size
+    EXPORT_GZIP_LEVEL: int = 6
+
+    # Analytics exports (Parquet / Arrow)
+    ANALYTICS_BATCH_ROWS: int = 50000  # Rows per record batch / Parquet row group
+    ANALYTICS_PARQUET_COMPRESSION: str = "zstd"
+    # Local dir or s3://bucket/prefix; empty disables scheduled snapshots
+    ANALYTICS_EXPORT_URI: str = ""
+    ANALYTICS_EXPORT_INTERVAL_HOURS: int = 24
+
+    # Session activity tracking
+    SESSION_TRACKER_BACKEND: str = "memory"  # memory or redis
+    SESSION_FLUSH_INTERVAL_SECONDS: int = 30
+    SESSION_SWEEP_INTERVAL_SECONDS: int = 300
+
     # IP Whitelisting
     ADMIN_IPS: List[str] = ["127.0.0.1", "::1"]  # IPs allowed to access /docs, /admin
 
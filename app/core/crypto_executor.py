@@ -0,0 +1,120 @@
+"""
+Crypto Executor
+Runs CPU-heavy hashing (bcrypt, backup codes) off the event loop
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class CryptoExecutor:
+    """
+    Bounded thread pool for password hashing
+
+    bcrypt releases the GIL while hashing, so a small thread pool gives
+    real parallelism without the pickling overhead of a process pool.
+    Work beyond max_workers + max_queue is rejected with a 503 instead of
+    piling up behind a login storm.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 32):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Counters (guarded by _lock)
+        self._pending = 0  # queued + running
+        self._running = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Create the pool lazily so importing this module stays cheap"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="crypto",
+                    )
+        return self._executor
+
+    def _call(self, func: Callable[..., T], args: tuple) -> T:
+        """Wrapper executed on the worker thread"""
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _on_done(self, future: Future) -> None:
+        """Release the slot when work finishes or is cancelled before starting"""
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run func(*args) on the crypto pool
+
+        Raises:
+            HTTPException: 503 if the pool and its queue are saturated
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+        try:
+            future = self._get_executor().submit(self._call, func, args)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and throughput counters for monitoring"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "peak_pending": self._peak_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool (called on application shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global crypto executor instance
+crypto_executor = CryptoExecutor(
+    max_workers=settings.CRYPTO_POOL_SIZE,
+    max_queue=settings.CRYPTO_POOL_MAX_QUEUE,
+)
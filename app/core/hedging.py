@@ -0,0 +1,166 @@
+"""
+Request Hedging
+Latency-percentile hedge delays, a hedge budget and win/loss counters
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from app.core.config import settings
+
+
+class _EndpointStats:
+    def __init__(self, window: int):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.primary_wins = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+
+class Hedger:
+    """
+    Send a backup copy of a slow idempotent request
+
+    If the first attempt hasn't answered after the endpoint's observed
+    latency percentile, a second identical attempt is started and the
+    first to succeed wins; the other is cancelled. Each request earns
+    `budget_percent`/100 of a hedge token (capped at `burst`) and a hedge
+    spends a whole one, so hedges stay under that share of traffic.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget_percent: float = 5.0,
+        burst: float = 10.0,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        window: int = 500,
+    ):
+        self.percentile = percentile
+        self.budget_percent = budget_percent
+        self.burst = burst
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self._tokens = 0.0
+        self._endpoints: Dict[str, _EndpointStats] = {}
+
+    def _endpoint(self, name: str) -> _EndpointStats:
+        stats = self._endpoints.get(name)
+        if stats is None:
+            stats = self._endpoints[name] = _EndpointStats(self.window)
+        return stats
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging (None until enough latencies were seen)"""
+        latencies = self._endpoint(endpoint).latencies
+        if len(latencies) < self.min_samples:
+            return None
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return max(ordered[index], self.min_delay)
+
+    def _spend(self, stats: _EndpointStats) -> bool:
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        stats.budget_denied += 1
+        return False
+
+    async def run(
+        self,
+        endpoint: str,
+        attempt: Callable[[], Awaitable[Any]],
+        succeeded: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Await attempt(), hedging it with a second call if it is slow
+
+        Args:
+            endpoint: Name whose latencies set the hedge delay
+            attempt: Coroutine factory for one attempt (must be idempotent)
+            succeeded: Whether a returned result is a success (default: any
+                result is); a failed result doesn't win over a pending attempt
+
+        Returns:
+            The first successful result. If neither attempt succeeds, the
+            first returned result, or the primary's error if both raised
+        """
+        stats = self._endpoint(endpoint)
+        stats.requests += 1
+        self._tokens = min(self.burst, self._tokens + self.budget_percent / 100)
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(attempt())
+        hedge = None
+        try:
+            delay = self.delay(endpoint)
+            if delay is not None and self.budget_percent > 0:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done and self._spend(stats):
+                    stats.hedged += 1
+                    hedge = asyncio.ensure_future(attempt())
+
+            if hedge is None:
+                result = await primary
+            else:
+                pending = {primary, hedge}
+                winner = None
+                while pending and winner is None:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    winner = next((task for task in done if self._won(task, succeeded)), None)
+                if winner is None:
+                    # Neither succeeded: a returned (failed) result, else the primary's error
+                    returned = [task for task in (primary, hedge) if task.exception() is None]
+                    return (returned[0] if returned else primary).result()
+                if winner is primary:
+                    stats.primary_wins += 1
+                else:
+                    stats.hedge_wins += 1
+                result = winner.result()
+
+            # When a hedge won this is a lower bound of the primary's latency
+            stats.latencies.append(time.monotonic() - started)
+            return result
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _won(task: "asyncio.Future[Any]", succeeded: Optional[Callable[[Any], bool]]) -> bool:
+        if task.exception() is not None:
+            return False
+        return succeeded is None or succeeded(task.result())
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedge counters and current delay per endpoint, for tuning"""
+        return {
+            "budgetPercent": self.budget_percent,
+            "tokens": round(self._tokens, 2),
+            "endpoints": {
+                name: {
+                    "requests": stats.requests,
+                    "hedged": stats.hedged,
+                    "primaryWins": stats.primary_wins,
+                    "hedgeWins": stats.hedge_wins,
+                    "budgetDenied": stats.budget_denied,
+                    "delay": self.delay(name),
+                }
+                for name, stats in sorted(self._endpoints.items())
+            },
+        }
+
+
+# Global GHL hedging instance
+ghl_hedger = Hedger(
+    percentile=settings.GHL_HEDGE_PERCENTILE,
+    budget_percent=settings.GHL_HEDGE_BUDGET_PERCENT,
+    min_samples=settings.GHL_HEDGE_MIN_SAMPLES,
+    min_delay=settings.GHL_HEDGE_MIN_DELAY,
+)
@@ -0,0 +1,190 @@
+"""
+Distributed Leases
+Redis leases with fencing tokens so one location is synced by one worker at a time
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_LEASE_PREFIX = "lease:"
+REDIS_FENCE_PREFIX = "lease:fence:"
+REDIS_PROGRESS_PREFIX = "lease:progress:"
+
+# Owner-checked renew / release: a holder whose lease expired must not
+# extend or delete the lease a newer holder took
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[2])
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaseHeld(Exception):
+    """Another worker holds the lease; `progress` is what it last reported"""
+
+    def __init__(self, name: str, progress: Dict[str, Any]):
+        super().__init__(f"Lease {name} is held by another worker")
+        self.name = name
+        self.progress = progress
+
+
+class LeaseLost(Exception):
+    """The lease expired or was taken over while held"""
+
+
+class Lease:
+    """
+    A held lease
+
+    `token` increases with every acquisition of the same name, but lives
+    in Redis and restarts if Redis loses data. Storage that rejects writes
+    from a holder paused past its TTL and replaced should issue its own
+    fencing token and keep it in `fence` (see Location.sync_fence).
+    """
+
+    def __init__(self, name: str, token: int, owner: str, ttl_ms: int):
+        self.name = name
+        self.token = token
+        self.owner = owner
+        self.ttl_ms = ttl_ms
+        self.fence: Optional[int] = None
+        self.lost = False
+
+    @property
+    def _value(self) -> str:
+        return f"{self.token}:{self.owner}"
+
+    async def renew(self) -> bool:
+        renewed = await get_async_redis().eval(
+            _RENEW_SCRIPT, 1, REDIS_LEASE_PREFIX + self.name, self._value, self.ttl_ms
+        )
+        return bool(renewed)
+
+    async def release(self) -> None:
+        await get_async_redis().eval(
+            _RELEASE_SCRIPT, 2,
+            REDIS_LEASE_PREFIX + self.name, REDIS_PROGRESS_PREFIX + self.name,
+            self._value,
+        )
+
+    async def report(self, **progress: Any) -> None:
+        """Publish progress for callers that find the lease held"""
+        key = REDIS_PROGRESS_PREFIX + self.name
+        fields = {**{k: str(v) for k, v in progress.items()}, "updatedAt": time.time()}
+        try:
+            async with get_async_redis().pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=fields)
+                pipe.pexpire(key, self.ttl_ms)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not report progress for lease {self.name}: {e}")
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+async def get_progress(name: str) -> Dict[str, Any]:
+    """Progress last reported by the holder of a lease"""
+    return await get_async_redis().hgetall(REDIS_PROGRESS_PREFIX + name)
+
+
+async def acquire(name: str, ttl_seconds: Optional[int] = None) -> Optional[Lease]:
+    """
+    Try to take a lease (SET NX PX) without waiting
+
+    Returns:
+        The Lease, or None if another worker holds it
+    """
+    ttl_ms = int((ttl_seconds or settings.LEASE_TTL_SECONDS) * 1000)
+    client = get_async_redis()
+    token = await client.incr(REDIS_FENCE_PREFIX + name)
+    lease = Lease(name, token, _owner(), ttl_ms)
+
+    if not await client.set(REDIS_LEASE_PREFIX + name, lease._value, nx=True, px=ttl_ms):
+        return None
+    await lease.report(status="started")
+    return lease
+
+
+async def _heartbeat(lease: Lease, holder: asyncio.Task) -> None:
+    """Renew every TTL/3; cancel the holder's task if the lease is lost"""
+    interval = lease.ttl_ms / 3000
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            renewed = await lease.renew()
+        except redis.RedisError as e:
+            logger.warning(f"Lease {lease.name} renewal failed: {e}")
+            continue  # Retry; the TTL still covers two more attempts
+        if not renewed:
+            logger.error(f"Lease {lease.name} lost; cancelling its work")
+            lease.lost = True
+            holder.cancel()
+            return
+
+
+@asynccontextmanager
+async def hold(name: str, ttl_seconds: Optional[int] = None) -> AsyncIterator[Optional[Lease]]:
+    """
+    Hold a lease for the duration of the block, renewing it in the background
+
+    If Redis is unavailable the block runs without a lease (yields None)
+    rather than stopping all syncs.
+
+    Raises:
+        LeaseHeld: Another worker holds the lease
+        LeaseLost: The lease was lost mid-block (the block was cancelled)
+    """
+    try:
+        lease = await acquire(name, ttl_seconds)
+    except redis.RedisError as e:
+        logger.warning(f"Lease {name} unavailable, continuing without it: {e}")
+        yield None
+        return
+
+    if lease is None:
+        try:
+            progress = await get_progress(name)
+        except redis.RedisError:
+            progress = {}
+        raise LeaseHeld(name, progress)
+
+    heartbeat = asyncio.create_task(_heartbeat(lease, asyncio.current_task()))
+    try:
+        yield lease
+    except asyncio.CancelledError:
+        if lease.lost:
+            raise LeaseLost(f"Lease {name} was lost")
+        raise
+    finally:
+        heartbeat.cancel()
+        if not lease.lost:
+            try:
+                await lease.release()
+            except redis.RedisError as e:
+                logger.warning(f"Lease {name} release failed (expires on its own): {e}")
+
+
+def location_lease_name(location_id: str) -> str:
+    return f"sync:{location_id}"
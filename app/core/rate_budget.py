@@ -0,0 +1,106 @@
+"""
+GHL Rate Budget
+Token buckets that pace outbound GHL API calls per location
+"""
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+
+class TokenBucket:
+    """
+    Async token bucket
+
+    Holds up to `burst` tokens, refilled at `rate` per second. acquire()
+    waits until a token is available instead of failing, so callers are
+    paced rather than rejected.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Workers run each job in a fresh event loop (asyncio.run); a lock
+        # used in one loop can't be awaited from another
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, sleeping until they are available
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        async with self._get_lock():
+            self._refill()
+            while self._tokens < tokens:
+                delay = (tokens - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= tokens
+        return waited
+
+
+class RateBudget:
+    """
+    One token bucket per key (GHL location id)
+
+    GHL limits requests per location, so each location gets its own
+    budget, set below GHL's burst limit to leave headroom for other
+    callers sharing the same token.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, TokenBucket] = {}
+
+        # Counters
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def acquire(self, key: str, tokens: float = 1.0) -> None:
+        """Wait for budget to make a request on behalf of key"""
+        self.waited_seconds += await self.bucket(key).acquire(tokens)
+        self.acquired += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "ratePerSecond": self.rate,
+            "burst": self.burst,
+            "keys": len(self._buckets),
+            "acquired": self.acquired,
+            "waitedSeconds": round(self.waited_seconds, 3),
+        }
+
+
+# Global GHL rate budget instance
+ghl_rate_budget = RateBudget(
+    rate=settings.GHL_RATE_BUDGET_PER_SECOND,
+    burst=settings.GHL_RATE_BUDGET_BURST,
+)
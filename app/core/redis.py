@@ -0,0 +1,55 @@
+"""
+Redis Connection Management
+Lazily created Redis clients (synchronous per process, asyncio per event loop)
+"""
+import asyncio
+import weakref
+from typing import Any, Dict, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+
+_sync_client: Optional[redis.Redis] = None
+# Pooled asyncio connections are bound to the loop that opened them, and
+# workers run each job in a fresh loop (asyncio.run): one client per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _options() -> Dict[str, Any]:
+    return {
+        "decode_responses": True,
+        "socket_timeout": settings.REDIS_SOCKET_TIMEOUT,
+        "socket_connect_timeout": settings.REDIS_SOCKET_TIMEOUT,
+    }
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared synchronous Redis client (workers, sync code paths)"""
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(settings.REDIS_URL, **_options())
+    return _sync_client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Get the asyncio Redis client of the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = aioredis.Redis.from_url(settings.REDIS_URL, **_options())
+    return client
+
+
+async def close_redis() -> None:
+    """Close Redis clients (called on application shutdown)"""
+    global _sync_client
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
@@ -0,0 +1,210 @@
+"""
+Session Activity Tracking
+Write-behind batching for UserSession.last_activity
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import redis
+from sqlalchemy import bindparam, update
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.redis import get_async_redis
+from app.models.auth import UserSession
+
+logger = logging.getLogger(__name__)
+
+REDIS_ACTIVITY_KEY = "sessions:activity"
+
+# Bulk UPDATE executed with one parameter set per session.
+# The last_activity guard keeps a slow flush from moving time backwards.
+_user_sessions = UserSession.__table__
+_flush_statement = (
+    update(_user_sessions)
+    .where(_user_sessions.c.session_id == bindparam("sid"))
+    .where(_user_sessions.c.is_active.is_(True))
+    .where(_user_sessions.c.last_activity < bindparam("seen_at"))
+    .values(last_activity=bindparam("seen_at"))
+)
+
+
+class SessionTracker:
+    """
+    Records session activity in memory (or Redis) and flushes it in batches
+
+    Every authenticated request calls touch(); only the latest timestamp per
+    session is kept, so N requests between flushes cost one UPDATE row.
+    """
+
+    def __init__(self, backend: str = "memory"):
+        self.backend = backend
+        self._pending: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._last_sweep = 0.0
+
+        # Counters
+        self.touches = 0
+        self.flushed = 0
+        self.deactivated = 0
+
+    async def touch(self, session_id: str) -> None:
+        """Record activity for a session (no database write)"""
+        self.touches += 1
+        now = time.time()
+
+        if self.backend == "redis":
+            try:
+                await get_async_redis().hset(REDIS_ACTIVITY_KEY, session_id, now)
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Session tracker falling back to memory: {e}")
+
+        self._pending[session_id] = now
+
+    def discard(self, session_id: str) -> None:
+        """Forget pending activity for a session (e.g. on logout)"""
+        self._pending.pop(session_id, None)
+
+    async def _drain(self) -> Dict[str, float]:
+        """Take all pending activity, leaving the buffers empty"""
+        pending, self._pending = self._pending, {}
+
+        if self.backend == "redis":
+            # Rename first so concurrent touches land in a fresh hash
+            client = get_async_redis()
+            flush_key = f"{REDIS_ACTIVITY_KEY}:flush:{uuid.uuid4().hex}"
+            try:
+                await client.rename(REDIS_ACTIVITY_KEY, flush_key)
+                stored = await client.hgetall(flush_key)
+                await client.delete(flush_key)
+            except redis.ResponseError:
+                stored = {}  # Nothing recorded since last flush
+            except redis.RedisError as e:
+                logger.error(f"Failed to drain session activity from Redis: {e}")
+                stored = {}
+
+            for session_id, seen_at in stored.items():
+                seen_at = float(seen_at)
+                if seen_at > pending.get(session_id, 0.0):
+                    pending[session_id] = seen_at
+
+        return pending
+
+    def _write(self, pending: Dict[str, float]) -> int:
+        """Apply coalesced activity in one executemany UPDATE"""
+        params = [
+            {"sid": session_id, "seen_at": datetime.fromtimestamp(seen_at, tz=timezone.utc)}
+            for session_id, seen_at in pending.items()
+        ]
+
+        db = SessionLocal()
+        try:
+            db.execute(_flush_statement, params)
+            db.commit()
+        finally:
+            db.close()
+
+        return len(params)
+
+    async def flush(self) -> int:
+        """
+        Flush pending activity to the database
+
+        Returns:
+            Number of sessions written
+        """
+        pending = await self._drain()
+        if not pending:
+            return 0
+
+        try:
+            written = await asyncio.to_thread(self._write, pending)
+        except Exception:
+            # Put entries back (unless newer activity arrived) and retry next cycle
+            for session_id, seen_at in pending.items():
+                if seen_at > self._pending.get(session_id, 0.0):
+                    self._pending[session_id] = seen_at
+            raise
+
+        self.flushed += written
+        return written
+
+    def _sweep(self) -> int:
+        """Deactivate expired sessions (range scan on idx_session_expiry)"""
+        db = SessionLocal()
+        try:
+            result = db.execute(
+                update(UserSession)
+                .where(
+                    UserSession.expires_at < datetime.now(timezone.utc),
+                    UserSession.is_active.is_(True),
+                )
+                .values(is_active=False)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    async def sweep_expired(self) -> int:
+        """
+        Mark expired sessions inactive
+
+        Returns:
+            Number of sessions deactivated
+        """
+        deactivated = await asyncio.to_thread(self._sweep)
+        self.deactivated += deactivated
+        self._last_sweep = time.monotonic()
+        return deactivated
+
+    async def _run(self) -> None:
+        """Periodic flush/sweep loop"""
+        while True:
+            await asyncio.sleep(settings.SESSION_FLUSH_INTERVAL_SECONDS)
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_sweep >= settings.SESSION_SWEEP_INTERVAL_SECONDS:
+                    await self.sweep_expired()
+            except Exception as e:
+                logger.error(f"Session tracker maintenance failed: {e}", exc_info=True)
+
+    def start(self) -> None:
+        """Start the background flush loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the loop and flush whatever is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final session activity flush failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "backend": self.backend,
+            "pending": len(self._pending),
+            "touches": self.touches,
+            "flushed": self.flushed,
+            "deactivated": self.deactivated,
+        }
+
+
+# Global session tracker instance
+session_tracker = SessionTracker(backend=settings.SESSION_TRACKER_BACKEND)
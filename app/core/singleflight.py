@@ -0,0 +1,109 @@
+"""
+Request Coalescing
+Singleflight for identical concurrent calls, with an optional short-TTL result cache
+"""
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+_Calls = Dict[Hashable, asyncio.Task]
+
+
+class SingleFlight:
+    """
+    Run one call per key at a time; concurrent callers share its result
+
+    The call runs in its own task, so a caller that gives up (is
+    cancelled) doesn't cancel it for the others. Successful results can
+    be kept for `ttl` seconds; errors are never cached.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # In-flight calls per event loop (workers run a fresh loop per job)
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Calls]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        # Counters
+        self.calls = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def _cached(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._results.pop(key, None)
+            return None
+        self._results.move_to_end(key)
+        return entry
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._results[key] = (time.monotonic() + ttl, value)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        ttl: float = 0.0,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Await fn() once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the call (e.g. method + URL + arguments)
+            fn: Coroutine factory performing the call
+            ttl: Seconds to serve the result from cache (0: coalesce only)
+            cache_if: Predicate deciding whether a result may be cached
+        """
+        if ttl:
+            entry = self._cached(key)
+            if entry is not None:
+                self.cache_hits += 1
+                return entry[1]
+
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.calls += 1
+            task = inflight[key] = asyncio.ensure_future(fn())
+
+            def done(finished: asyncio.Task) -> None:
+                inflight.pop(key, None)
+                if finished.cancelled() or finished.exception() is not None:
+                    return
+                if ttl and (cache_if is None or cache_if(finished.result())):
+                    self._store(key, finished.result(), ttl)
+
+            task.add_done_callback(done)
+
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._results.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "cacheHits": self.cache_hits,
+            "cachedEntries": len(self._results),
+        }
+
+
+# Global GHL request coalescing instance
+ghl_singleflight = SingleFlight(max_entries=settings.GHL_CACHE_MAX_ENTRIES)
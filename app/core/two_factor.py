@@ -2,15 +2,69 @@
 Two-Factor Authentication (2FA)
 TOTP-based 2FA using authenticator apps
 """
+import asyncio
 import pyotp
 import qrcode
 import io
 import base64
-from typing import Tuple, List
+import threading
+import time
+from typing import Tuple, List, Dict, Optional
+from urllib.parse import quote
 from passlib.context import CryptContext
 
+from app.core.config import settings
+from app.core.crypto_executor import crypto_executor
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+QR_FORMATS = ("svg", "png")
+
+
+class QRCodeCache:
+    """
+    Short-lived cache of rendered QR codes, keyed by TOTP secret
+
+    Entries only need to live for the setup window (until the user scans
+    the code and verifies), so a small TTL dict is enough.
+    """
+
+    def __init__(self, ttl_seconds: int = 600, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, secret: str, image_format: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get((secret, image_format))
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[(secret, image_format)]
+                return None
+            return value
+
+    def set(self, secret: str, image_format: str, value: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Drop expired entries first, then the oldest ones
+                for key in [k for k, (exp, _) in self._entries.items() if exp < now]:
+                    del self._entries[key]
+                while len(self._entries) >= self.max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[(secret, image_format)] = (now + self.ttl_seconds, value)
+
+    def forget(self, secret: str) -> None:
+        with self._lock:
+            for image_format in QR_FORMATS:
+                self._entries.pop((secret, image_format), None)
+
+
+qr_code_cache = QRCodeCache(ttl_seconds=settings.TWO_FACTOR_SETUP_TTL_SECONDS)
+
 
 class TwoFactorAuth:
     """Two-Factor Authentication Manager"""
@@ -42,16 +96,20 @@ class TwoFactorAuth:
         return totp.provisioning_uri(name=user_email, issuer_name=issuer)
 
     @staticmethod
-    def generate_qr_code(uri: str) -> str:
+    def generate_qr_code(uri: str, image_format: str = "png") -> str:
         """
         Generate QR code image from provisioning URI
 
         Args:
             uri: Provisioning URI
+            image_format: "png" (PIL raster) or "svg" (vector, no PIL)
 
         Returns:
-            Base64 encoded PNG image
+            Image as a data: URI
         """
+        if image_format == "svg":
+            return TwoFactorAuth.generate_qr_code_svg(uri)
+
         qr = qrcode.QRCode(version=1, box_size=10, border=5)
         qr.add_data(uri)
         qr.make(fit=True)
@@ -66,6 +124,78 @@ class TwoFactorAuth:
 
         return f"data:image/png;base64,{img_base64}"
 
+    @staticmethod
+    def generate_qr_code_svg(uri: str) -> str:
+        """
+        Generate QR code as a compact SVG from provisioning URI
+
+        Each dark run in a row becomes one stroked segment, which keeps the
+        markup a few KB. The SVG is percent-encoded rather than base64'd so
+        the response stays gzip-compressible.
+
+        Args:
+            uri: Provisioning URI
+
+        Returns:
+            SVG image as a data: URI
+        """
+        qr = qrcode.QRCode(border=4)
+        qr.add_data(uri)
+        qr.make(fit=True)
+
+        matrix = qr.get_matrix()
+        size = len(matrix)
+        segments = []
+
+        for y, row in enumerate(matrix):
+            x = 0
+            pen = None  # x position after the previous run in this row
+            while x < size:
+                if not row[x]:
+                    x += 1
+                    continue
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                if pen is None:
+                    segments.append(f"M{start} {y}.5h{x - start}")
+                else:
+                    segments.append(f"m{start - pen} 0h{x - start}")
+                pen = x
+
+        svg = (
+            f"<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 {size} {size}' "
+            f"shape-rendering='crispEdges'>"
+            f"<path fill='#fff' d='M0 0h{size}v{size}H0z'/>"
+            f"<path stroke='#000' d='{''.join(segments)}'/></svg>"
+        )
+
+        return "data:image/svg+xml," + quote(svg, safe=" '/:=.,-")
+
+    @staticmethod
+    async def get_qr_code_async(secret: str, uri: str, image_format: str = "svg") -> str:
+        """
+        Get QR code for a secret, rendering off the event loop on cache miss
+
+        Args:
+            secret: TOTP secret (cache key)
+            uri: Provisioning URI for the secret
+            image_format: "svg" or "png"
+
+        Returns:
+            Image as a data: URI
+        """
+        qr_code = qr_code_cache.get(secret, image_format)
+        if qr_code is None:
+            qr_code = await crypto_executor.run(TwoFactorAuth.generate_qr_code, uri, image_format)
+            qr_code_cache.set(secret, image_format, qr_code)
+        return qr_code
+
+    @staticmethod
+    def forget_qr_code(secret: str) -> None:
+        """Drop cached QR codes once setup is finished"""
+        qr_code_cache.forget(secret)
+
     @staticmethod
     def verify_token(secret: str, token: str) -> bool:
         """
@@ -122,6 +252,16 @@ class TwoFactorAuth:
                 return True, index
         return False, -1
 
+    @staticmethod
+    async def generate_backup_codes_async(count: int = 10) -> Tuple[List[str], List[str]]:
+        """Generate backup codes on the crypto pool (use from async handlers)"""
+        return await crypto_executor.run(TwoFactorAuth.generate_backup_codes, count)
+
+    @staticmethod
+    async def verify_backup_code_async(code: str, hashed_codes: List[str]) -> Tuple[bool, int]:
+        """Verify a backup code on the crypto pool (use from async handlers)"""
+        return await crypto_executor.run(TwoFactorAuth.verify_backup_code, code, hashed_codes)
+
     @staticmethod
     def setup_2fa(user_email: str) -> dict:
         """
@@ -151,6 +291,37 @@ class TwoFactorAuth:
             "backup_codes_hashed": hashed_codes,
         }
 
+    @staticmethod
+    async def setup_2fa_async(user_email: str, qr_format: str = "svg") -> dict:
+        """
+        Complete 2FA setup without blocking the event loop
+
+        QR rendering and backup code hashing run concurrently on the
+        crypto pool; the QR code is cached for the setup window.
+
+        Args:
+            user_email: User's email
+            qr_format: "svg" or "png"
+
+        Returns:
+            Dict with secret, QR code, and backup codes
+        """
+        secret = TwoFactorAuth.generate_secret()
+        uri = TwoFactorAuth.get_provisioning_uri(secret, user_email)
+
+        qr_code, (plain_codes, hashed_codes) = await asyncio.gather(
+            TwoFactorAuth.get_qr_code_async(secret, uri, qr_format),
+            TwoFactorAuth.generate_backup_codes_async(),
+        )
+
+        return {
+            "secret": secret,
+            "qr_code": qr_code,
+            "provisioning_uri": uri,
+            "backup_codes": plain_codes,
+            "backup_codes_hashed": hashed_codes,
+        }
+
 
 # Singleton instance
 two_factor_auth = TwoFactorAuth()
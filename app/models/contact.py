@@ -2,8 +2,8 @@
 Contact Models
 Stores GHL contact data and related information
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Text, Index, text
+from sqlalchemy.orm import backref, relationship, deferred
 from app.models.base import BaseModel
 
 
@@ -45,16 +45,20 @@ class Contact(BaseModel):
     created_by = Column(String(255), nullable=True)
 
     # Analytics fields
+    # Large Text columns are deferred (group "heavy"): entity loads skip them
+    # unless accessed or requested with undefer_group("heavy")
     ai_status = Column(String(100), default="not_contacted")
-    ai_summary = Column(Text, default="Read")
+    ai_summary = deferred(Column(Text, default="Read"), group="heavy")
     ai_quality_grade = Column(String(50), default="no_grade")
     ai_sales_grade = Column(String(50), default="no_grade")
+    ai_input_hash = Column(String(32), nullable=True)  # md5 of the graded input
+    ai_graded_at = Column(DateTime(timezone=True), nullable=True)
 
     # Activity metrics
     touch_summary = Column(String(255), default="no_touches")
-    engagement_summary = Column(Text, nullable=True)
+    engagement_summary = deferred(Column(Text, nullable=True), group="heavy")
     last_touch_date = Column(DateTime(timezone=True), nullable=True)
-    last_message = Column(Text, nullable=True)
+    last_message = deferred(Column(Text, nullable=True), group="heavy")
     speed_to_lead = Column(String(100), nullable=True)
 
     # CRM data
@@ -63,20 +67,44 @@ class Contact(BaseModel):
     total_pipeline_value = Column(Float, default=0.0)
 
     # Attribution
-    attribution = Column(Text, nullable=True)  # JSON string
-    followers = Column(Text, nullable=True)  # JSON string
+    attribution = deferred(Column(Text, nullable=True), group="heavy")  # JSON string
+    followers = deferred(Column(Text, nullable=True), group="heavy")  # JSON string
 
     # Data sync status
     details_fetched = Column(String(20), default="false")
+    sync_hash = Column(String(32), nullable=True)  # md5 of the last synced GHL fields
+    sync_generation = Column(Integer, nullable=True)  # Last full sync that saw the contact
+    hydration_claimed_at = Column(DateTime(timezone=True), nullable=True)  # Detail fetch running
 
     # Relationships
     location = relationship("Location", back_populates="contacts")
-    opportunities = relationship("Opportunity", back_populates="contact", cascade="all, delete-orphan")
-    tasks = relationship("Task", back_populates="contact", cascade="all, delete-orphan")
+    # Children are also removed by ON DELETE CASCADE (bulk deletes bypass the ORM)
+    opportunities = relationship(
+        "Opportunity", back_populates="contact", cascade="all, delete-orphan", passive_deletes=True
+    )
+    tasks = relationship(
+        "Task", back_populates="contact", cascade="all, delete-orphan", passive_deletes=True
+    )
 
     __table_args__ = (
         Index('idx_contact_location', 'external_id', 'location_id', unique=True),
         Index('idx_contact_date', 'location_id', 'date_added'),
+        # Hydration queue: only contacts still waiting for details, in
+        # the order the hydration worker claims them
+        Index(
+            'idx_contact_unhydrated',
+            'location_id',
+            text('last_touch_date DESC NULLS LAST'),
+            text('date_added DESC NULLS LAST'),
+            'id',
+            postgresql_where=text("details_fetched = 'false'"),
+        ).ddl_if(dialect='postgresql'),
+        # Grading queue: never graded, or changed since last graded
+        Index(
+            'idx_contact_ungraded',
+            'location_id',
+            postgresql_where=text("ai_graded_at IS NULL OR updated_at > ai_graded_at"),
+        ).ddl_if(dialect='postgresql'),
     )
 
 
@@ -89,7 +117,9 @@ class Opportunity(BaseModel):
 
     # GHL identifiers
     external_id = Column(String(255), nullable=False, unique=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False, index=True)
+    contact_id = Column(
+        Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
 
     # Opportunity info
     name = Column(String(500), nullable=True)
@@ -117,7 +147,9 @@ class Task(BaseModel):
 
     # GHL identifiers
     external_id = Column(String(255), nullable=False, unique=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False, index=True)
+    contact_id = Column(
+        Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
 
     # Task info
     title = Column(String(500), nullable=True)
@@ -145,7 +177,9 @@ class Conversation(BaseModel):
 
     # GHL identifiers
     external_id = Column(String(255), nullable=False, unique=True, index=True)
-    contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=False, index=True)
+    contact_id = Column(
+        Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
 
     # Conversation info
     channel = Column(String(100), nullable=True)  # SMS, email, etc.
@@ -153,4 +187,35 @@ class Conversation(BaseModel):
     unread_count = Column(Integer, default=0)
 
     # Related contact
-    contact = relationship("Contact", backref="conversations")
+    contact = relationship("Contact", backref=backref("conversations", passive_deletes=True))
+    messages = relationship(
+        "Message", back_populates="conversation", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class Message(BaseModel):
+    """
+    GHL Conversation Message
+    A single inbound or outbound message; source of touch metrics
+    """
+    __tablename__ = "messages"
+
+    # GHL identifiers
+    external_id = Column(String(255), nullable=False, unique=True, index=True)
+    conversation_id = Column(
+        Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False)
+
+    # Message info
+    direction = Column(String(20), nullable=True)  # inbound, outbound
+    message_type = Column(String(100), nullable=True)  # TYPE_SMS, TYPE_EMAIL, etc.
+    body = deferred(Column(Text, nullable=True))
+    date_added = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationship
+    conversation = relationship("Conversation", back_populates="messages")
+
+    __table_args__ = (
+        Index('idx_message_contact_date', 'contact_id', 'date_added'),
+    )
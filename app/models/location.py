@@ -2,7 +2,9 @@
 Location Models
 Stores GHL location data
 """
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Text
+from sqlalchemy import (
+    Column, String, Boolean, Integer, BigInteger, Float, DateTime, ForeignKey, Text
+)
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -38,8 +40,16 @@ class Location(BaseModel):
 
     # Analytics (cached values)
     contacts_count = Column(Integer, default=0)
+    contact_sync_generation = Column(Integer, default=0)  # Bumped by each full contact sync
     opportunities_count = Column(Integer, default=0)
 
+    # Sync scheduling
+    sync_tier = Column(Integer, default=1)  # Tenant tier: 0 low, 1 standard, 2 priority
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    sync_started_at = Column(DateTime(timezone=True), nullable=True)  # Set while a sync runs
+    sync_change_rate = Column(Float, default=0.0)  # Rows changed per hour (moving average)
+    sync_fence = Column(BigInteger, nullable=True)  # Fencing token of the latest sync lease
+
     # OpenAI API key (location-specific)
     openai_api_key = Column(String(255), nullable=True)
 
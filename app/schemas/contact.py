@@ -0,0 +1,67 @@
+"""
+Contact Response Schemas
+"""
+from app.models.contact import Contact
+from app.models.location import Location
+from app.schemas.serializers import RowSerializer
+
+# GET /contacts (one row per list entry)
+CONTACT_LIST = RowSerializer([
+    ("id", Contact.id),
+    ("externalId", Contact.external_id),
+    ("contactName", Contact.contact_name),
+    ("firstName", Contact.first_name),
+    ("lastName", Contact.last_name),
+    ("email", Contact.email),
+    ("phone", Contact.phone),
+    ("source", Contact.source),
+    ("dateAdded", Contact.date_added),
+    ("aiStatus", Contact.ai_status),
+    ("aiQualityGrade", Contact.ai_quality_grade),
+    ("aiSalesGrade", Contact.ai_sales_grade),
+    ("opportunitiesCount", Contact.opportunities_count),
+    ("totalPipelineValue", Contact.total_pipeline_value),
+    ("assignedTo", Contact.assigned_to),
+    ("lastTouchDate", Contact.last_touch_date),
+])
+
+# GET /contacts/{id} (requires a join to Location)
+CONTACT_DETAIL = RowSerializer([
+    ("id", Contact.id),
+    ("externalId", Contact.external_id),
+    ("locationId", Location.location_id),
+    ("contactName", Contact.contact_name),
+    ("firstName", Contact.first_name),
+    ("lastName", Contact.last_name),
+    ("email", Contact.email),
+    ("phone", Contact.phone),
+    ("address", Contact.address),
+    ("timezone", Contact.timezone),
+    ("country", Contact.country),
+    ("source", Contact.source),
+    ("dateAdded", Contact.date_added),
+    ("category", Contact.category),
+    ("channel", Contact.channel),
+    ("assignedTo", Contact.assigned_to),
+    ("createdBy", Contact.created_by),
+    ("aiStatus", Contact.ai_status),
+    ("aiSummary", Contact.ai_summary),
+    ("aiQualityGrade", Contact.ai_quality_grade),
+    ("aiSalesGrade", Contact.ai_sales_grade),
+    ("touchSummary", Contact.touch_summary),
+    ("engagementSummary", Contact.engagement_summary),
+    ("lastTouchDate", Contact.last_touch_date),
+    ("lastMessage", Contact.last_message),
+    ("speedToLead", Contact.speed_to_lead),
+    ("crmTasks", Contact.crm_tasks),
+    ("opportunitiesCount", Contact.opportunities_count),
+    ("totalPipelineValue", Contact.total_pipeline_value),
+    ("tags", Contact.tags),
+    ("createdAt", Contact.created_at),
+    ("updatedAt", Contact.updated_at),
+])
+
+# GET /contacts/export (per location, so locationId and its join are left out)
+CONTACT_EXPORT = CONTACT_DETAIL.project(
+    [key for key in CONTACT_DETAIL.keys if key != "locationId"]
+)
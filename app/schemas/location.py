@@ -0,0 +1,46 @@
+"""
+Location Response Schemas
+"""
+from app.models.location import Location
+from app.schemas.serializers import RowSerializer
+
+# GET /locations (one row per list entry)
+LOCATION_LIST = RowSerializer([
+    ("id", Location.id),
+    ("locationId", Location.location_id),
+    ("companyId", Location.company_id),
+    ("name", Location.name),
+    ("address", Location.address),
+    ("city", Location.city),
+    ("state", Location.state),
+    ("country", Location.country),
+    ("postalCode", Location.postal_code),
+    ("isInstalled", Location.is_installed),
+    ("contactsCount", Location.contacts_count),
+    ("opportunitiesCount", Location.opportunities_count),
+    ("createdAt", Location.created_at),
+    ("updatedAt", Location.updated_at),
+])
+
+# GET /locations/{id}
+LOCATION_DETAIL = RowSerializer([
+    ("id", Location.id),
+    ("locationId", Location.location_id),
+    ("companyId", Location.company_id),
+    ("name", Location.name),
+    ("address", Location.address),
+    ("city", Location.city),
+    ("state", Location.state),
+    ("country", Location.country),
+    ("postalCode", Location.postal_code),
+    ("timezone", Location.timezone),
+    ("email", Location.email),
+    ("phone", Location.phone),
+    ("website", Location.website),
+    ("isInstalled", Location.is_installed),
+    ("contactsCount", Location.contacts_count),
+    ("opportunitiesCount", Location.opportunities_count),
+    ("automationTemplate", Location.automation_template),
+    ("createdAt", Location.created_at),
+    ("updatedAt", Location.updated_at),
+])
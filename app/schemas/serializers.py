@@ -0,0 +1,122 @@
+"""
+Row Serializers
+Precompiled serializers for column-tuple query results
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query as QueryParam
+from sqlalchemy.orm import Query
+
+MAX_PROJECTIONS = 256
+
+
+def _compile(keys: Sequence[str]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+    """
+    Generate a function that turns a row tuple into a dict
+
+    The generated body is a single dict literal indexing the row by
+    position, which is about twice as fast as dict(zip(keys, row)).
+    """
+    items = ", ".join(f"{key!r}: row[{index}]" for index, key in enumerate(keys))
+    namespace: Dict[str, Any] = {}
+    exec(f"def serialize(row):\n    return {{{items}}}\n", namespace)
+    return namespace["serialize"]
+
+
+class RowSerializer:
+    """
+    Serializer for one response schema
+
+    Maps JSON keys to column expressions. Queries select exactly those
+    columns (no ORM entity construction) and rows are converted to dicts
+    by a generated function. Datetimes are left as-is; the ORJSON response
+    class renders them in ISO 8601, identical to .isoformat().
+
+    Usage:
+        rows = CONTACT_LIST.query(db).filter(...).all()
+        return ORJSONResponse({"contacts": CONTACT_LIST.many(rows)})
+    """
+
+    def __init__(self, fields: Sequence[Tuple[str, Any]]):
+        self.fields = list(fields)
+        self.keys = [key for key, _ in self.fields]
+        self.columns = [column for _, column in self.fields]
+        self.models = {getattr(column, "class_", None) for column in self.columns}
+        self._serialize = _compile(self.keys)
+        self._projections: Dict[Tuple[str, ...], "RowSerializer"] = {}
+
+    def uses(self, model: Any) -> bool:
+        """Whether any selected column belongs to model (i.e. needs a join)"""
+        return model in self.models
+
+    def project(self, keys: Iterable[str], required: Sequence[str] = ()) -> "RowSerializer":
+        """
+        Serializer for a subset of this schema's fields
+
+        Field order follows the schema. Projections are cached, so each
+        distinct field set is compiled once.
+
+        Raises:
+            ValueError: If a key is not part of this schema
+        """
+        wanted = set(keys) | set(required)
+        unknown = wanted - set(self.keys)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        cache_key = tuple(key for key in self.keys if key in wanted)
+        projection = self._projections.get(cache_key)
+        if projection is None:
+            projection = RowSerializer([field for field in self.fields if field[0] in wanted])
+            if len(self._projections) < MAX_PROJECTIONS:
+                self._projections[cache_key] = projection
+        return projection
+
+    def query(self, db) -> Query:
+        """Start a query selecting this schema's columns"""
+        return db.query(*self.columns)
+
+    def one(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Serialize a single row"""
+        return self._serialize(row)
+
+    def many(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Serialize a sequence of rows"""
+        serialize = self._serialize
+        return [serialize(row) for row in rows]
+
+
+def fieldset(
+    schema: RowSerializer,
+    default: Optional[RowSerializer] = None,
+    required: Sequence[str] = (),
+) -> Callable[..., RowSerializer]:
+    """
+    Dependency resolving a ?fields= parameter to a projected serializer
+
+    Usage:
+        @router.get("/{id}")
+        async def get_item(serializer: RowSerializer = Depends(fieldset(ITEM_DETAIL))):
+            ...
+
+    Args:
+        schema: Full set of selectable fields
+        default: Serializer used when fields is omitted (defaults to schema)
+        required: Keys always included (e.g. needed for cache tags)
+    """
+    default = default or schema
+
+    def dependency(
+        fields: Optional[str] = QueryParam(
+            None, description="Comma-separated list of response fields"
+        ),
+    ) -> RowSerializer:
+        keys = [key.strip() for key in (fields or "").split(",") if key.strip()]
+        if not keys:
+            return default
+        try:
+            return schema.project(keys, required)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return dependency
@@ -0,0 +1,16 @@
+"""
+Webhook Event Response Schemas
+"""
+from app.models.webhook import WebhookEvent
+from app.schemas.serializers import RowSerializer
+
+# GET /webhooks/events
+WEBHOOK_EVENT_LIST = RowSerializer([
+    ("id", WebhookEvent.id),
+    ("type", WebhookEvent.event_type),
+    ("locationId", WebhookEvent.location_id),
+    ("companyId", WebhookEvent.company_id),
+    ("timestamp", WebhookEvent.event_timestamp),
+    ("processed", WebhookEvent.processed),
+    ("createdAt", WebhookEvent.created_at),
+])
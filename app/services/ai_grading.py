@@ -0,0 +1,313 @@
+"""
+AI Grading
+Grades contacts from their touch data and recent messages with an LLM
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import orjson
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contact import Contact, Message
+from app.models.location import Location
+from app.services.llm import LLMClient, get_llm_client
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt or output contract changes: every contact is regraded
+PROMPT_VERSION = "1"
+
+SYSTEM_PROMPT = """You grade sales leads for a CRM.
+Given a contact's activity metrics and recent messages, reply with JSON:
+{"status": "contacted" | "engaged" | "qualified" | "unresponsive",
+ "quality_grade": "A" | "B" | "C" | "D" | "F",
+ "sales_grade": "A" | "B" | "C" | "D" | "F",
+ "summary": "<two sentences at most>"}
+quality_grade rates lead fit; sales_grade rates how well the team followed up."""
+
+VALID_STATUSES = {"contacted", "engaged", "qualified", "unresponsive"}
+VALID_GRADES = {"A", "B", "C", "D", "F"}
+
+_contacts = Contact.__table__
+_messages = Message.__table__
+
+# Graded input columns (also what the content hash covers)
+_INPUT_COLUMNS = (
+    _contacts.c.source,
+    _contacts.c.tags,
+    _contacts.c.touch_summary,
+    _contacts.c.speed_to_lead,
+    _contacts.c.last_touch_date,
+    _contacts.c.crm_tasks,
+    _contacts.c.opportunities_count,
+    _contacts.c.total_pipeline_value,
+)
+
+_grade_statement = (
+    update(_contacts)
+    .where(_contacts.c.id == bindparam("contact_pk"))
+    .values(
+        ai_status=bindparam("status"),
+        ai_quality_grade=bindparam("quality_grade"),
+        ai_sales_grade=bindparam("sales_grade"),
+        ai_summary=bindparam("summary"),
+        ai_input_hash=bindparam("input_hash"),
+        ai_graded_at=func.now(),
+    )
+)
+
+
+@dataclass
+class GradingStats:
+    """Outcome, token spend and throughput of a grading run"""
+    graded: int = 0
+    cached: int = 0  # Input unchanged since the last grade: no LLM call
+    not_contacted: int = 0  # No messages: graded without an LLM call
+    failed: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+    by_key: Dict[str, int] = field(default_factory=dict)  # Graded per API key
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["seconds"] = round(self.seconds, 2)
+        data["contacts_per_second"] = round(self.graded / self.seconds, 2) if self.seconds else 0.0
+        data["tokens_per_contact"] = (
+            round((self.prompt_tokens + self.completion_tokens) / self.graded, 1)
+            if self.graded else 0.0
+        )
+        return data
+
+
+def _api_key(location: Location) -> str:
+    return location.openai_api_key or settings.OPENAI_API_KEY
+
+
+def _claim(db: Session, location_pk: int, limit: int, skip: Set[int]) -> List[Any]:
+    """Next contacts never graded or changed since grading, most recently active first"""
+    stmt = (
+        select(_contacts.c.id, _contacts.c.ai_input_hash, *_INPUT_COLUMNS)
+        .where(
+            _contacts.c.location_id == location_pk,
+            or_(
+                _contacts.c.ai_graded_at.is_(None),
+                _contacts.c.updated_at > _contacts.c.ai_graded_at,
+            ),
+        )
+        .order_by(_contacts.c.last_touch_date.desc().nullslast(), _contacts.c.id)
+        .limit(limit)
+    )
+    if skip:
+        stmt = stmt.where(_contacts.c.id.notin_(skip))
+    return db.execute(stmt).all()
+
+
+def _recent_messages(db: Session, contact_pks: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """Last AI_GRADING_MAX_MESSAGES messages per contact, oldest first, in one query"""
+    ranked = (
+        select(
+            _messages.c.contact_id,
+            _messages.c.direction,
+            _messages.c.message_type,
+            _messages.c.body,
+            _messages.c.date_added,
+            func.row_number()
+            .over(partition_by=_messages.c.contact_id, order_by=_messages.c.date_added.desc())
+            .label("recency"),
+        )
+        .where(_messages.c.contact_id.in_(contact_pks))
+        .subquery()
+    )
+    rows = db.execute(
+        select(ranked)
+        .where(ranked.c.recency <= settings.AI_GRADING_MAX_MESSAGES)
+        .order_by(ranked.c.contact_id, ranked.c.date_added)
+    )
+
+    messages: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        messages[row.contact_id].append({
+            "direction": row.direction,
+            "type": row.message_type,
+            "at": row.date_added.isoformat() if row.date_added else None,
+            "body": row.body,
+        })
+    return messages
+
+
+def _grading_input(row: Any, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "contact": {
+            column.name: (value.isoformat() if hasattr(value, "isoformat") else value)
+            for column, value in zip(_INPUT_COLUMNS, row[2:])
+        },
+        "messages": messages,
+    }
+
+
+def input_hash(grading_input: Dict[str, Any]) -> str:
+    """Content hash deciding whether a contact needs regrading"""
+    payload = orjson.dumps(grading_input, option=orjson.OPT_SORT_KEYS)
+    prefix = PROMPT_VERSION.encode() + settings.AI_GRADING_MODEL.encode()
+    return hashlib.md5(prefix + payload).hexdigest()
+
+
+def _parse(text: str) -> Dict[str, Optional[str]]:
+    """Validate model output, falling back to defaults for unexpected values"""
+    data = json.loads(text)
+    status = data.get("status")
+    quality = data.get("quality_grade")
+    sales = data.get("sales_grade")
+    return {
+        "status": status if status in VALID_STATUSES else "contacted",
+        "quality_grade": quality if quality in VALID_GRADES else "no_grade",
+        "sales_grade": sales if sales in VALID_GRADES else "no_grade",
+        "summary": str(data.get("summary") or "")[:2000] or None,
+    }
+
+
+async def _grade_one(
+    client: LLMClient,
+    grading_input: Dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    stats: GradingStats,
+) -> Optional[Dict[str, Optional[str]]]:
+    async with semaphore:
+        try:
+            completion = await client.complete_json(SYSTEM_PROMPT, json.dumps(grading_input))
+            result = _parse(completion.text)
+        except Exception as e:
+            logger.warning(f"Grading failed: {e}")
+            stats.failed += 1
+            return None
+
+    stats.prompt_tokens += completion.prompt_tokens
+    stats.completion_tokens += completion.completion_tokens
+    return result
+
+
+def _write(db: Session, graded: List[Dict[str, Any]], cached: List[int]) -> None:
+    if graded:
+        db.execute(_grade_statement, graded)
+    if cached:
+        db.execute(
+            update(_contacts)
+            .where(_contacts.c.id.in_(cached))
+            .values(ai_graded_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+
+async def grade_location(
+    db: Session,
+    location: Location,
+    semaphores: Optional[Dict[str, asyncio.Semaphore]] = None,
+    stats: Optional[GradingStats] = None,
+) -> GradingStats:
+    """
+    Grade a location's contacts that are new or changed since last graded
+
+    Batches of AI_GRADING_BATCH_SIZE contacts are loaded with their
+    recent messages (one windowed query), hashed, and only contacts
+    whose input hash differs from the stored one are sent to the model.
+    Requests share one semaphore per API key, so locations on the same
+    key don't exceed AI_GRADING_CONCURRENCY together. Results are
+    written back with one executemany UPDATE per batch.
+
+    Args:
+        db: Database session
+        location: Location to grade
+        semaphores: Per-API-key semaphores shared across locations
+        stats: Stats to accumulate into (e.g. across locations)
+
+    Returns:
+        Accumulated GradingStats
+    """
+    stats = stats or GradingStats()
+    semaphores = semaphores if semaphores is not None else {}
+    api_key = _api_key(location)
+    if not api_key and settings.AI_GRADING_BACKEND != "stub":
+        logger.info(f"No OpenAI key for location {location.location_id}; skipping grading")
+        return stats
+
+    client = get_llm_client(api_key)
+    semaphore = semaphores.setdefault(api_key, asyncio.Semaphore(settings.AI_GRADING_CONCURRENCY))
+    key_label = f"...{api_key[-4:]}" if api_key else "stub"
+    failed: Set[int] = set()
+    started = time.monotonic()
+
+    for _ in range(settings.AI_GRADING_MAX_BATCHES):
+        rows = await asyncio.to_thread(
+            _claim, db, location.id, settings.AI_GRADING_BATCH_SIZE, failed
+        )
+        if not rows:
+            break
+        messages = await asyncio.to_thread(_recent_messages, db, [row.id for row in rows])
+
+        pending, graded, cached = [], [], []
+        for row in rows:
+            grading_input = _grading_input(row, messages.get(row.id, []))
+            digest = input_hash(grading_input)
+            if digest == row.ai_input_hash:
+                cached.append(row.id)
+            elif not grading_input["messages"]:
+                graded.append({
+                    "contact_pk": row.id, "input_hash": digest, "status": "not_contacted",
+                    "quality_grade": "no_grade", "sales_grade": "no_grade", "summary": None,
+                })
+                stats.not_contacted += 1
+            else:
+                pending.append((row.id, digest, grading_input))
+
+        results = await asyncio.gather(*(
+            _grade_one(client, grading_input, semaphore, stats)
+            for _, _, grading_input in pending
+        ))
+        for (contact_pk, digest, _), result in zip(pending, results):
+            if result is None:
+                failed.add(contact_pk)
+                continue
+            graded.append({"contact_pk": contact_pk, "input_hash": digest, **result})
+            stats.graded += 1
+            stats.by_key[key_label] = stats.by_key.get(key_label, 0) + 1
+
+        stats.cached += len(cached)
+        await asyncio.to_thread(_write, db, graded, cached)
+
+    stats.seconds += time.monotonic() - started
+    return stats
+
+
+def locations_needing_grading(db: Session) -> List[str]:
+    """
+    GHL location ids with contacts new or changed since last graded
+
+    Locations without an OpenAI key (their own or OPENAI_API_KEY) are
+    left out, since grade_location would skip them on every run.
+    """
+    stmt = select(Location.location_id).where(
+        Location.is_installed.is_(True),
+        select(_contacts.c.id)
+        .where(
+            _contacts.c.location_id == Location.id,
+            or_(
+                _contacts.c.ai_graded_at.is_(None),
+                _contacts.c.updated_at > _contacts.c.ai_graded_at,
+            ),
+        )
+        .exists(),
+    )
+    if not settings.OPENAI_API_KEY and settings.AI_GRADING_BACKEND != "stub":
+        stmt = stmt.where(Location.openai_api_key.is_not(None), Location.openai_api_key != "")
+
+    return [location_id for (location_id,) in db.execute(stmt)]
@@ -0,0 +1,84 @@
+"""
+Install Bootstrap Progress
+Redis-backed progress of the post-OAuth location bootstrap
+"""
+import time
+from typing import Any, Dict, Optional
+
+from app.core.redis import get_async_redis, get_redis
+
+REDIS_PROGRESS_PREFIX = "bootstrap:"
+PROGRESS_TTL_SECONDS = 7 * 24 * 3600
+
+# Progress states, in order
+QUEUED = "queued"
+SYNCING_LOCATIONS = "syncing_locations"
+SYNCING_CONTACTS = "syncing_contacts"
+COMPLETED = "completed"
+FAILED = "failed"
+
+_COUNTERS = ("locationsTotal", "locationsDone", "locationsFailed")
+
+
+def _key(company_id: str) -> str:
+    return REDIS_PROGRESS_PREFIX + company_id
+
+
+def _decode(raw: Dict[str, str]) -> Dict[str, Any]:
+    progress: Dict[str, Any] = dict(raw)
+    for name in _COUNTERS:
+        progress[name] = int(raw.get(name) or 0)
+    for name in ("startedAt", "updatedAt"):
+        if raw.get(name):
+            progress[name] = float(raw[name])
+    return progress
+
+
+async def mark_queued(company_id: str) -> None:
+    """Reset progress when a bootstrap is enqueued (request handlers)"""
+    now = time.time()
+    key = _key(company_id)
+    async with get_async_redis().pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        pipe.hset(key, mapping={
+            "status": QUEUED, "startedAt": now, "updatedAt": now,
+            **dict.fromkeys(_COUNTERS, 0),
+        })
+        pipe.expire(key, PROGRESS_TTL_SECONDS)
+        await pipe.execute()
+
+
+def update_progress(company_id: str, **fields: Any) -> None:
+    """Set progress fields (workers)"""
+    key = _key(company_id)
+    pipe = get_redis().pipeline(transaction=True)
+    pipe.hset(key, mapping={**fields, "updatedAt": time.time()})
+    pipe.expire(key, PROGRESS_TTL_SECONDS)
+    pipe.execute()
+
+
+def record_location_done(company_id: str, failed: bool = False) -> Dict[str, Any]:
+    """
+    Count one finished per-location sync; the last one completes the bootstrap
+
+    Returns:
+        Progress after the update
+    """
+    key = _key(company_id)
+    pipe = get_redis().pipeline(transaction=True)
+    pipe.hincrby(key, "locationsFailed" if failed else "locationsDone", 1)
+    pipe.hset(key, "updatedAt", time.time())
+    pipe.hgetall(key)
+    progress = _decode(pipe.execute()[-1])
+
+    finished = progress["locationsDone"] + progress["locationsFailed"]
+    if progress.get("status") == SYNCING_CONTACTS and finished >= progress["locationsTotal"]:
+        update_progress(company_id, status=COMPLETED)
+        progress["status"] = COMPLETED
+    return progress
+
+
+async def get_progress(company_id: str) -> Optional[Dict[str, Any]]:
+    """Current progress, or None if no bootstrap ran in the last week"""
+    raw = await get_async_redis().hgetall(_key(company_id))
+    return _decode(raw) if raw else None
@@ -0,0 +1,99 @@
+"""
+Bulk Database Writes
+Multi-row INSERT ... ON CONFLICT upserts for sync pipelines
+"""
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,  # Benchmarks / local tooling
+}
+
+
+def upsert_statement(db: Session, table: Table):
+    """Dialect-specific INSERT construct supporting on_conflict_do_update()"""
+    dialect = db.get_bind().dialect.name
+    try:
+        return _INSERTS[dialect](table)
+    except KeyError:
+        raise NotImplementedError(f"Bulk upsert is not supported on {dialect}")
+
+
+def bulk_upsert(
+    db: Session,
+    table: Table,
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Sequence[str]] = None,
+    keep_existing_on_null: bool = False,
+    skip_unchanged: Optional[str] = None,
+    set_on_update: Optional[Dict[str, Any]] = None,
+    chunk_size: Optional[int] = None,
+) -> int:
+    """
+    Insert rows, updating existing ones that collide on conflict_columns
+
+    One multi-row statement per chunk instead of a SELECT + INSERT/UPDATE
+    per row. All rows must have the same keys. Does not commit.
+
+    Args:
+        db: Database session
+        table: Target table (e.g. Opportunity.__table__)
+        rows: Column-name keyed values
+        conflict_columns: Columns of the unique index to upsert on
+        update_columns: Columns overwritten on conflict (default: all
+            supplied columns except the conflict columns); empty to
+            leave existing rows untouched (ON CONFLICT DO NOTHING)
+        keep_existing_on_null: Don't overwrite stored values with NULLs
+            (SET col = COALESCE(excluded.col, col))
+        skip_unchanged: Content hash column; existing rows whose stored
+            hash equals the incoming one are not updated at all
+            (ON CONFLICT ... WHERE col IS DISTINCT FROM excluded.col)
+        set_on_update: Extra values assigned only when an existing row
+            is updated (e.g. to re-queue it for follow-up work)
+        chunk_size: Rows per statement (default BULK_UPSERT_CHUNK_SIZE)
+
+    Returns:
+        Number of rows inserted or updated
+    """
+    if not rows:
+        return 0
+
+    chunk_size = chunk_size or settings.BULK_UPSERT_CHUNK_SIZE
+    if update_columns is None:
+        update_columns = [key for key in rows[0] if key not in conflict_columns]
+
+    index_elements = list(conflict_columns)
+    written = 0
+    for start in range(0, len(rows), chunk_size):
+        stmt = upsert_statement(db, table).values(list(rows[start:start + chunk_size]))
+        if not update_columns:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            written += db.execute(stmt).rowcount
+            continue
+
+        if keep_existing_on_null:
+            updates = {
+                name: func.coalesce(stmt.excluded[name], table.c[name]) for name in update_columns
+            }
+        else:
+            updates = {name: stmt.excluded[name] for name in update_columns}
+        if set_on_update:
+            updates.update(set_on_update)
+        if "updated_at" in table.c and "updated_at" not in updates:
+            updates["updated_at"] = func.now()
+        where = None
+        if skip_unchanged:
+            where = table.c[skip_unchanged].is_distinct_from(stmt.excluded[skip_unchanged])
+        written += db.execute(
+            stmt.on_conflict_do_update(index_elements=index_elements, set_=updates, where=where)
+        ).rowcount
+
+    return written
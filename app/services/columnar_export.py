@@ -0,0 +1,221 @@
+"""
+Columnar Export
+Parquet / Arrow snapshots of contacts and opportunities for analytics
+"""
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, DateTime, Float, Integer, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.models.contact import Contact, Opportunity
+from app.models.location import Location
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TABLES = ("contacts", "opportunities")
+
+# End-of-stream marker of the Arrow IPC streaming format
+_IPC_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+
+def _arrow_type(column) -> pa.DataType:
+    """Arrow type for a SQLAlchemy column"""
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC")
+    return pa.string()
+
+
+def _select(table: str, location_id: Optional[str]) -> Select:
+    """
+    Snapshot query for a table
+
+    Every table column is exported plus the GHL location id, so files from
+    different locations can be concatenated without a lookup table.
+    """
+    if table == "contacts":
+        stmt = (
+            select(*Contact.__table__.columns, Location.location_id.label("ghl_location_id"))
+            .join(Location, Location.id == Contact.location_id)
+            .order_by(Contact.id)
+        )
+    elif table == "opportunities":
+        stmt = (
+            select(
+                *Opportunity.__table__.columns,
+                Contact.external_id.label("contact_external_id"),
+                Location.location_id.label("ghl_location_id"),
+            )
+            .join(Contact, Contact.id == Opportunity.contact_id)
+            .join(Location, Location.id == Contact.location_id)
+            .order_by(Opportunity.id)
+        )
+    else:
+        raise ValueError(f"Unknown export table: {table}")
+
+    if location_id:
+        stmt = stmt.where(Location.location_id == location_id)
+    return stmt
+
+
+def _schema(stmt: Select) -> pa.Schema:
+    return pa.schema([
+        pa.field(column.name, _arrow_type(column))
+        for column in stmt.selected_columns
+    ])
+
+
+def iter_record_batches(
+    db: Session,
+    table: str,
+    location_id: Optional[str] = None,
+    batch_rows: Optional[int] = None,
+) -> Tuple[pa.Schema, Iterator[pa.RecordBatch]]:
+    """
+    Stream a table as Arrow record batches
+
+    Rows are read through a server-side cursor (yield_per), one partition
+    per batch, so memory is bounded by batch_rows regardless of table size.
+
+    Args:
+        db: Database session
+        table: "contacts" or "opportunities"
+        location_id: GHL location id (None exports all locations)
+        batch_rows: Rows per batch (defaults to ANALYTICS_BATCH_ROWS)
+
+    Returns:
+        Schema and a lazy iterator of record batches
+
+    Raises:
+        ValueError: If table is not exportable
+    """
+    batch_rows = batch_rows or settings.ANALYTICS_BATCH_ROWS
+    stmt = _select(table, location_id)
+    schema = _schema(stmt)
+
+    def batches() -> Iterator[pa.RecordBatch]:
+        result = db.execute(stmt, execution_options={"yield_per": batch_rows})
+        for rows in result.partitions():
+            columns = list(zip(*rows))
+            yield pa.record_batch(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            )
+
+    return schema, batches()
+
+
+def write_parquet(
+    db: Session,
+    table: str,
+    where: Any,
+    location_id: Optional[str] = None,
+    filesystem: Optional[pafs.FileSystem] = None,
+) -> int:
+    """
+    Write a table snapshot as Parquet, one row group per batch
+
+    Args:
+        db: Database session
+        table: "contacts" or "opportunities"
+        where: File path (on filesystem) or writable file object
+        location_id: GHL location id (None exports all locations)
+        filesystem: pyarrow filesystem for where (local if omitted)
+
+    Returns:
+        Number of rows written
+    """
+    schema, batches = iter_record_batches(db, table, location_id)
+    rows = 0
+
+    with pq.ParquetWriter(
+        where,
+        schema,
+        filesystem=filesystem,
+        compression=settings.ANALYTICS_PARQUET_COMPRESSION,
+    ) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            rows += batch.num_rows
+
+    return rows
+
+
+def iter_arrow_stream(
+    db: Session,
+    table: str,
+    location_id: Optional[str] = None,
+) -> Iterator[bytes]:
+    """
+    Encode a table snapshot in the Arrow IPC streaming format
+
+    Unlike Parquet, the stream format has no footer, so each batch can be
+    sent as soon as it is read. pyarrow.ipc.open_stream() reads the result.
+    """
+    schema, batches = iter_record_batches(db, table, location_id)
+    yield schema.serialize().to_pybytes()
+    for batch in batches:
+        yield batch.serialize().to_pybytes()
+    yield _IPC_EOS
+
+
+def snapshot_path(base: str, table: str, location_id: Optional[str]) -> str:
+    """<base>/<table>/<location or "all">/<UTC timestamp>.parquet"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{base.rstrip('/')}/{table}/{location_id or 'all'}/{stamp}.parquet"
+
+
+def export_snapshot(
+    db: Session,
+    table: str,
+    uri: str,
+    location_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Write a Parquet snapshot under a local or S3-compatible location
+
+    Args:
+        db: Database session
+        table: "contacts" or "opportunities"
+        uri: Local directory or s3://bucket/prefix. S3-compatible stores
+            take pyarrow URI options, e.g. ?endpoint_override=host:9000;
+            credentials come from the standard AWS environment variables.
+        location_id: GHL location id (None exports all locations)
+
+    Returns:
+        Snapshot summary (table, uri, path, rows)
+    """
+    filesystem, base = pafs.FileSystem.from_uri(uri)
+    path = snapshot_path(base, table, location_id)
+    filesystem.create_dir(os.path.dirname(path), recursive=True)
+
+    try:
+        rows = write_parquet(db, table, path, location_id, filesystem=filesystem)
+    except Exception:
+        # Don't leave a truncated file for readers to pick up
+        try:
+            filesystem.delete_file(path)
+        except OSError:
+            pass
+        raise
+
+    logger.info(f"Exported {rows} {table} rows to {path}")
+    return {"table": table, "uri": uri, "path": path, "rows": rows}
+
+
+def export_all(db: Session, uri: str) -> List[Dict[str, Any]]:
+    """Snapshot every exportable table across all locations"""
+    return [export_snapshot(db, table, uri) for table in EXPORT_TABLES]
@@ -0,0 +1,238 @@
+"""
+Contact Detail Hydration
+Fills in fields only available from GET /contacts/{id}, in batches
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+from sqlalchemy import bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.rate_budget import ghl_rate_budget
+from app.models.contact import Contact
+from app.models.location import Location
+from app.services.ghl_client import GHLClient, parse_datetime
+
+logger = logging.getLogger(__name__)
+
+# Contact.details_fetched states
+PENDING = "false"
+FETCHED = "true"
+MISSING = "missing"  # Deleted in GHL; never retried
+
+_contacts = Contact.__table__
+
+# Columns written from contact details; NULLs keep the stored value
+DETAIL_COLUMNS = (
+    "address",
+    "timezone",
+    "country",
+    "source",
+    "date_added",
+    "business_id",
+    "assigned_to",
+    "tags",
+    "attribution",
+    "followers",
+)
+
+# One executemany UPDATE per batch
+_hydrate_statement = (
+    update(_contacts)
+    .where(_contacts.c.id == bindparam("contact_pk"))
+    .values(
+        details_fetched=bindparam("state"),
+        hydration_claimed_at=None,
+        **{
+            column: func.coalesce(
+                bindparam(column, type_=_contacts.c[column].type), _contacts.c[column]
+            )
+            for column in DETAIL_COLUMNS
+        },
+    )
+)
+
+
+def _dump(value: Any) -> Optional[str]:
+    return json.dumps(value) if value is not None else None
+
+
+def detail_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Contact columns from a GET /contacts/{id} response body"""
+    contact = data.get("contact", data)
+    return {
+        "address": contact.get("address1"),
+        "timezone": contact.get("timezone"),
+        "country": contact.get("country"),
+        "source": contact.get("source"),
+        "date_added": parse_datetime(contact.get("dateAdded")),
+        "business_id": contact.get("businessId"),
+        "assigned_to": contact.get("assignedTo"),
+        "tags": str(contact["tags"]) if contact.get("tags") is not None else None,
+        "attribution": _dump(contact.get("attributionSource")),
+        "followers": _dump(contact.get("followers")),
+    }
+
+
+def _claim(db: Session, location_pk: int, limit: int, skip: Set[int]) -> List[Tuple[int, str]]:
+    """
+    Claim the next batch of unhydrated contacts, most recently active first
+
+    Served by the idx_contact_unhydrated partial index. Claiming stamps
+    hydration_claimed_at and commits right away, so no row locks are held
+    while GHL is called (SKIP LOCKED only keeps concurrent claims from
+    overlapping). Claims older than HYDRATION_CLAIM_SECONDS belonged to a
+    crashed worker and are taken over. `skip` holds contacts deferred
+    earlier in this run.
+    """
+    now = datetime.now(timezone.utc)
+    candidates = (
+        select(_contacts.c.id)
+        .where(
+            _contacts.c.location_id == location_pk,
+            _contacts.c.details_fetched == PENDING,
+            or_(
+                _contacts.c.hydration_claimed_at.is_(None),
+                _contacts.c.hydration_claimed_at
+                < now - timedelta(seconds=settings.HYDRATION_CLAIM_SECONDS),
+            ),
+        )
+        .order_by(
+            _contacts.c.last_touch_date.desc().nullslast(),
+            _contacts.c.date_added.desc().nullslast(),
+            _contacts.c.id,
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if skip:
+        candidates = candidates.where(_contacts.c.id.notin_(skip))
+
+    claimed = db.execute(
+        update(_contacts)
+        .where(_contacts.c.id.in_(candidates.scalar_subquery()))
+        .values(hydration_claimed_at=now, updated_at=_contacts.c.updated_at)
+        .returning(_contacts.c.id, _contacts.c.external_id)
+    ).all()
+    db.commit()
+    return claimed
+
+
+def _write(db: Session, params: List[Dict[str, Any]], released: List[int]) -> None:
+    """Write fetched details back and release the claims of deferred contacts"""
+    if params:
+        db.execute(_hydrate_statement, params)
+    if released:
+        db.execute(
+            update(_contacts)
+            .where(_contacts.c.id.in_(released))
+            .values(hydration_claimed_at=None, updated_at=_contacts.c.updated_at)
+        )
+    db.commit()
+
+
+async def _fetch(
+    client: GHLClient,
+    location_id: str,
+    external_id: str,
+    semaphore: asyncio.Semaphore,
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """(state, detail values); transient failures stay pending for the next run"""
+    async with semaphore:
+        await ghl_rate_budget.acquire(location_id)
+        try:
+            data = await client.get_contact(external_id)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Hydration of contact {external_id} deferred: {e}")
+            return PENDING, None
+
+    if data is None:
+        return MISSING, None
+    return FETCHED, detail_values(data)
+
+
+async def hydrate_location(
+    db: Session,
+    location: Location,
+    client: GHLClient,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Hydrate pending contacts of a location, batch by batch
+
+    Each batch is claimed, fetched concurrently (HYDRATION_CONCURRENCY,
+    paced by the per-location GHL rate budget) and written back with a
+    single executemany UPDATE. Progress is the details_fetched flag
+    itself, so an interrupted run resumes where it stopped.
+
+    Args:
+        db: Database session
+        location: Location to hydrate
+        client: Client authenticated for the location
+        max_batches: Stop after this many batches (default HYDRATION_MAX_BATCHES)
+
+    Returns:
+        Counts: hydrated, missing, deferred, batches
+    """
+    max_batches = max_batches or settings.HYDRATION_MAX_BATCHES
+    semaphore = asyncio.Semaphore(settings.HYDRATION_CONCURRENCY)
+    counts = {"hydrated": 0, "missing": 0, "deferred": 0, "batches": 0}
+    deferred: Set[int] = set()
+
+    for _ in range(max_batches):
+        claimed = await asyncio.to_thread(
+            _claim, db, location.id, settings.HYDRATION_BATCH_SIZE, deferred
+        )
+        if not claimed:
+            break
+
+        results = await asyncio.gather(*(
+            _fetch(client, location.location_id, external_id, semaphore)
+            for _, external_id in claimed
+        ))
+
+        params = []
+        released = []
+        for (contact_pk, _), (state, values) in zip(claimed, results):
+            if state == PENDING:
+                deferred.add(contact_pk)
+                released.append(contact_pk)
+                continue
+            counts["hydrated" if state == FETCHED else "missing"] += 1
+            params.append({
+                "contact_pk": contact_pk,
+                "state": state,
+                **(values or dict.fromkeys(DETAIL_COLUMNS)),
+            })
+
+        await asyncio.to_thread(_write, db, params, released)
+        counts["batches"] += 1
+
+        if not params:
+            break  # Everything deferred: GHL is failing, try again next run
+
+    counts["deferred"] = len(deferred)
+    logger.info(f"Hydrated contacts for location {location.location_id}: {counts}")
+    return counts
+
+
+def locations_with_pending(db: Session) -> List[str]:
+    """GHL location ids that still have unhydrated contacts"""
+    return [
+        location_id for (location_id,) in db.execute(
+            select(Location.location_id).where(
+                Location.is_installed.is_(True),
+                select(_contacts.c.id)
+                .where(
+                    _contacts.c.location_id == Location.id,
+                    _contacts.c.details_fetched == PENDING,
+                )
+                .exists(),
+            )
+        )
+    ]
@@ -0,0 +1,268 @@
+"""
+Contact Sync
+Pulls a location's contacts from GHL via /contacts/search
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import orjson
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contact import Contact
+from app.models.location import Location
+from app.services.bulk import bulk_upsert
+from app.services.contact_hydration import PENDING
+from app.services.ghl_client import GHLClient, parse_datetime
+from app.services.paging import iter_pages
+
+logger = logging.getLogger(__name__)
+
+_contacts = Contact.__table__
+_locations = Location.__table__
+
+
+def resolve_contact_ids(
+    db: Session,
+    location_pk: int,
+    external_ids: Iterable[Optional[str]],
+) -> Dict[str, int]:
+    """Map GHL contact ids to Contact.id for a location, in one query"""
+    external_ids = set(external_ids) - {None}
+    if not external_ids:
+        return {}
+
+    return dict(
+        db.execute(
+            select(_contacts.c.external_id, _contacts.c.id).where(
+                _contacts.c.location_id == location_pk,
+                _contacts.c.external_id.in_(external_ids),
+            )
+        ).all()
+    )
+
+
+def contact_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Contact columns populated from a /contacts/search result"""
+    return {
+        "contact_name": (data.get("contactName") or "").title(),
+        "first_name": (data.get("firstName") or "").title(),
+        "last_name": (data.get("lastName") or "").title(),
+        "email": data.get("email"),
+        "phone": data.get("phone"),
+        "timezone": data.get("timezone"),
+        "country": data.get("country"),
+        "source": data.get("source"),
+        "tags": str(data.get("tags", [])),
+        "date_added": parse_datetime(data.get("dateAdded")),
+    }
+
+
+def sync_hash(values: Dict[str, Any]) -> str:
+    """Digest of synced contact values; unchanged digests skip the UPDATE"""
+    return hashlib.md5(orjson.dumps(values, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _contact_row(
+    data: Dict[str, Any], location_pk: int, generation: Optional[int]
+) -> Dict[str, Any]:
+    values = contact_values(data)
+    return {
+        "external_id": data["id"],
+        "location_id": location_pk,
+        "sync_hash": sync_hash(values),
+        "sync_generation": generation,
+        **values,
+    }
+
+
+def write_contacts(
+    db: Session,
+    location_pk: int,
+    contacts: List[Dict[str, Any]],
+    generation: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Bulk upsert one page of contacts on (external_id, location_id)
+
+    Missing (null) values don't overwrite stored ones. Contacts whose
+    sync_hash is unchanged are skipped by the upsert itself, so they
+    keep their updated_at and cost no row rewrite. Changed contacts are
+    queued for detail hydration again, so their detail columns refresh.
+
+    Args:
+        db: Database session
+        location_pk: Location.id
+        contacts: /contacts/search results
+        generation: Full sync generation to stamp on every contact seen
+
+    Returns:
+        Counts: synced (new), updated, unchanged
+    """
+    rows = [_contact_row(data, location_pk, generation) for data in contacts if data.get("id")]
+    existing = resolve_contact_ids(db, location_pk, (row["external_id"] for row in rows))
+
+    written = bulk_upsert(
+        db,
+        _contacts,
+        rows,
+        conflict_columns=["external_id", "location_id"],
+        keep_existing_on_null=True,
+        skip_unchanged="sync_hash",
+        set_on_update={"details_fetched": PENDING},
+    )
+    if generation is not None and existing:
+        # Unchanged contacts were skipped above: stamp the generation alone,
+        # leaving updated_at as is (no indexed column changes, so HOT-eligible)
+        db.execute(
+            update(_contacts)
+            .where(
+                _contacts.c.id.in_(existing.values()),
+                _contacts.c.sync_generation.is_distinct_from(generation),
+            )
+            .values(sync_generation=generation, updated_at=_contacts.c.updated_at)
+        )
+    db.commit()
+
+    synced = len(rows) - len(existing)
+    updated = written - synced
+    return {"synced": synced, "updated": updated, "unchanged": len(existing) - updated}
+
+
+async def sync_contact_page(
+    db: Session,
+    location: Location,
+    client: GHLClient,
+    page: int = 1,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """
+    Sync a single page of contacts
+
+    Returns:
+        Counts (synced, updated, unchanged) and totalContacts
+    """
+    data = await client.search_contacts(location_id=location.location_id, page=page, limit=limit)
+    result = await asyncio.to_thread(write_contacts, db, location.id, data.get("contacts", []))
+
+    location.contacts_count = data.get("total", 0)
+    db.commit()
+
+    return {**result, "totalContacts": location.contacts_count}
+
+
+def _next_generation(db: Session, location: Location) -> int:
+    location.contact_sync_generation = func.coalesce(Location.contact_sync_generation, 0) + 1
+    db.commit()
+    return location.contact_sync_generation
+
+
+def sweep_stale_contacts(
+    db: Session, location_pk: int, generation: int, started_at: datetime
+) -> int:
+    """
+    Delete contacts a complete full sync didn't see, in one statement
+
+    Stale means stamped by an older generation (or never by a full sync)
+    and created before the sync started, so contacts added meanwhile by
+    webhooks or page syncs survive. Opportunities, tasks, conversations
+    and messages go with them via ON DELETE CASCADE. Location.contacts_count
+    is recounted in the same transaction.
+
+    Returns:
+        Number of contacts deleted
+    """
+    deleted = db.execute(
+        delete(_contacts).where(
+            _contacts.c.location_id == location_pk,
+            or_(_contacts.c.sync_generation.is_(None), _contacts.c.sync_generation < generation),
+            _contacts.c.created_at < started_at,
+        )
+    ).rowcount
+
+    db.execute(
+        update(_locations)
+        .where(_locations.c.id == location_pk)
+        .values(
+            contacts_count=select(func.count())
+            .where(_contacts.c.location_id == location_pk)
+            .scalar_subquery()
+        )
+    )
+    db.commit()
+    return deleted
+
+
+async def sync_contacts(db: Session, location: Location, client: GHLClient) -> Dict[str, int]:
+    """
+    Full contact sync for a location (mark and sweep)
+
+    Pages are fetched concurrently and bulk-upserted as they arrive,
+    stamping each contact with this run's sync generation. Pages are
+    ordered by dateAdded ascending, so edits during the pass don't move
+    contacts between pages (new contacts land at the end).
+
+    Contacts from older generations are swept only after a provably
+    complete pass: as many distinct contacts seen as GHL reports, and no
+    page came back short. Duplicates from shifted pages can't stand in
+    for a contact that was skipped.
+
+    A page GHL fails to serve raises, leaving Location.contacts_count
+    and the stored contacts as they were.
+
+    Returns:
+        Counts: fetched, synced, updated, unchanged, deleted, totalContacts
+    """
+    page_size = settings.GHL_PAGE_SIZE
+    total = 0
+    seen: Set[str] = set()
+    short_pages = 0
+    started_at = datetime.now(timezone.utc)
+    generation = await asyncio.to_thread(_next_generation, db, location)
+
+    async def fetch_page(page: int):
+        nonlocal total, short_pages
+        data = await client.search_contacts(
+            location_id=location.location_id,
+            page=page,
+            limit=page_size,
+            sort_by="dateAdded",
+            direction="asc",
+        )
+        contacts, page_total = data.get("contacts", []), data.get("total", 0)
+        total = max(total, page_total)
+        if len(contacts) < min(page_size, page_total - (page - 1) * page_size):
+            short_pages += 1
+        return contacts, page_total
+
+    counts = {"fetched": 0, "synced": 0, "updated": 0, "unchanged": 0}
+    async for page in iter_pages(fetch_page, page_size, settings.GHL_SYNC_CONCURRENCY):
+        if not page:
+            continue
+        counts["fetched"] += len(page)
+        seen.update(contact["id"] for contact in page if contact.get("id"))
+        result = await asyncio.to_thread(write_contacts, db, location.id, page, generation)
+        for key, value in result.items():
+            counts[key] += value
+
+    if seen and len(seen) == total and not short_pages:
+        counts["deleted"] = await asyncio.to_thread(
+            sweep_stale_contacts, db, location.id, generation, started_at
+        )
+    else:
+        # Incomplete pass: unseen contacts may just be on shifted or missing pages
+        logger.warning(
+            f"Skipping stale contact sweep for location {location.location_id}: "
+            f"saw {len(seen)} distinct of {total} ({counts['fetched']} fetched, "
+            f"{short_pages} short pages)"
+        )
+        counts["deleted"] = 0
+        location.contacts_count = total
+        db.commit()
+
+    logger.info(f"Synced contacts for location {location.location_id}: {counts}")
+    return {**counts, "totalContacts": location.contacts_count}
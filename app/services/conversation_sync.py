@@ -0,0 +1,382 @@
+"""
+Conversation Sync
+Ingests GHL conversations/messages and derives contact touch metrics
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, and_, case, cast, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.rate_budget import ghl_rate_budget
+from app.models.contact import Contact, Conversation, Message
+from app.models.location import Location
+from app.services.bulk import bulk_upsert
+from app.services.contact_sync import resolve_contact_ids
+from app.services.ghl_client import GHLClient, parse_datetime
+
+logger = logging.getLogger(__name__)
+
+NO_RESPONSE = "no_response"
+
+_contacts = Contact.__table__
+_conversations = Conversation.__table__
+_messages = Message.__table__
+
+
+# Rows
+
+def _conversation_row(data: Dict[str, Any], contact_pk: int) -> Dict[str, Any]:
+    return {
+        "external_id": data["id"],
+        "contact_id": contact_pk,
+        "channel": data.get("type") or data.get("lastMessageType"),
+        "last_message_date": parse_datetime(data.get("lastMessageDate")),
+        "unread_count": data.get("unreadCount") or 0,
+    }
+
+
+def _message_row(data: Dict[str, Any], conversation_pk: int, contact_pk: int) -> Dict[str, Any]:
+    return {
+        "external_id": data["id"],
+        "conversation_id": conversation_pk,
+        "contact_id": contact_pk,
+        "direction": data.get("direction"),
+        "message_type": data.get("messageType"),
+        "body": data.get("body"),
+        "date_added": parse_datetime(data.get("dateAdded")),
+    }
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Treat naive datetimes (e.g. from SQLite) as UTC so they compare with GHL's"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _conversation_state(db: Session, external_ids: Iterable[str]) -> Dict[str, Tuple[int, Any]]:
+    """external_id -> (Conversation.id, last_message_date)"""
+    return {
+        external_id: (conversation_pk, _utc(last_message_date))
+        for external_id, conversation_pk, last_message_date in db.execute(
+            select(
+                _conversations.c.external_id,
+                _conversations.c.id,
+                _conversations.c.last_message_date,
+            )
+            .where(_conversations.c.external_id.in_(set(external_ids)))
+        )
+    }
+
+
+# Metrics
+
+def _seconds_between(db: Session, later, earlier):
+    """Portable (later - earlier) in seconds"""
+    if db.get_bind().dialect.name == "sqlite":
+        return (func.julianday(later) - func.julianday(earlier)) * 86400
+    return func.extract("epoch", later - earlier)
+
+
+def _format_duration(seconds):
+    """SQL expression rendering seconds as e.g. "45s", "12m", "3h", "2d" """
+    seconds = cast(func.round(seconds), Integer)
+
+    def unit(divisor: int, suffix: str):
+        return cast(seconds // divisor, String) + literal(suffix)
+
+    return case(
+        (seconds < 60, unit(1, "s")),
+        (seconds < 3600, unit(60, "m")),
+        (seconds < 86400, unit(3600, "h")),
+        else_=unit(86400, "d"),
+    )
+
+
+def refresh_touch_metrics(
+    db: Session,
+    location_pk: Optional[int] = None,
+    contact_pks: Optional[List[int]] = None,
+) -> int:
+    """
+    Recompute contact touch metrics from messages in one UPDATE ... FROM
+
+    Per contact:
+    - last_touch_date: latest message in either direction
+    - last_message: body of that message (row_number() window)
+    - touch_summary: "outbound:N,inbound:N"
+    - speed_to_lead: time from lead creation (contact date_added, else
+      first inbound message via a min() window) to the first outbound
+      message after it; "no_response" if there is none yet
+
+    Only contacts whose values change are written. Does not commit.
+
+    Args:
+        db: Database session
+        location_pk: Limit to one location (Location.id)
+        contact_pks: Limit to these contacts (Contact.id)
+
+    Returns:
+        Number of contacts updated
+    """
+    is_inbound = _messages.c.direction == "inbound"
+
+    ranked = (
+        select(
+            _messages.c.contact_id,
+            _messages.c.direction,
+            _messages.c.date_added,
+            _messages.c.body,
+            _contacts.c.date_added.label("contact_added"),
+            func.min(case((is_inbound, _messages.c.date_added)))
+            .over(partition_by=_messages.c.contact_id)
+            .label("first_inbound"),
+            func.row_number()
+            .over(
+                partition_by=_messages.c.contact_id,
+                order_by=(_messages.c.date_added.desc(), _messages.c.id.desc()),
+            )
+            .label("recency"),
+        )
+        .select_from(_messages.join(_contacts, _contacts.c.id == _messages.c.contact_id))
+    )
+    if location_pk is not None:
+        ranked = ranked.where(_contacts.c.location_id == location_pk)
+    if contact_pks is not None:
+        ranked = ranked.where(_messages.c.contact_id.in_(contact_pks))
+    ranked = ranked.subquery()
+
+    lead_at = func.coalesce(ranked.c.contact_added, ranked.c.first_inbound)
+    outbound = ranked.c.direction == "outbound"
+
+    metrics = (
+        select(
+            ranked.c.contact_id,
+            func.sum(case((outbound, 1), else_=0)).label("outbound"),
+            func.sum(case((ranked.c.direction == "inbound", 1), else_=0)).label("inbound"),
+            func.max(ranked.c.date_added).label("last_touch"),
+            func.max(case((ranked.c.recency == 1, ranked.c.body))).label("last_message"),
+            func.min(lead_at).label("lead_at"),
+            func.min(case((and_(outbound, ranked.c.date_added >= lead_at), ranked.c.date_added)))
+            .label("first_response"),
+        )
+        .group_by(ranked.c.contact_id)
+        .subquery()
+    )
+
+    touch_summary = (
+        literal("outbound:") + cast(metrics.c.outbound, String)
+        + literal(",inbound:") + cast(metrics.c.inbound, String)
+    )
+    speed_to_lead = case(
+        (metrics.c.lead_at.is_(None), None),
+        (metrics.c.first_response.is_(None), NO_RESPONSE),
+        else_=_format_duration(_seconds_between(db, metrics.c.first_response, metrics.c.lead_at)),
+    )
+    values = {
+        "last_touch_date": metrics.c.last_touch,
+        "last_message": metrics.c.last_message,
+        "touch_summary": touch_summary,
+        "speed_to_lead": speed_to_lead,
+    }
+
+    return db.execute(
+        update(_contacts)
+        .where(_contacts.c.id == metrics.c.contact_id)
+        .where(
+            or_(*[
+                _contacts.c[column].is_distinct_from(value) for column, value in values.items()
+            ])
+        )
+        .values(**values)
+    ).rowcount
+
+
+# Ingestion
+
+async def _fetch_new_messages(
+    client: GHLClient,
+    location_id: str,
+    conversation_id: str,
+    since: Any,
+    semaphore: asyncio.Semaphore,
+) -> List[Dict[str, Any]]:
+    """Messages newer than `since` (all of them if None), newest first"""
+    messages: List[Dict[str, Any]] = []
+    last_message_id = None
+
+    async with semaphore:
+        while True:
+            await ghl_rate_budget.acquire(location_id)
+            data = await client.get_messages(
+                conversation_id, limit=settings.GHL_PAGE_SIZE, last_message_id=last_message_id
+            )
+            page = data.get("messages") or []
+            for message in page:
+                date_added = _utc(parse_datetime(message.get("dateAdded")))
+                if since is not None and date_added is not None and date_added <= since:
+                    return messages  # Older messages were ingested before
+                messages.append(message)
+
+            last_message_id = data.get("lastMessageId")
+            if not page or not data.get("nextPage") or not last_message_id:
+                return messages
+
+
+def _write_page(
+    db: Session,
+    location_pk: int,
+    conversations: List[Dict[str, Any]],
+    messages: Dict[str, List[Dict[str, Any]]],
+) -> int:
+    """Upsert a page of conversations and their new messages"""
+    contact_ids = resolve_contact_ids(
+        db, location_pk, (item.get("contactId") for item in conversations)
+    )
+    rows = [
+        _conversation_row(item, contact_ids[item["contactId"]])
+        for item in conversations
+        if item.get("contactId") in contact_ids
+    ]
+    bulk_upsert(db, _conversations, rows, conflict_columns=["external_id"])
+
+    state = _conversation_state(db, (row["external_id"] for row in rows))
+    message_rows = [
+        _message_row(message, state[row["external_id"]][0], row["contact_id"])
+        for row in rows
+        for message in messages.get(row["external_id"], [])
+        if message.get("id")
+    ]
+    bulk_upsert(db, _messages, message_rows, conflict_columns=["external_id"])
+    db.commit()
+    return len(message_rows)
+
+
+async def sync_conversations(db: Session, location: Location, client: GHLClient) -> Dict[str, int]:
+    """
+    Incremental conversation/message sync for a location
+
+    Conversations are listed most recently active first. Only those
+    whose lastMessageDate moved past the stored one have their messages
+    fetched, and only messages newer than the stored date. Listing stops
+    at the first page with no changed conversation. Touch metrics are
+    recomputed for the location at the end.
+
+    Returns:
+        Counts: conversations (changed), messages (ingested), contactsUpdated
+    """
+    semaphore = asyncio.Semaphore(settings.GHL_SYNC_CONCURRENCY)
+    counts = {"conversations": 0, "messages": 0}
+    start_after = None
+
+    while True:
+        await ghl_rate_budget.acquire(location.location_id)
+        data = await client.search_conversations(
+            location.location_id, limit=settings.GHL_PAGE_SIZE, start_after_date=start_after
+        )
+        page = [item for item in data.get("conversations") or [] if item.get("id")]
+        if not page:
+            break
+
+        state = await asyncio.to_thread(_conversation_state, db, (item["id"] for item in page))
+        changed = []
+        for item in page:
+            stored = state.get(item["id"])
+            last_message_date = _utc(parse_datetime(item.get("lastMessageDate")))
+            if (
+                stored is None
+                or stored[1] is None
+                or (last_message_date and last_message_date > stored[1])
+            ):
+                changed.append((item, stored[1] if stored else None))
+
+        if not changed:
+            break
+
+        fetched = await asyncio.gather(*(
+            _fetch_new_messages(client, location.location_id, item["id"], since, semaphore)
+            for item, since in changed
+        ))
+        messages = {item["id"]: new for (item, _), new in zip(changed, fetched)}
+
+        counts["conversations"] += len(changed)
+        counts["messages"] += await asyncio.to_thread(
+            _write_page, db, location.id, [item for item, _ in changed], messages
+        )
+
+        start_after = page[-1].get("lastMessageDate")
+        if len(page) < settings.GHL_PAGE_SIZE or not start_after:
+            break
+
+    counts["contactsUpdated"] = await asyncio.to_thread(_refresh_and_commit, db, location.id)
+
+    logger.info(f"Synced conversations for location {location.location_id}: {counts}")
+    return counts
+
+
+def _refresh_and_commit(db: Session, location_pk: int) -> int:
+    changed = refresh_touch_metrics(db, location_pk=location_pk)
+    db.commit()
+    return changed
+
+
+def ingest_message_event(db: Session, payload: Dict[str, Any]) -> Optional[str]:
+    """
+    Apply an InboundMessage / OutboundMessage webhook
+
+    Stores the message and refreshes the contact's metrics. The
+    conversation's last_message_date (the sync cursor) is left to the
+    sync, so a webhook can't make it skip messages it never saw.
+
+    Returns:
+        GHL location id of the contact, or None if the contact isn't synced yet
+    """
+    message_id = payload.get("messageId")
+    conversation_id = payload.get("conversationId")
+    contact = db.query(Contact.id, Location.location_id).join(
+        Location, Location.id == Contact.location_id
+    ).filter(
+        Location.location_id == payload.get("locationId"),
+        Contact.external_id == payload.get("contactId"),
+    ).first()
+
+    if not (contact and message_id and conversation_id):
+        return None
+
+    bulk_upsert(
+        db,
+        _conversations,
+        [{
+            "external_id": conversation_id,
+            "contact_id": contact.id,
+            "channel": payload.get("messageType"),
+        }],
+        conflict_columns=["external_id"],
+        update_columns=[],
+    )
+    conversation_pk = _conversation_state(db, [conversation_id])[conversation_id][0]
+
+    message = {
+        "id": message_id,
+        "direction": (
+            payload.get("direction")
+            or ("inbound" if payload.get("type") == "InboundMessage" else "outbound")
+        ),
+        "messageType": payload.get("messageType"),
+        "body": payload.get("body"),
+        "dateAdded": payload.get("dateAdded") or payload.get("timestamp"),
+    }
+    bulk_upsert(
+        db,
+        _messages,
+        [_message_row(message, conversation_pk, contact.id)],
+        conflict_columns=["external_id"],
+    )
+
+    refresh_touch_metrics(db, contact_pks=[contact.id])
+    db.commit()
+    return contact.location_id
@@ -2,17 +2,153 @@
 GHL API Client
 Handles all interactions with GoHighLevel API
 """
+import asyncio
+import hashlib
+import math
+import random
 import httpx
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+import orjson
+from typing import Awaitable, Callable, Optional, Dict, Any, List, Tuple
+from datetime import datetime, timedelta, timezone
+from dateutil import parser as date_parser
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core.circuit_breaker import CircuitOpen, ghl_breakers
 from app.core.config import settings
+from app.core.hedging import ghl_hedger
+from app.core.singleflight import ghl_singleflight
+from app.models.location import Location
+from app.models.oauth import GHLAgencyToken
+from app.services.paging import iter_pages
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse a GHL timestamp (ISO 8601 or epoch milliseconds), tolerating missing/invalid values"""
+    if not value:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+        return date_parser.isoparse(value)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+# Throttled or transient server-side failures, worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GHLUnavailable(httpx.HTTPError):
+    """
+    A GHL endpoint kept failing (after retries) or its circuit breaker is open
+
+    `retry_after` is the number of seconds until the breaker lets calls
+    through again, or the last Retry-After GHL sent (0 if unknown).
+    """
+
+    def __init__(self, endpoint: str, reason: str, retry_after: float = 0.0):
+        super().__init__(f"GHL {endpoint} unavailable: {reason}")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def unavailable_error(e: GHLUnavailable) -> HTTPException:
+    """503 for a request handler that can't reach GHL, with Retry-After"""
+    return HTTPException(
+        status_code=503,
+        detail=str(e),
+        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+    )
+
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry number `attempt` (honours Retry-After)"""
+    if retry_after:
+        try:
+            return min(float(retry_after), settings.GHL_RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+    ceiling = min(settings.GHL_RETRY_MAX_DELAY, settings.GHL_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+# Transport override for every GHL request (None: the network)
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def set_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """Route all GHL requests through `transport` (e.g. a simulator); None restores the network"""
+    global _transport
+    _transport = transport
+
+
+def _http_client() -> httpx.AsyncClient:
+    timeout = httpx.Timeout(settings.GHL_READ_TIMEOUT, connect=settings.GHL_CONNECT_TIMEOUT)
+    return httpx.AsyncClient(timeout=timeout, transport=_transport)
+
+
+async def _send(
+    endpoint: str, idempotent: bool, call: Callable[[], Awaitable[httpx.Response]]
+) -> httpx.Response:
+    """
+    Run call() under the endpoint's circuit breaker, retrying if idempotent
+
+    Raises:
+        GHLUnavailable: The breaker is open, or the call still failed
+            (transport error, 429, 5xx) after retries
+    """
+    breaker = ghl_breakers.get(endpoint)
+    attempts = settings.GHL_RETRY_ATTEMPTS if idempotent else 1
+
+    for attempt in range(1, attempts + 1):
+        try:
+            breaker.allow()
+        except CircuitOpen as e:
+            raise GHLUnavailable(endpoint, str(e), e.retry_after) from e
+
+        retry_after = None
+        try:
+            response = await call()
+        except httpx.TransportError as e:
+            breaker.record(False)
+            failure = type(e).__name__
+        else:
+            # 429 is our own rate, not an endpoint fault
+            breaker.record(response.status_code < 500)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            await response.aclose()  # Streamed responses hold a connection
+            failure = f"HTTP {response.status_code}"
+            retry_after = response.headers.get("Retry-After")
+
+        if attempt < attempts:
+            await asyncio.sleep(_backoff(attempt, retry_after))
+
+    wait = breaker.retry_after()
+    if retry_after:
+        try:
+            wait = max(wait, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form
+    raise GHLUnavailable(endpoint, f"{failure} after {attempts} attempt(s)", wait)
+
+
+def _succeeded(response: httpx.Response) -> bool:
+    return response.status_code < 400
 
 
 class GHLClient:
-    """GoHighLevel API Client"""
+    """
+    GoHighLevel API Client
 
-    def __init__(self, access_token: str):
+    With hedge=True, latency-critical single-object reads (contacts,
+    locations) send a backup request when the first one is slower than
+    usual; meant for user-facing paths, not bulk jobs.
+    """
+
+    def __init__(self, access_token: str, hedge: bool = False):
         self.access_token = access_token
+        self.hedge = hedge
         self.base_url = settings.GHL_API_BASE_URL
         self.api_version = settings.GHL_API_VERSION
 
@@ -24,6 +160,86 @@ class GHLClient:
             "Accept": "application/json",
         }
 
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        authenticated: bool = True,
+        idempotent: Optional[bool] = None,
+        hedge: bool = False,
+        coalesce: bool = False,
+        cache_ttl: float = 0.0,
+    ) -> httpx.Response:
+        """
+        Send a request to the GHL API
+
+        Args:
+            method: HTTP method
+            path: Path below GHL_API_BASE_URL
+            endpoint: Endpoint name for the circuit breaker and errors
+                (e.g. "contacts.get"), shared by all ids of that endpoint
+            params / json / data: Query string, JSON body, form body
+            headers: Extra headers
+            authenticated: Send the bearer token and version headers
+            idempotent: Retry transport errors, 429 and 5xx with backoff
+                (default: GET requests only)
+            hedge: Send a second identical request if the first is slower
+                than the endpoint's usual p95, within the hedge budget
+                (idempotent requests only)
+            coalesce: Share one in-flight request between identical
+                concurrent calls (read-only requests only)
+            cache_ttl: Also serve successful (200) responses from cache
+                for this many seconds (requires coalesce)
+
+        Returns:
+            The response (body already read); 4xx responses are returned
+            for the caller to interpret
+
+        Raises:
+            GHLUnavailable: The endpoint's breaker is open, or the request
+                still failed (transport error, 429, 5xx) after retries
+        """
+        url = f"{self.base_url}{path}"
+        headers = {**(self._get_headers() if authenticated else {}), **(headers or {})}
+        if idempotent is None:
+            idempotent = method == "GET"
+        hedge = hedge and idempotent
+
+        async def send() -> httpx.Response:
+            async with _http_client() as client:
+
+                def call() -> Awaitable[httpx.Response]:
+                    return client.request(
+                        method, url, params=params, json=json, data=data, headers=headers
+                    )
+
+                def hedged() -> Awaitable[httpx.Response]:
+                    # A fast error response must not beat a slower success
+                    return ghl_hedger.run(endpoint, call, succeeded=_succeeded)
+
+                return await _send(endpoint, idempotent, hedged if hedge else call)
+
+        if not coalesce:
+            return await send()
+
+        # Same endpoint, arguments and credentials: same response
+        key = (
+            method,
+            url,
+            hashlib.md5(self.access_token.encode()).hexdigest() if authenticated else None,
+            orjson.dumps(params, option=orjson.OPT_SORT_KEYS) if params else None,
+            orjson.dumps(json, option=orjson.OPT_SORT_KEYS) if json is not None else None,
+            orjson.dumps(data, option=orjson.OPT_SORT_KEYS) if data else None,
+        )
+        return await ghl_singleflight.do(
+            key, send, ttl=cache_ttl, cache_if=lambda response: response.status_code == 200
+        )
+
     async def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """
         Exchange authorization code for access token
@@ -36,22 +252,24 @@ class GHLClient:
                 "companyId": "..."
             }
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/oauth/token",
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "client_id": settings.GHL_CLIENT_ID,
-                    "client_secret": settings.GHL_CLIENT_SECRET,
-                    "redirect_uri": settings.GHL_REDIRECT_URI,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        response = await self._request(
+            "POST",
+            "/oauth/token",
+            "oauth.token",
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "client_id": settings.GHL_CLIENT_ID,
+                "client_secret": settings.GHL_CLIENT_SECRET,
+                "redirect_uri": settings.GHL_REDIRECT_URI,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            authenticated=False,
+        )
 
-            if response.status_code == 200:
-                return response.json()
-            return None
+        if response.status_code == 200:
+            return response.json()
+        return None
 
     async def refresh_access_token(self, refresh_token: str) -> Optional[Dict[str, Any]]:
         """
@@ -64,59 +282,104 @@ class GHLClient:
                 "expires_in": 86400
             }
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/oauth/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": refresh_token,
-                    "client_id": settings.GHL_CLIENT_ID,
-                    "client_secret": settings.GHL_CLIENT_SECRET,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        response = await self._request(
+            "POST",
+            "/oauth/token",
+            "oauth.token",
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": settings.GHL_CLIENT_ID,
+                "client_secret": settings.GHL_CLIENT_SECRET,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            authenticated=False,
+        )
 
-            if response.status_code == 200:
-                return response.json()
-            return None
+        if response.status_code == 200:
+            return response.json()
+        return None
 
     async def get_location_info(self, location_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a location"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/locations/{location_id}",
-                headers=self._get_headers(),
-            )
+        response = await self._request(
+            "GET",
+            f"/locations/{location_id}",
+            "locations.get",
+            hedge=self.hedge,
+            coalesce=True,
+            cache_ttl=settings.GHL_READ_CACHE_SECONDS,
+        )
 
-            if response.status_code == 200:
-                return response.json()
-            return None
+        if response.status_code == 200:
+            return response.json()
+        return None
+
+    async def search_installed_locations(
+        self, company_id: str, app_id: str, skip: int = 0, limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Get one page of locations where the app is installed
+
+        Raises on non-200 responses: a silently empty page would look like
+        uninstalled locations.
+
+        Returns:
+            {
+                "locations": [...],
+                "count": 1234
+            }
+        """
+        response = await self._request(
+            "GET",
+            "/oauth/installedLocations",
+            "oauth.installedLocations",
+            params={
+                "companyId": company_id,
+                "appId": app_id,
+                "isInstalled": True,
+                "skip": skip,
+                "limit": limit,
+            },
+            coalesce=True,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def get_installed_locations(
-        self, company_id: str, app_id: str, limit: int = 100
-    ) -> List[Dict[str, Any]]:
+        self, company_id: str, app_id: str, limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
         """
         Get all locations where the app is installed
 
+        Follows the pagination until exhausted, GHL_SYNC_CONCURRENCY pages
+        at a time.
+
+        Args:
+            company_id: Agency (company) id
+            app_id: Marketplace app id
+            limit: Page size (default GHL_LOCATIONS_PAGE_SIZE)
+
         Returns:
-            List of location objects
+            (location objects, count GHL reported); offset pages can shift
+            between requests, so compare distinct ids with the count
+            before treating the list as complete
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/oauth/installedLocations",
-                params={
-                    "companyId": company_id,
-                    "appId": app_id,
-                    "isInstalled": True,
-                    "limit": limit,
-                },
-                headers=self._get_headers(),
+        limit = limit or settings.GHL_LOCATIONS_PAGE_SIZE
+        count = 0
+
+        async def fetch_page(page: int):
+            nonlocal count
+            data = await self.search_installed_locations(
+                company_id, app_id, skip=(page - 1) * limit, limit=limit
             )
+            count = max(count, data.get("count") or 0)
+            return data.get("locations") or [], data.get("count") or 0
 
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("locations", [])
-            return []
+        locations: List[Dict[str, Any]] = []
+        async for page in iter_pages(fetch_page, limit, settings.GHL_SYNC_CONCURRENCY):
+            locations.extend(page)
+        return locations, count
 
     async def get_location_token(
         self, company_id: str, location_id: str
@@ -124,110 +387,267 @@ class GHLClient:
         """
         Exchange agency token for location-specific token
 
+        Tokens are cached for GHL_LOCATION_TOKEN_CACHE_SECONDS (well within
+        their lifetime), so jobs and requests for the same location share one.
+
         Returns:
             Location access token
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/oauth/locationToken",
-                data={
-                    "companyId": company_id,
-                    "locationId": location_id,
-                },
-                headers={
-                    **self._get_headers(),
-                    "Content-Type": "application/x-www-form-urlencoded",
-                },
-            )
+        response = await self._request(
+            "POST",
+            "/oauth/locationToken",
+            "oauth.locationToken",
+            data={
+                "companyId": company_id,
+                "locationId": location_id,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            idempotent=True,
+            coalesce=True,
+            cache_ttl=settings.GHL_LOCATION_TOKEN_CACHE_SECONDS,
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("access_token")
-            return None
+        if response.status_code == 200:
+            data = response.json()
+            return data.get("access_token")
+        return None
 
     async def search_contacts(
         self,
         location_id: str,
         page: int = 1,
         limit: int = 100,
+        sort_by: str = "dateUpdated",
+        direction: str = "desc",
     ) -> Dict[str, Any]:
         """
         Search contacts for a location
 
+        Offset pages shift when a contact's sort key changes mid-pass; full
+        passes should sort on a key edits don't touch (dateAdded asc).
+
         Returns:
             {
                 "contacts": [...],
                 "total": 1234,
                 "count": 100
             }
+
+        Raises:
+            GHLUnavailable: On 429/5xx or transport errors after retries
+            httpx.HTTPStatusError: On other non-200 statuses (e.g. an
+                expired token), so a failed page never reads as empty
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{self.base_url}/contacts/search",
-                json={
-                    "locationId": location_id,
-                    "page": page,
-                    "pageLimit": limit,
-                    "sort": [{"field": "dateUpdated", "direction": "desc"}],
-                },
-                headers=self._get_headers(),
-            )
+        response = await self._request(
+            "POST",
+            "/contacts/search",
+            "contacts.search",
+            json={
+                "locationId": location_id,
+                "page": page,
+                "pageLimit": limit,
+                "sort": [{"field": sort_by, "direction": direction}],
+            },
+            idempotent=True,
+            coalesce=True,
+        )
 
-            if response.status_code == 200:
-                return response.json()
-            return {"contacts": [], "total": 0, "count": 0}
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
     async def get_contact(self, contact_id: str) -> Optional[Dict[str, Any]]:
-        """Get detailed information about a contact"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/contacts/{contact_id}",
-                headers=self._get_headers(),
-            )
+        """
+        Get detailed information about a contact
 
-            if response.status_code == 200:
-                return response.json()
+        Returns:
+            {"contact": {...}}, or None if the contact doesn't exist
+
+        Raises:
+            GHLUnavailable: On 429/5xx or transport errors after retries,
+                so callers can tell "gone" from "try again later"
+            httpx.HTTPStatusError: On other unexpected statuses
+        """
+        response = await self._request(
+            "GET",
+            f"/contacts/{contact_id}",
+            "contacts.get",
+            hedge=self.hedge,
+            coalesce=True,
+            cache_ttl=settings.GHL_READ_CACHE_SECONDS,
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code in (400, 404, 422):
             return None
+        response.raise_for_status()
+        return None
+
+    async def search_conversations(
+        self,
+        location_id: str,
+        limit: int = 100,
+        start_after_date: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search conversations for a location, most recent first
+
+        Paginated by cursor: pass the last conversation's sort value
+        (lastMessageDate, epoch ms) as start_after_date.
+
+        Returns:
+            {
+                "conversations": [...],
+                "total": 1234
+            }
+        """
+        params = {
+            "locationId": location_id,
+            "limit": limit,
+            "sort": "desc",
+            "sortBy": "last_message_date",
+        }
+        if start_after_date:
+            params["startAfterDate"] = start_after_date
+
+        response = await self._request(
+            "GET", "/conversations/search", "conversations.search", params=params, coalesce=True
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        return {"conversations": [], "total": 0}
+
+    async def get_messages(
+        self,
+        conversation_id: str,
+        limit: int = 100,
+        last_message_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get messages of a conversation, newest first
+
+        Returns:
+            {
+                "messages": [...],
+                "lastMessageId": "...",
+                "nextPage": true
+            }
+        """
+        params = {"limit": limit}
+        if last_message_id:
+            params["lastMessageId"] = last_message_id
+
+        response = await self._request(
+            "GET",
+            f"/conversations/{conversation_id}/messages",
+            "conversations.messages",
+            params=params,
+            coalesce=True,
+        )
+
+        if response.status_code == 200:
+            # Message list is nested: {"messages": {"messages": [...], ...}}
+            data = response.json().get("messages", {})
+            return data if isinstance(data, dict) else {"messages": data}
+        return {"messages": [], "nextPage": False}
+
+    async def search_opportunities(
+        self,
+        location_id: str,
+        page: int = 1,
+        limit: int = 100,
+        contact_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search opportunities for a location (one page)
+
+        Returns:
+            {
+                "opportunities": [...],
+                "meta": {"total": 1234, ...}
+            }
+        """
+        params = {"location_id": location_id, "page": page, "limit": limit}
+        if contact_id:
+            params["contact_id"] = contact_id
+
+        response = await self._request(
+            "GET", "/opportunities/search", "opportunities.search", params=params, coalesce=True
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        return {"opportunities": [], "meta": {"total": 0}}
 
     async def get_opportunities(
         self, location_id: str, contact_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get opportunities for a location or contact"""
-        params = {"location_id": location_id}
+        """Get opportunities for a location or contact (first page)"""
+        data = await self.search_opportunities(location_id, contact_id=contact_id)
+        return data.get("opportunities", [])
+
+    async def search_tasks(
+        self,
+        location_id: str,
+        page: int = 1,
+        limit: int = 100,
+        contact_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Search tasks for a location (one page)
+
+        Returns:
+            {
+                "tasks": [...],
+                "meta": {"total": 1234, ...}
+            }
+        """
+        params = {"locationId": location_id, "page": page, "limit": limit}
         if contact_id:
-            params["contact_id"] = contact_id
+            params["contactId"] = contact_id
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/opportunities/search",
-                params=params,
-                headers=self._get_headers(),
-            )
+        response = await self._request(
+            "GET", "/tasks/search", "tasks.search", params=params, coalesce=True
+        )
 
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("opportunities", [])
-            return []
+        if response.status_code == 200:
+            return response.json()
+        return {"tasks": [], "meta": {"total": 0}}
 
     async def get_tasks(
         self, location_id: str, contact_id: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get tasks for a location or contact"""
-        params = {"locationId": location_id}
-        if contact_id:
-            params["contactId"] = contact_id
+        """Get tasks for a location or contact (first page)"""
+        data = await self.search_tasks(location_id, contact_id=contact_id)
+        return data.get("tasks", [])
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/tasks/search",
-                params=params,
-                headers=self._get_headers(),
-            )
 
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("tasks", [])
-            return []
+async def get_location_client(db: Session, location: Location) -> Optional[GHLClient]:
+    """
+    Client authenticated for a single location
+
+    Exchanges the company's agency token for a location token.
+
+    Returns:
+        GHLClient, or None if there is no agency token or the exchange fails
+    """
+    token = db.query(GHLAgencyToken).filter(
+        GHLAgencyToken.company_id == location.company_id,
+        GHLAgencyToken.app_id == settings.GHL_APP_ID
+    ).first()
+
+    if not token:
+        return None
+
+    location_token = await GHLClient(access_token=token.access_token).get_location_token(
+        company_id=location.company_id,
+        location_id=location.location_id,
+    )
+
+    if not location_token:
+        return None
+    return GHLClient(access_token=location_token)
 
 
 class GHLOAuthHelper:
@@ -268,6 +688,7 @@ class GHLOAuthHelper:
             f"&client_id={settings.GHL_CLIENT_ID}"
             f"&redirect_uri={settings.GHL_REDIRECT_URI}"
             f"&scope=locations.readonly contacts.readonly opportunities.readonly"
+            f" conversations.readonly conversations/message.readonly"
             f"&state={state}"
         )
 
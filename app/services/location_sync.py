@@ -0,0 +1,104 @@
+"""
+Location Sync
+Mirrors an agency's installed locations from GHL in bulk
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.location import Location
+from app.services.bulk import bulk_upsert
+from app.services.ghl_client import GHLClient
+
+logger = logging.getLogger(__name__)
+
+_locations = Location.__table__
+
+
+def _location_row(data: Dict[str, Any], company_id: str) -> Dict[str, Any]:
+    return {
+        "location_id": data["_id"],
+        "name": data.get("name") or f"Location {data['_id']}",
+        "address": data.get("address"),
+        "city": data.get("city"),
+        "state": data.get("state"),
+        "country": data.get("country"),
+        "postal_code": data.get("postalCode"),
+        "company_id": company_id,
+        "app_id": settings.GHL_APP_ID,
+        "is_installed": data.get("isInstalled", True),
+    }
+
+
+def write_locations(
+    db: Session, company_id: str, locations: List[Dict[str, Any]], total: int
+) -> Dict[str, int]:
+    """
+    Bulk upsert a company's install list on location_id
+
+    Missing (null) values don't overwrite stored ones. Only when the list
+    is provably complete (as many distinct locations as the `total` GHL
+    reported, and not empty) are the company's installed locations absent
+    from it marked uninstalled, in one UPDATE; a shifted or short page
+    must not stop live locations from syncing.
+
+    Returns:
+        Counts: synced (new), updated, uninstalled
+    """
+    # Keyed on the GHL id so a location repeated across pages is upserted once
+    rows = list({
+        data["_id"]: _location_row(data, company_id) for data in locations if data.get("_id")
+    }.values())
+    location_ids = [row["location_id"] for row in rows]
+    existing = db.execute(
+        select(func.count()).where(_locations.c.location_id.in_(location_ids))
+    ).scalar_one()
+
+    bulk_upsert(db, _locations, rows, conflict_columns=["location_id"], keep_existing_on_null=True)
+
+    if not rows or len(rows) != total:
+        logger.warning(
+            f"Not marking uninstalled locations for company {company_id}: "
+            f"saw {len(rows)} distinct of {total}"
+        )
+        db.commit()
+        return {"synced": len(rows) - existing, "updated": existing, "uninstalled": 0}
+
+    uninstalled = db.execute(
+        update(_locations)
+        .where(
+            _locations.c.company_id == company_id,
+            _locations.c.app_id == settings.GHL_APP_ID,
+            _locations.c.is_installed.is_(True),
+            _locations.c.location_id.notin_(location_ids),
+        )
+        .values(is_installed=False)
+    ).rowcount
+    db.commit()
+
+    return {"synced": len(rows) - existing, "updated": existing, "uninstalled": uninstalled}
+
+
+async def sync_company_locations(db: Session, company_id: str, client: GHLClient) -> Dict[str, Any]:
+    """
+    Fetch every installed location of an agency and mirror them locally
+
+    Args:
+        db: Database session
+        company_id: Agency (company) id
+        client: Client holding the agency token
+
+    Returns:
+        Counts (synced, updated, uninstalled) and the GHL location ids
+    """
+    locations, total = await client.get_installed_locations(
+        company_id=company_id, app_id=settings.GHL_APP_ID
+    )
+    counts = await asyncio.to_thread(write_locations, db, company_id, locations, total)
+
+    logger.info(f"Synced {len(locations)} locations for company {company_id}: {counts}")
+    return {**counts, "locationIds": [data["_id"] for data in locations if data.get("_id")]}
@@ -0,0 +1,197 @@
+"""
+Opportunity Sync
+Pulls a location's opportunities from GHL and maintains pipeline rollups
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import exists, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contact import Contact, Opportunity
+from app.models.location import Location
+from app.services.bulk import bulk_upsert
+from app.services.contact_sync import resolve_contact_ids
+from app.services.ghl_client import GHLClient, parse_datetime
+from app.services.paging import iter_pages
+
+logger = logging.getLogger(__name__)
+
+_contacts = Contact.__table__
+_opportunities = Opportunity.__table__
+_locations = Location.__table__
+
+
+def _opportunity_row(data: Dict[str, Any], contact_pk: int) -> Dict[str, Any]:
+    return {
+        "external_id": data["id"],
+        "contact_id": contact_pk,
+        "name": data.get("name"),
+        "pipeline_id": data.get("pipelineId"),
+        "pipeline_stage_id": data.get("pipelineStageId"),
+        "status": data.get("status"),
+        "monetary_value": data.get("monetaryValue") or 0.0,
+        "created_date": parse_datetime(data.get("createdAt")),
+        "last_updated": parse_datetime(data.get("updatedAt")),
+    }
+
+
+def _contact_external_id(data: Dict[str, Any]) -> Optional[str]:
+    return data.get("contactId") or (data.get("contact") or {}).get("id")
+
+
+def _write_page(db: Session, location_pk: int, page: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Upsert one page of opportunities (contact ids resolved in one query)"""
+    contact_ids = resolve_contact_ids(
+        db, location_pk, (_contact_external_id(item) for item in page)
+    )
+
+    rows = []
+    for item in page:
+        contact_pk = contact_ids.get(_contact_external_id(item))
+        if item.get("id") and contact_pk:
+            rows.append(_opportunity_row(item, contact_pk))
+
+    bulk_upsert(db, _opportunities, rows, conflict_columns=["external_id"])
+    db.commit()
+    return {"upserted": len(rows), "skipped": len(page) - len(rows)}
+
+
+def refresh_rollups(db: Session, location_pk: Optional[int] = None) -> Dict[str, int]:
+    """
+    Recompute opportunity rollups with set-based UPDATE ... FROM statements
+
+    Sets Contact.opportunities_count / total_pipeline_value and
+    Location.opportunities_count from the opportunities table. Only rows
+    whose values change are written. Does not commit.
+
+    Args:
+        db: Database session
+        location_pk: Limit to one location (Location.id); None for all
+
+    Returns:
+        Number of contact and location rows changed
+    """
+    scoped = _opportunities.join(_contacts, _contacts.c.id == _opportunities.c.contact_id)
+
+    # Per-contact count and pipeline value
+    per_contact = (
+        select(
+            _opportunities.c.contact_id,
+            func.count().label("count"),
+            func.coalesce(func.sum(_opportunities.c.monetary_value), 0.0).label("value"),
+        )
+        .select_from(scoped)
+        .group_by(_opportunities.c.contact_id)
+    )
+    if location_pk is not None:
+        per_contact = per_contact.where(_contacts.c.location_id == location_pk)
+    per_contact = per_contact.subquery()
+
+    contacts_changed = db.execute(
+        update(_contacts)
+        .where(_contacts.c.id == per_contact.c.contact_id)
+        .where(or_(
+            func.coalesce(_contacts.c.opportunities_count, -1) != per_contact.c.count,
+            func.coalesce(_contacts.c.total_pipeline_value, -1.0) != per_contact.c.value,
+        ))
+        .values(opportunities_count=per_contact.c.count, total_pipeline_value=per_contact.c.value)
+    ).rowcount
+
+    # Contacts that no longer have any opportunities
+    reset = (
+        update(_contacts)
+        .where(or_(_contacts.c.opportunities_count != 0, _contacts.c.total_pipeline_value != 0))
+        .where(~exists().where(_opportunities.c.contact_id == _contacts.c.id))
+        .values(opportunities_count=0, total_pipeline_value=0.0)
+    )
+    if location_pk is not None:
+        reset = reset.where(_contacts.c.location_id == location_pk)
+    contacts_changed += db.execute(reset).rowcount
+
+    # Per-location totals
+    per_location = (
+        select(_contacts.c.location_id, func.count().label("count"))
+        .select_from(scoped)
+        .group_by(_contacts.c.location_id)
+    )
+    if location_pk is not None:
+        per_location = per_location.where(_contacts.c.location_id == location_pk)
+    per_location = per_location.subquery()
+
+    locations_changed = db.execute(
+        update(_locations)
+        .where(_locations.c.id == per_location.c.location_id)
+        .where(func.coalesce(_locations.c.opportunities_count, -1) != per_location.c.count)
+        .values(opportunities_count=per_location.c.count)
+    ).rowcount
+
+    reset = (
+        update(_locations)
+        .where(_locations.c.opportunities_count != 0)
+        .where(~exists().select_from(scoped).where(_contacts.c.location_id == _locations.c.id))
+        .values(opportunities_count=0)
+    )
+    if location_pk is not None:
+        reset = reset.where(_locations.c.id == location_pk)
+    locations_changed += db.execute(reset).rowcount
+
+    return {"contacts": contacts_changed, "locations": locations_changed}
+
+
+async def sync_opportunities(
+    db: Session,
+    location: Location,
+    client: GHLClient,
+) -> Dict[str, int]:
+    """
+    Full opportunity sync for a location
+
+    Pages of /opportunities/search are fetched concurrently and each is
+    bulk-upserted on external_id as it arrives (writes run in a worker
+    thread so fetching continues meanwhile). Opportunities whose contact
+    has not been synced yet are skipped. Rollups are recomputed at the end.
+
+    Args:
+        db: Database session
+        location: Location to sync
+        client: Client authenticated for the location
+
+    Returns:
+        Counts: fetched, upserted, skipped, contactsUpdated
+    """
+    page_size = settings.GHL_PAGE_SIZE
+
+    async def fetch_page(page: int):
+        data = await client.search_opportunities(location.location_id, page=page, limit=page_size)
+        return data.get("opportunities", []), (data.get("meta") or {}).get("total", 0)
+
+    fetched = upserted = skipped = 0
+    async for page in iter_pages(fetch_page, page_size, settings.GHL_SYNC_CONCURRENCY):
+        if not page:
+            continue
+        fetched += len(page)
+        result = await asyncio.to_thread(_write_page, db, location.id, page)
+        upserted += result["upserted"]
+        skipped += result["skipped"]
+
+    changed = await asyncio.to_thread(_refresh_and_commit, db, location.id)
+
+    logger.info(
+        f"Synced {upserted} opportunities for location {location.location_id} "
+        f"({skipped} skipped, {changed['contacts']} contact rollups changed)"
+    )
+    return {
+        "fetched": fetched,
+        "upserted": upserted,
+        "skipped": skipped,
+        "contactsUpdated": changed["contacts"],
+    }
+
+
+def _refresh_and_commit(db: Session, location_pk: int) -> Dict[str, int]:
+    changed = refresh_rollups(db, location_pk)
+    db.commit()
+    return changed
@@ -0,0 +1,50 @@
+"""
+Concurrent Pagination
+Fetch page-numbered GHL search endpoints with bounded concurrency
+"""
+import asyncio
+import math
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+# fetch_page(page) -> (items, total)
+PageFetcher = Callable[[int], Awaitable[Tuple[List[Dict[str, Any]], int]]]
+
+
+async def iter_pages(
+    fetch_page: PageFetcher,
+    page_size: int,
+    concurrency: int,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield the items of every page, fetching pages concurrently
+
+    Page 1 is fetched alone to learn the total; the remaining pages are
+    requested at most `concurrency` at a time and yielded in completion
+    order (not page order).
+
+    Args:
+        fetch_page: Coroutine returning (items, total) for a 1-based page
+        page_size: Items per page (to derive the page count from total)
+        concurrency: Maximum requests in flight
+    """
+    items, total = await fetch_page(1)
+    yield items
+
+    pages = math.ceil(total / page_size) if page_size else 1
+    if pages <= 1:
+        return
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(page: int) -> List[Dict[str, Any]]:
+        async with semaphore:
+            page_items, _ = await fetch_page(page)
+            return page_items
+
+    tasks = [asyncio.create_task(fetch(page)) for page in range(2, pages + 1)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
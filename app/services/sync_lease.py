@@ -0,0 +1,63 @@
+"""
+Location Sync Lease
+One sync per location at a time, across API processes and workers
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.lease import Lease, LeaseLost, hold, location_lease_name
+from app.models.location import Location
+
+_locations = Location.__table__
+
+
+def _claim_fence(db: Session, location_pk: int) -> int:
+    fence = db.execute(
+        update(_locations)
+        .where(_locations.c.id == location_pk)
+        .values(
+            sync_fence=func.coalesce(_locations.c.sync_fence, 0) + 1,
+            updated_at=_locations.c.updated_at,
+        )
+        .returning(_locations.c.sync_fence)
+    ).scalar_one()
+    db.commit()
+    return fence
+
+
+def _check_fence(db: Session, location_pk: int, token: int) -> None:
+    current = db.execute(
+        select(_locations.c.sync_fence).where(_locations.c.id == location_pk)
+    ).scalar()
+    if current is not None and current > token:
+        raise LeaseLost(f"Fencing token {token} superseded by {current} for location {location_pk}")
+
+
+async def check_fence(db: Session, location: Location, lease: Optional[Lease]) -> None:
+    """Stop a holder whose lease was taken over (call between write stages)"""
+    if lease is not None:
+        await asyncio.to_thread(_check_fence, db, location.id, lease.fence)
+
+
+@asynccontextmanager
+async def location_sync_lease(db: Session, location: Location) -> AsyncIterator[Optional[Lease]]:
+    """
+    Hold the location's sync lease and claim a fencing token for it
+
+    The token is issued by the database (Location.sync_fence, bumped in
+    one UPDATE ... RETURNING), so it keeps increasing even if Redis loses
+    the lease counters. A holder that stalled past its TTL and was
+    replaced fails check_fence() instead of overwriting newer data.
+
+    Raises:
+        LeaseHeld: The location is being synced elsewhere (carries its progress)
+        LeaseLost: The lease or fence was lost while syncing
+    """
+    async with hold(location_lease_name(location.location_id)) as lease:
+        if lease is not None:
+            lease.fence = await asyncio.to_thread(_claim_fence, db, location.id)
+        yield lease
@@ -0,0 +1,202 @@
+"""
+Sync Scheduler
+Fair, priority-ordered dispatch of location syncs across companies
+"""
+import heapq
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.location import Location
+
+logger = logging.getLogger(__name__)
+
+# Sync frequency multiplier per tenant tier
+TIER_WEIGHTS = {0: 0.5, 1: 1.0, 2: 2.0}
+
+_locations = Location.__table__
+
+
+@dataclass
+class Candidate:
+    """A location considered for dispatch"""
+    location_id: str
+    company_id: Optional[str]
+    priority: float
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def target_interval(tier: Optional[int], change_rate: Optional[float]) -> float:
+    """
+    Desired minutes between syncs of a location
+
+    The base LOCATION_SYNC_INTERVAL_MINUTES shrinks with the tier weight
+    and with the learned change rate (log-scaled, so a location changing
+    100 rows/hour syncs ~5x as often as a dormant one), clamped to
+    [SYNC_MIN_INTERVAL_MINUTES, SYNC_MAX_INTERVAL_MINUTES].
+    """
+    weight = TIER_WEIGHTS.get(tier if tier is not None else 1, 1.0)
+    activity = 1.0 + math.log1p(max(change_rate or 0.0, 0.0))
+    interval = settings.LOCATION_SYNC_INTERVAL_MINUTES / (weight * activity)
+    if not change_rate:
+        interval *= 4  # Nothing changed lately: drift towards the maximum
+    return min(
+        max(interval, settings.SYNC_MIN_INTERVAL_MINUTES), settings.SYNC_MAX_INTERVAL_MINUTES
+    )
+
+
+def priority(
+    last_synced_at: Optional[datetime],
+    tier: Optional[int],
+    change_rate: Optional[float],
+    now: datetime,
+) -> float:
+    """
+    Staleness relative to the target interval; due at >= 1
+
+    Never-synced locations come first.
+    """
+    if last_synced_at is None:
+        return math.inf
+    staleness = (now - _utc(last_synced_at)).total_seconds() / 60
+    return staleness / target_interval(tier, change_rate)
+
+
+def plan_dispatch(
+    candidates: Iterable[Candidate],
+    in_flight: Dict[Optional[str], int],
+    slots: int,
+    company_cap: int,
+) -> List[str]:
+    """
+    Pick due locations, most overdue first, within the concurrency caps
+
+    Companies at their cap are skipped rather than waited on, so a large
+    agency can't hold the global slots while others have due work.
+
+    Args:
+        candidates: Due locations with their priorities
+        in_flight: Syncs already running per company
+        slots: Free global slots
+        company_cap: Maximum concurrent syncs per company
+
+    Returns:
+        GHL location ids to dispatch, in priority order
+    """
+    heap = [
+        (-candidate.priority, candidate.location_id, candidate.company_id)
+        for candidate in candidates
+    ]
+    heapq.heapify(heap)
+    running = Counter(in_flight)
+
+    chosen: List[str] = []
+    while heap and len(chosen) < slots:
+        _, location_id, company_id = heapq.heappop(heap)
+        if running[company_id] >= company_cap:
+            continue
+        running[company_id] += 1
+        chosen.append(location_id)
+    return chosen
+
+
+def dispatch(db: Session, now: Optional[datetime] = None) -> List[str]:
+    """
+    Claim the next locations to sync
+
+    Locations with a live in-flight marker (sync_started_at within
+    SYNC_LEASE_MINUTES) count against the caps and are not re-dispatched;
+    chosen ones get the marker in one guarded UPDATE. Only rows that
+    UPDATE actually claimed are returned, so overlapping ticks (or several
+    beat processes) never dispatch the same location twice.
+
+    Returns:
+        GHL location ids to sync
+    """
+    now = now or datetime.now(timezone.utc)
+    lease_cutoff = now - timedelta(minutes=settings.SYNC_LEASE_MINUTES)
+
+    rows = db.execute(
+        select(
+            _locations.c.location_id,
+            _locations.c.company_id,
+            _locations.c.last_synced_at,
+            _locations.c.sync_started_at,
+            _locations.c.sync_tier,
+            _locations.c.sync_change_rate,
+        ).where(_locations.c.is_installed.is_(True))
+    ).all()
+
+    in_flight: Dict[Optional[str], int] = Counter()
+    candidates = []
+    for row in rows:
+        if row.sync_started_at is not None and _utc(row.sync_started_at) > lease_cutoff:
+            in_flight[row.company_id] += 1
+            continue
+        score = priority(row.last_synced_at, row.sync_tier, row.sync_change_rate, now)
+        if score >= 1:
+            candidates.append(Candidate(row.location_id, row.company_id, score))
+
+    slots = settings.SYNC_MAX_CONCURRENT_LOCATIONS - sum(in_flight.values())
+    chosen = plan_dispatch(candidates, in_flight, slots, settings.SYNC_MAX_CONCURRENT_PER_COMPANY)
+    claimed: List[str] = []
+    if chosen:
+        claimed_ids = set(
+            db.execute(
+                update(_locations)
+                .where(
+                    _locations.c.location_id.in_(chosen),
+                    or_(
+                        _locations.c.sync_started_at.is_(None),
+                        _locations.c.sync_started_at <= lease_cutoff,
+                    ),
+                )
+                .values(sync_started_at=now, updated_at=_locations.c.updated_at)
+                .returning(_locations.c.location_id)
+            ).scalars()
+        )
+        db.commit()
+        claimed = [location_id for location_id in chosen if location_id in claimed_ids]
+
+    logger.info(
+        f"Sync scheduler: {len(candidates)} due, {sum(in_flight.values())} in flight, "
+        f"dispatching {len(claimed)} of {len(chosen)} chosen"
+    )
+    return claimed
+
+
+def record_sync(
+    db: Session,
+    location: Location,
+    changed_rows: int,
+    finished_at: Optional[datetime] = None,
+) -> None:
+    """
+    Record a completed sync: freshness, learned change rate, marker cleared
+
+    The change rate is an exponential moving average of rows changed per
+    hour since the previous sync (SYNC_CHANGE_RATE_ALPHA).
+    """
+    finished_at = finished_at or datetime.now(timezone.utc)
+    if location.last_synced_at is not None:
+        hours = max((finished_at - _utc(location.last_synced_at)).total_seconds() / 3600, 1 / 60)
+        alpha = settings.SYNC_CHANGE_RATE_ALPHA
+        location.sync_change_rate = (
+            alpha * (changed_rows / hours) + (1 - alpha) * (location.sync_change_rate or 0.0)
+        )
+
+    location.last_synced_at = finished_at
+    location.sync_started_at = None
+    db.commit()
@@ -0,0 +1,159 @@
+"""
+Task Sync
+Pulls a location's CRM tasks from GHL and maintains Contact.crm_tasks
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import String, and_, case, cast, exists, func, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.contact import Contact, Task
+from app.models.location import Location
+from app.services.bulk import bulk_upsert
+from app.services.contact_sync import resolve_contact_ids
+from app.services.ghl_client import GHLClient, parse_datetime
+from app.services.paging import iter_pages
+
+logger = logging.getLogger(__name__)
+
+NO_TASKS = "no_tasks"
+
+_contacts = Contact.__table__
+_tasks = Task.__table__
+
+
+def _task_row(data: Dict[str, Any], contact_pk: int) -> Dict[str, Any]:
+    completed = bool(data.get("completed")) or data.get("status") == "completed"
+    return {
+        "external_id": data["id"],
+        "contact_id": contact_pk,
+        "title": data.get("title"),
+        "description": data.get("body") or data.get("description"),
+        "status": "completed" if completed else (data.get("status") or "open"),
+        "priority": data.get("priority"),
+        "assigned_to": data.get("assignedTo"),
+        "due_date": parse_datetime(data.get("dueDate")),
+        "completed_date": parse_datetime(data.get("dateCompleted") or data.get("completedAt")),
+    }
+
+
+def _write_page(db: Session, location_pk: int, page: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Upsert one page of tasks (contact ids resolved in one query)"""
+    contact_ids = resolve_contact_ids(db, location_pk, (item.get("contactId") for item in page))
+
+    rows = []
+    for item in page:
+        contact_pk = contact_ids.get(item.get("contactId"))
+        if item.get("id") and contact_pk:
+            rows.append(_task_row(item, contact_pk))
+
+    bulk_upsert(db, _tasks, rows, conflict_columns=["external_id"])
+    db.commit()
+    return {"upserted": len(rows), "skipped": len(page) - len(rows)}
+
+
+def refresh_task_summaries(db: Session, location_pk: Optional[int] = None) -> int:
+    """
+    Recompute Contact.crm_tasks ("open:N,overdue:N,completed:N")
+
+    Counts come from a single GROUP BY over tasks, applied with one
+    UPDATE ... FROM; contacts without tasks go back to "no_tasks".
+    Overdue depends on the clock, so this runs on every sync even when
+    no task changed. Does not commit.
+
+    Returns:
+        Number of contacts whose summary changed
+    """
+    is_completed = _tasks.c.status == "completed"
+    is_overdue = and_(~is_completed, _tasks.c.due_date < func.now())
+
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    counts = (
+        select(
+            _tasks.c.contact_id,
+            count_if(~is_completed).label("open"),
+            count_if(is_overdue).label("overdue"),
+            count_if(is_completed).label("completed"),
+        )
+        .select_from(_tasks.join(_contacts, _contacts.c.id == _tasks.c.contact_id))
+        .group_by(_tasks.c.contact_id)
+    )
+    if location_pk is not None:
+        counts = counts.where(_contacts.c.location_id == location_pk)
+    counts = counts.subquery()
+
+    summary = (
+        literal("open:") + cast(counts.c.open, String)
+        + literal(",overdue:") + cast(counts.c.overdue, String)
+        + literal(",completed:") + cast(counts.c.completed, String)
+    )
+
+    changed = db.execute(
+        update(_contacts)
+        .where(_contacts.c.id == counts.c.contact_id)
+        .where(func.coalesce(_contacts.c.crm_tasks, "") != summary)
+        .values(crm_tasks=summary)
+    ).rowcount
+
+    reset = (
+        update(_contacts)
+        .where(func.coalesce(_contacts.c.crm_tasks, "") != NO_TASKS)
+        .where(~exists().where(_tasks.c.contact_id == _contacts.c.id))
+        .values(crm_tasks=NO_TASKS)
+    )
+    if location_pk is not None:
+        reset = reset.where(_contacts.c.location_id == location_pk)
+    changed += db.execute(reset).rowcount
+
+    return changed
+
+
+async def sync_tasks(db: Session, location: Location, client: GHLClient) -> Dict[str, int]:
+    """
+    Full task sync for a location
+
+    Tasks are listed per location (not per contact), pages fetched
+    concurrently and bulk-upserted on external_id. Tasks of contacts that
+    have not been synced are skipped. Summaries are recomputed at the end.
+
+    Returns:
+        Counts: fetched, upserted, skipped, contactsUpdated
+    """
+    page_size = settings.GHL_PAGE_SIZE
+
+    async def fetch_page(page: int):
+        data = await client.search_tasks(location.location_id, page=page, limit=page_size)
+        return data.get("tasks", []), (data.get("meta") or {}).get("total", 0)
+
+    fetched = upserted = skipped = 0
+    async for page in iter_pages(fetch_page, page_size, settings.GHL_SYNC_CONCURRENCY):
+        if not page:
+            continue
+        fetched += len(page)
+        result = await asyncio.to_thread(_write_page, db, location.id, page)
+        upserted += result["upserted"]
+        skipped += result["skipped"]
+
+    changed = await asyncio.to_thread(_refresh_and_commit, db, location.id)
+
+    logger.info(
+        f"Synced {upserted} tasks for location {location.location_id} "
+        f"({skipped} skipped, {changed} summaries changed)"
+    )
+    return {
+        "fetched": fetched,
+        "upserted": upserted,
+        "skipped": skipped,
+        "contactsUpdated": changed,
+    }
+
+
+def _refresh_and_commit(db: Session, location_pk: int) -> int:
+    changed = refresh_task_summaries(db, location_pk)
+    db.commit()
+    return changed
@@ -1 +1,4 @@
 """Background Workers"""
+from app.workers.celery_app import celery_app
+
+__all__ = ["celery_app"]
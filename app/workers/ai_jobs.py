@@ -0,0 +1,71 @@
+"""
+AI Jobs
+Scheduled AI grading of new and changed contacts
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.location import Location
+from app.services.ai_grading import GradingStats, grade_location, locations_needing_grading
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+async def _grade(location_ids: List[str]) -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        stats = GradingStats()
+        locations = db.query(Location).filter(Location.location_id.in_(location_ids)).all()
+        for location in locations:
+            graded = stats.graded + stats.not_contacted
+            await grade_location(db, location, semaphores, stats)
+            if stats.graded + stats.not_contacted > graded:
+                await response_cache.invalidate_location_async(location.location_id)
+    finally:
+        db.close()
+
+    result = stats.as_dict()
+    logger.info(f"Graded contacts for {len(location_ids)} locations: {result}")
+    return result
+
+
+@celery_app.task(name="ai.grade_locations")
+def grade_locations(location_ids: List[str]) -> Dict[str, Any]:
+    """
+    Grade contacts of the given locations (GHL location ids)
+
+    Locations are graded in one event loop so those sharing an API key
+    also share its AI_GRADING_CONCURRENCY limit.
+    """
+    return asyncio.run(_grade(location_ids))
+
+
+@celery_app.task(name="ai.grade_pending_contacts")
+def grade_pending_contacts() -> int:
+    """Queue one grading job per API key for locations with ungraded contacts (beat schedule)"""
+    db = SessionLocal()
+    try:
+        location_ids = locations_needing_grading(db)
+        keys = dict(
+            db.query(Location.location_id, Location.openai_api_key)
+            .filter(Location.location_id.in_(location_ids))
+            .all()
+        )
+    finally:
+        db.close()
+
+    by_key: Dict[str, List[str]] = defaultdict(list)
+    for location_id in location_ids:
+        by_key[keys.get(location_id) or settings.OPENAI_API_KEY].append(location_id)
+
+    for group in by_key.values():
+        grade_locations.delay(group)
+
+    return len(by_key)
@@ -0,0 +1,48 @@
+"""
+Analytics Jobs
+Scheduled and on-demand Parquet snapshots
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.columnar_export import export_all, export_snapshot
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="analytics.export_snapshot")
+def export_snapshot_task(
+    table: str,
+    location_id: Optional[str] = None,
+    uri: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Write one Parquet snapshot
+
+    Args:
+        table: "contacts" or "opportunities"
+        location_id: GHL location id (None exports all locations)
+        uri: Destination (defaults to ANALYTICS_EXPORT_URI)
+    """
+    uri = uri or settings.ANALYTICS_EXPORT_URI
+    if not uri:
+        raise ValueError("ANALYTICS_EXPORT_URI is not configured")
+
+    db = SessionLocal()
+    try:
+        return export_snapshot(db, table, uri, location_id)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="analytics.export_all_snapshots")
+def export_all_snapshots_task() -> List[Dict[str, Any]]:
+    """Snapshot every exportable table across all locations (beat schedule)"""
+    db = SessionLocal()
+    try:
+        return export_all(db, settings.ANALYTICS_EXPORT_URI)
+    finally:
+        db.close()
@@ -0,0 +1,95 @@
+"""
+Bootstrap Jobs
+Post-OAuth install: sync the agency's locations, then each location in full
+"""
+import asyncio
+import logging
+from typing import Any, Dict
+
+from app.core.cache import LOCATIONS_TAG, location_tag, response_cache
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.lease import LeaseHeld
+from app.models.location import Location
+from app.models.oauth import GHLAgencyToken
+from app.services import bootstrap
+from app.services.ghl_client import GHLClient
+from app.services.location_sync import sync_company_locations
+from app.services.sync_scheduler import record_sync
+from app.workers.celery_app import celery_app
+from app.workers.sharding import current_ring, route
+from app.workers.sync_jobs import changed_rows, run_location_sync
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="bootstrap.bootstrap_company")
+def bootstrap_company(company_id: str) -> Dict[str, Any]:
+    """
+    Sync an agency's installed locations and fan out their initial syncs
+
+    Progress is kept in Redis for GET /oauth/bootstrap/{company_id}.
+    """
+    bootstrap.update_progress(company_id, status=bootstrap.SYNCING_LOCATIONS)
+
+    db = SessionLocal()
+    try:
+        token = db.query(GHLAgencyToken).filter(
+            GHLAgencyToken.company_id == company_id,
+            GHLAgencyToken.app_id == settings.GHL_APP_ID,
+        ).first()
+        if not token:
+            raise ValueError(f"No OAuth token for company {company_id}")
+
+        client = GHLClient(access_token=token.access_token)
+        result = asyncio.run(sync_company_locations(db, company_id, client))
+    except Exception as e:
+        bootstrap.update_progress(company_id, status=bootstrap.FAILED, error=str(e))
+        raise
+    finally:
+        db.close()
+
+    location_ids = result["locationIds"]
+    response_cache.invalidate_tags(
+        [LOCATIONS_TAG] + [location_tag(location_id) for location_id in location_ids]
+    )
+
+    bootstrap.update_progress(
+        company_id,
+        status=bootstrap.SYNCING_CONTACTS if location_ids else bootstrap.COMPLETED,
+        locationsTotal=len(location_ids),
+    )
+    ring = current_ring()
+    for location_id in location_ids:
+        bootstrap_location.apply_async((company_id, location_id), **route(ring, location_id))
+
+    return {"companyId": company_id, **{k: v for k, v in result.items() if k != "locationIds"}}
+
+
+@celery_app.task(name="bootstrap.bootstrap_location")
+def bootstrap_location(company_id: str, location_id: str) -> Dict[str, Any]:
+    """
+    Initial full sync of one newly installed location
+
+    Recorded with the scheduler like any other sync, so the location
+    isn't picked up again as never-synced on the next tick.
+    """
+    db = SessionLocal()
+    try:
+        location = db.query(Location).filter(Location.location_id == location_id).first()
+        if not location:
+            raise ValueError(f"Location not found: {location_id}")
+        result = asyncio.run(run_location_sync(db, location))
+        record_sync(db, location, changed_rows(result))
+    except LeaseHeld:
+        # Already syncing (e.g. dispatched by the scheduler): counts as done
+        bootstrap.record_location_done(company_id)
+        return {"locationId": location_id, "joined": True}
+    except Exception:
+        bootstrap.record_location_done(company_id, failed=True)
+        raise
+    finally:
+        db.close()
+
+    bootstrap.record_location_done(company_id)
+    return result
@@ -0,0 +1,57 @@
+"""
+Celery Application
+Broker/backend configuration and periodic task schedule
+"""
+from datetime import timedelta
+
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery(
+    "cyclsales",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.workers.ai_jobs",
+        "app.workers.analytics_jobs",
+        "app.workers.bootstrap_jobs",
+        "app.workers.sync_jobs",
+    ],
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    timezone="UTC",
+    enable_utc=True,
+    task_acks_late=True,  # Long exports are re-run if a worker dies mid-job
+    worker_prefetch_multiplier=1,
+    result_expires=24 * 3600,
+)
+
+# Periodic tasks (run with: celery -A app.workers beat)
+celery_app.conf.beat_schedule = {
+    "sync-scheduler": {
+        "task": "sync.schedule_syncs",
+        "schedule": timedelta(seconds=settings.SYNC_SCHEDULER_TICK_SECONDS),
+    },
+    "contact-hydration": {
+        "task": "sync.hydrate_pending_contacts",
+        "schedule": timedelta(minutes=settings.HYDRATION_INTERVAL_MINUTES),
+    },
+    "ai-grading": {
+        "task": "ai.grade_pending_contacts",
+        "schedule": timedelta(minutes=settings.AI_GRADING_INTERVAL_MINUTES),
+    },
+}
+
+if settings.ANALYTICS_EXPORT_URI:
+    celery_app.conf.beat_schedule["analytics-snapshots"] = {
+        "task": "analytics.export_all_snapshots",
+        "schedule": timedelta(hours=settings.ANALYTICS_EXPORT_INTERVAL_HOURS),
+    }
+
+# Worker signal handlers (shard membership); imported here so every worker connects them
+from app.workers import sharding  # noqa: E402,F401
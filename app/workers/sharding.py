@@ -0,0 +1,100 @@
+"""
+Sync Sharding
+Worker membership heartbeats and consistent-hash routing of location jobs
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import redis
+from celery.signals import celeryd_after_setup, worker_ready, worker_shutdown
+
+from app.core.config import settings
+from app.core.hash_ring import HashRing
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_MEMBERS_KEY = "workers:sync"
+QUEUE_PREFIX = "sync."
+
+_node_id: Optional[str] = None
+_stop = threading.Event()
+
+
+def shard_queue(node_id: str) -> str:
+    """Queue consumed only by one worker node"""
+    return QUEUE_PREFIX + node_id
+
+
+def heartbeat(node_id: str) -> None:
+    get_redis().zadd(REDIS_MEMBERS_KEY, {node_id: time.time()})
+
+
+def live_members() -> List[str]:
+    """Nodes that heartbeated within SHARD_MEMBER_TIMEOUT_SECONDS (stale ones are pruned)"""
+    client = get_redis()
+    cutoff = time.time() - settings.SHARD_MEMBER_TIMEOUT_SECONDS
+    client.zremrangebyscore(REDIS_MEMBERS_KEY, "-inf", cutoff)
+    return client.zrange(REDIS_MEMBERS_KEY, 0, -1)
+
+
+def current_ring() -> HashRing:
+    """Ring over live members; empty if sharding is off or Redis is unavailable"""
+    if not settings.SYNC_SHARDING:
+        return HashRing()
+    try:
+        return HashRing(live_members(), vnodes=settings.SHARD_VNODES)
+    except redis.RedisError as e:
+        logger.warning(f"Shard membership unavailable, using the shared queue: {e}")
+        return HashRing()
+
+
+def route(ring: HashRing, location_id: str) -> Dict[str, Any]:
+    """apply_async() options sending a location's job to its owning node"""
+    node = ring.node_for(location_id)
+    return {"queue": shard_queue(node)} if node else {}
+
+
+# Worker lifecycle
+
+@celeryd_after_setup.connect
+def _consume_shard_queue(sender: str, instance: Any, **kwargs: Any) -> None:
+    """Each worker also consumes its own shard queue"""
+    global _node_id
+    if not settings.SYNC_SHARDING:
+        return
+    _node_id = sender
+    instance.app.amqp.queues.select_add(shard_queue(sender))
+
+
+def _heartbeat_loop(node_id: str) -> None:
+    while not _stop.wait(settings.SHARD_HEARTBEAT_SECONDS):
+        try:
+            heartbeat(node_id)
+        except redis.RedisError as e:
+            logger.warning(f"Shard heartbeat failed: {e}")
+
+
+@worker_ready.connect
+def _join(**kwargs: Any) -> None:
+    if _node_id is None:
+        return
+    heartbeat(_node_id)
+    threading.Thread(
+        target=_heartbeat_loop, args=(_node_id,), name="shard-heartbeat", daemon=True
+    ).start()
+    logger.info(f"Joined sync ring as {_node_id}")
+
+
+@worker_shutdown.connect
+def _leave(**kwargs: Any) -> None:
+    """Leave the ring promptly so its locations move on the next dispatch"""
+    if _node_id is None:
+        return
+    _stop.set()
+    try:
+        get_redis().zrem(REDIS_MEMBERS_KEY, _node_id)
+    except redis.RedisError:
+        pass  # Pruned after SHARD_MEMBER_TIMEOUT_SECONDS anyway
@@ -0,0 +1,173 @@
+"""
+Sync Jobs
+Scheduled full sync and detail hydration of installed locations
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.core.database import SessionLocal
+from app.core.lease import LeaseHeld
+from app.models.location import Location
+from app.services.contact_hydration import hydrate_location, locations_with_pending
+from app.services.contact_sync import sync_contacts
+from app.services.conversation_sync import sync_conversations
+from app.services.ghl_client import get_location_client
+from app.services.opportunity_sync import sync_opportunities
+from app.services.sync_lease import check_fence, location_sync_lease
+from app.services.sync_scheduler import dispatch, record_sync
+from app.services.task_sync import sync_tasks
+from app.workers.celery_app import celery_app
+from app.workers.sharding import current_ring, route
+
+logger = logging.getLogger(__name__)
+
+
+async def run_location_sync(db: Session, location: Location) -> Dict[str, Any]:
+    """
+    Sync contacts, then the stages that reference them: opportunities,
+    tasks and conversations
+
+    Runs under the location's sync lease, reporting the current stage.
+
+    Raises:
+        RuntimeError: If no location token can be obtained
+        LeaseHeld: If the location is already being synced
+    """
+    client = await get_location_client(db, location)
+    if not client:
+        raise RuntimeError(f"No access token for location {location.location_id}")
+
+    started = time.monotonic()
+    stages = (
+        ("contacts", sync_contacts),
+        ("opportunities", sync_opportunities),
+        ("tasks", sync_tasks),
+        ("conversations", sync_conversations),
+    )
+    result: Dict[str, Any] = {"locationId": location.location_id}
+    async with location_sync_lease(db, location) as lease:
+        for stage, sync in stages:
+            await check_fence(db, location, lease)
+            if lease:
+                await lease.report(status="running", stage=stage)
+            result[stage] = await sync(db, location, client)
+    result["seconds"] = round(time.monotonic() - started, 2)
+
+    await response_cache.invalidate_location_async(location.location_id)
+    return result
+
+
+def changed_rows(result: Dict[str, Any]) -> int:
+    """Rows a location sync changed (the scheduler's change-rate signal)"""
+    contacts = result["contacts"]
+    return (
+        contacts["synced"] + contacts["updated"] + contacts["deleted"]
+        + result["opportunities"]["contactsUpdated"]
+        + result["tasks"]["contactsUpdated"]
+        + result["conversations"]["messages"]
+    )
+
+
+@celery_app.task(name="sync.sync_location")
+def sync_location(location_id: str) -> Dict[str, Any]:
+    """
+    Full sync of one location (GHL location id)
+
+    A failed sync keeps its scheduler in-flight marker until the lease
+    expires, which doubles as retry backoff.
+    """
+    db = SessionLocal()
+    try:
+        location = db.query(Location).filter(Location.location_id == location_id).first()
+        if not location:
+            raise ValueError(f"Location not found: {location_id}")
+        try:
+            result = asyncio.run(run_location_sync(db, location))
+        except LeaseHeld as e:
+            logger.info(f"Location {location_id} is already syncing; skipped")
+            return {"locationId": location_id, "joined": True, "progress": e.progress}
+        record_sync(db, location, changed_rows(result))
+        return result
+    finally:
+        db.close()
+
+
+@celery_app.task(name="sync.schedule_syncs")
+def schedule_syncs() -> int:
+    """Dispatch the most overdue locations within the concurrency caps (beat schedule)"""
+    db = SessionLocal()
+    try:
+        location_ids = dispatch(db)
+    finally:
+        db.close()
+
+    ring = current_ring()
+    for location_id in location_ids:
+        sync_location.apply_async((location_id,), **route(ring, location_id))
+
+    return len(location_ids)
+
+
+@celery_app.task(name="sync.sync_all_locations")
+def sync_all_locations() -> int:
+    """Queue a sync for every installed location, bypassing the scheduler"""
+    db = SessionLocal()
+    try:
+        location_ids = [
+            location_id for (location_id,) in
+            db.query(Location.location_id).filter(Location.is_installed.is_(True))
+        ]
+    finally:
+        db.close()
+
+    ring = current_ring()
+    for location_id in location_ids:
+        sync_location.apply_async((location_id,), **route(ring, location_id))
+
+    logger.info(f"Queued sync for {len(location_ids)} locations")
+    return len(location_ids)
+
+
+async def _hydrate(db: Session, location: Location) -> Dict[str, Any]:
+    client = await get_location_client(db, location)
+    if not client:
+        raise RuntimeError(f"No access token for location {location.location_id}")
+
+    result = await hydrate_location(db, location, client)
+    if result["hydrated"] or result["missing"]:
+        await response_cache.invalidate_location_async(location.location_id)
+    return result
+
+
+@celery_app.task(name="sync.hydrate_location")
+def hydrate_location_task(location_id: str) -> Dict[str, Any]:
+    """Fetch details for a location's unhydrated contacts (GHL location id)"""
+    db = SessionLocal()
+    try:
+        location = db.query(Location).filter(Location.location_id == location_id).first()
+        if not location:
+            raise ValueError(f"Location not found: {location_id}")
+        return asyncio.run(_hydrate(db, location))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="sync.hydrate_pending_contacts")
+def hydrate_pending_contacts() -> int:
+    """Queue hydration for every location with unhydrated contacts (beat schedule)"""
+    db = SessionLocal()
+    try:
+        location_ids = locations_with_pending(db)
+    finally:
+        db.close()
+
+    ring = current_ring()
+    for location_id in location_ids:
+        hydrate_location_task.apply_async((location_id,), **route(ring, location_id))
+
+    return len(location_ids)
@@ -0,0 +1,439 @@
+"""
+GHL API Simulator
+
+An in-process fake of the GHL endpoints GHLClient uses, served through an
+httpx MockTransport. Tenants are synthetic and generated on demand from
+their index, so agencies with millions of contacts cost no memory.
+Latency, 429s, 5xx errors and pagination quirks can be injected globally
+or per endpoint (named like the client's circuit breakers).
+
+    from app.services.ghl_client import set_transport
+    simulator = GHLSimulator(companies=2, contacts_per_location=5000,
+                             faults=Faults(latency=0.05, error_rate=0.01))
+    set_transport(simulator.transport())
+"""
+import asyncio
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import httpx
+import orjson
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FIRST_NAMES = ["ava", "liam", "noah", "emma", "mia", "lucas", "zoe", "ethan", "ivy", "owen"]
+LAST_NAMES = [
+    "smith", "garcia", "chen", "patel", "brown", "lopez", "kim", "nguyen", "miller", "davis",
+]
+SOURCES = ["facebook", "google ads", "website form", "referral", None]
+STAGES = ["new", "contacted", "qualified", "proposal", "won"]
+
+
+@dataclass
+class Faults:
+    """
+    Injected misbehaviour (rates are per request, 0-1)
+
+    Attributes:
+        latency: Base latency added to every request (seconds)
+        jitter: Extra uniform random latency (seconds)
+        tail_rate / tail_latency: Share of requests that are slow, and by how much
+        throttle_rate: Share of requests answered 429 (with Retry-After)
+        retry_after: Retry-After header value for 429s
+        error_rate: Share of requests answered with a random 5xx
+        page_size_cap: Silently serve at most this many items per page
+        short_page_rate: Share of pages missing their last item
+        total_drift: Reported totals are off by up to this many items
+        growth_per_request: Contacts added on every contact search (the
+            newest ones, so they shift newest-first pages)
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    tail_rate: float = 0.0
+    tail_latency: float = 1.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    error_rate: float = 0.0
+    page_size_cap: Optional[int] = None
+    short_page_rate: float = 0.0
+    total_drift: int = 0
+    growth_per_request: int = 0
+
+
+class GHLSimulator:
+    """
+    Synthetic GHL agencies served over an httpx transport
+
+    Company c has `locations_per_company` installed locations; location
+    ids are "sim-loc-<c>-<n>". Contacts, opportunities and tasks of a
+    location are pure functions of their index (newest contact has the
+    highest index), so pagination is stable unless a fault shifts it.
+    churn() changes a share of contacts between syncs.
+    """
+
+    def __init__(
+        self,
+        companies: int = 1,
+        locations_per_company: int = 3,
+        contacts_per_location: int = 1000,
+        opportunities_per_contact: float = 0.5,
+        tasks_per_contact: float = 0.5,
+        custom_fields: int = 20,
+        faults: Optional[Faults] = None,
+        endpoint_faults: Optional[Dict[str, Faults]] = None,
+        seed: int = 0,
+    ):
+        self.company_ids = [f"sim-company-{c}" for c in range(companies)]
+        self.locations_per_company = locations_per_company
+        self.opportunities_per_contact = opportunities_per_contact
+        self.tasks_per_contact = tasks_per_contact
+        self.custom_fields = custom_fields
+        self.faults = faults or Faults()
+        self.endpoint_faults = endpoint_faults or {}
+        self.random = random.Random(seed)
+
+        self.contact_counts: Dict[str, int] = {
+            location_id: contacts_per_location
+            for company_id in self.company_ids
+            for location_id in self.location_ids(company_id)
+        }
+        self.revision = 0
+        self.churned_per_mille = 0
+
+        # Counters
+        self.requests: Counter = Counter()
+        self.statuses: Counter = Counter()
+
+        self._routes: List[Tuple[str, "re.Pattern[str]", str, Callable]] = [
+            ("POST", re.compile(r"/oauth/token"), "oauth.token", self._token),
+            (
+                "POST", re.compile(r"/oauth/locationToken"), "oauth.locationToken",
+                self._location_token,
+            ),
+            (
+                "GET", re.compile(r"/oauth/installedLocations"), "oauth.installedLocations",
+                self._installed_locations,
+            ),
+            ("POST", re.compile(r"/contacts/search"), "contacts.search", self._search_contacts),
+            ("GET", re.compile(r"/contacts/(?P<id>[^/]+)"), "contacts.get", self._get_contact),
+            (
+                "GET", re.compile(r"/opportunities/search"), "opportunities.search",
+                self._search_opportunities,
+            ),
+            ("GET", re.compile(r"/tasks/search"), "tasks.search", self._search_tasks),
+            ("GET", re.compile(r"/locations/(?P<id>[^/]+)"), "locations.get", self._get_location),
+        ]
+
+    # Tenant data
+
+    def location_ids(self, company_id: str) -> List[str]:
+        index = company_id.rsplit("-", 1)[-1]
+        return [f"sim-loc-{index}-{n}" for n in range(self.locations_per_company)]
+
+    def company_of(self, location_id: str) -> Optional[str]:
+        if location_id not in self.contact_counts:
+            return None
+        return f"sim-company-{location_id.split('-')[2]}"
+
+    def churn(self, fraction: float) -> None:
+        """Change `fraction` of every location's contacts (new revision of their names and tags)"""
+        self.revision += 1
+        self.churned_per_mille = int(fraction * 1000)
+
+    def _changed(self, index: int) -> bool:
+        return (index * 2654435761) % 1000 < self.churned_per_mille
+
+    def contact(self, location_id: str, index: int, detail: bool = False) -> Dict[str, Any]:
+        revision = self.revision if self._changed(index) else 0
+        first = FIRST_NAMES[index % len(FIRST_NAMES)]
+        last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        added = EPOCH + timedelta(minutes=index)
+        contact = {
+            "id": f"{location_id}-c{index}",
+            "locationId": location_id,
+            "contactName": f"{first} {last}",
+            "firstName": first,
+            "lastName": last if not revision else f"{last}-{revision}",
+            "email": f"{first}.{last}.{index}@example.com",
+            "phone": f"+1555{index:07d}",
+            "timezone": "America/New_York",
+            "country": "US",
+            "source": SOURCES[index % len(SOURCES)],
+            "tags": ["lead", f"rev-{revision}"] if revision else ["lead"],
+            "dateAdded": added.isoformat().replace("+00:00", "Z"),
+            "dateUpdated": (added + timedelta(days=revision)).isoformat().replace("+00:00", "Z"),
+            "customFields": [
+                {"id": f"field-{n}", "value": f"value {n} of contact {index}"}
+                for n in range(self.custom_fields)
+            ],
+            "attributions": [
+                {"utmSource": "google", "url": "https://example.com/landing", "isFirst": True}
+            ],
+        }
+        if detail:
+            contact.update({
+                "address1": f"{index} Main St",
+                "businessId": None,
+                "assignedTo": f"user-{index % 5}",
+                "attributionSource": contact["attributions"][0],
+                "followers": [],
+            })
+        return contact
+
+    def opportunity(self, location_id: str, index: int, contacts: int) -> Dict[str, Any]:
+        contact_index = index % contacts
+        created = EPOCH + timedelta(hours=index)
+        return {
+            "id": f"{location_id}-o{index}",
+            "name": f"Deal {index}",
+            "pipelineId": "pipeline-1",
+            "pipelineStageId": STAGES[index % len(STAGES)],
+            "status": "won" if index % len(STAGES) == len(STAGES) - 1 else "open",
+            "monetaryValue": float(500 + (index % 20) * 250),
+            "contactId": f"{location_id}-c{contact_index}",
+            "contact": {"id": f"{location_id}-c{contact_index}"},
+            "createdAt": created.isoformat(),
+            "updatedAt": created.isoformat(),
+        }
+
+    def task(self, location_id: str, index: int, contacts: int) -> Dict[str, Any]:
+        completed = index % 3 == 0
+        due = EPOCH + timedelta(days=index % 60)
+        return {
+            "id": f"{location_id}-t{index}",
+            "title": f"Follow up {index}",
+            "body": "Call back about the proposal",
+            "contactId": f"{location_id}-c{index % contacts}",
+            "assignedTo": f"user-{index % 5}",
+            "dueDate": due.isoformat(),
+            "completed": completed,
+            "dateCompleted": due.isoformat() if completed else None,
+        }
+
+    def location(self, location_id: str) -> Dict[str, Any]:
+        return {
+            "_id": location_id,
+            "id": location_id,
+            "companyId": self.company_of(location_id),
+            "name": f"Location {location_id}",
+            "address": "1 Market St",
+            "city": "Springfield",
+            "state": "IL",
+            "country": "US",
+            "postalCode": "62701",
+            "timezone": "America/Chicago",
+            "email": f"{location_id}@example.com",
+            "phone": "+15550000000",
+            "website": "https://example.com",
+            "isInstalled": True,
+        }
+
+    # Pagination
+
+    def _page(
+        self,
+        faults: Faults,
+        total: int,
+        page: int,
+        limit: int,
+        item: Callable[[int], Dict[str, Any]],
+        order: Optional[Callable[[int], int]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Items of a 1-based page and the reported total
+
+        `order` maps a position to an item index (default: newest first).
+        """
+        if faults.page_size_cap:
+            limit = min(limit, faults.page_size_cap)
+        start = (page - 1) * limit
+        positions = range(start, min(start + limit, total))
+        if positions and self.random.random() < faults.short_page_rate:
+            positions = positions[:-1]
+        order = order or (lambda position: total - 1 - position)
+        items = [item(order(position)) for position in positions]
+        if faults.total_drift:
+            total = max(0, total + self.random.randint(-faults.total_drift, faults.total_drift))
+        return items, total
+
+    def _contact_order(self, total: int, sort: List[Dict[str, Any]]) -> Callable[[int], int]:
+        """Position -> contact index for a /contacts/search sort (dateAdded or dateUpdated)"""
+        field = sort[0].get("field", "dateUpdated") if sort else "dateUpdated"
+        descending = (sort[0].get("direction", "desc") if sort else "desc") == "desc"
+        if field == "dateAdded":
+            # Index order is dateAdded order
+            if descending:
+                return lambda position: total - 1 - position
+            return lambda position: position
+
+        # dateUpdated: churned contacts move `revision` days later (see contact())
+        def updated(index: int) -> Tuple[int, int]:
+            days = self.revision if self._changed(index) else 0
+            return index + days * 24 * 60, index
+
+        indexes = sorted(range(total), key=updated, reverse=descending)
+        return indexes.__getitem__
+
+    # Routes
+
+    def _token(self, request: httpx.Request, form: Dict[str, str], **_: Any) -> httpx.Response:
+        company_id = self.company_ids[0]
+        if form.get("grant_type") == "authorization_code" and form.get("code") in self.company_ids:
+            company_id = form["code"]
+        return _json(200, {
+            "access_token": f"sim-agency-{company_id}",
+            "refresh_token": f"sim-refresh-{company_id}",
+            "expires_in": 86399,
+            "companyId": company_id,
+            "userType": "Company",
+        })
+
+    def _location_token(
+        self, request: httpx.Request, form: Dict[str, str], **_: Any
+    ) -> httpx.Response:
+        location_id = form.get("locationId")
+        if self.company_of(location_id or "") != form.get("companyId"):
+            return _json(400, {"message": "Location not found for company"})
+        return _json(200, {"access_token": f"sim-location-{location_id}", "expires_in": 86399})
+
+    def _installed_locations(
+        self, request: httpx.Request, faults: Faults, **_: Any
+    ) -> httpx.Response:
+        params = request.url.params
+        company_id = params.get("companyId")
+        if company_id not in self.company_ids:
+            return _json(200, {"locations": [], "count": 0})
+        location_ids = self.location_ids(company_id)
+        skip, limit = int(params.get("skip", 0)), int(params.get("limit", 100))
+        if faults.page_size_cap:
+            limit = min(limit, faults.page_size_cap)
+        return _json(200, {
+            "locations": [
+                self.location(location_id) for location_id in location_ids[skip:skip + limit]
+            ],
+            "count": len(location_ids),
+        })
+
+    def _search_contacts(self, request: httpx.Request, faults: Faults, **_: Any) -> httpx.Response:
+        body = orjson.loads(request.content)
+        location_id = body.get("locationId")
+        if location_id not in self.contact_counts:
+            return _json(400, {"message": "Unknown location"})
+        self.contact_counts[location_id] += faults.growth_per_request
+        total = self.contact_counts[location_id]
+        contacts, total = self._page(
+            faults,
+            total,
+            int(body.get("page", 1)),
+            int(body.get("pageLimit", 100)),
+            lambda index: self.contact(location_id, index),
+            order=self._contact_order(total, body.get("sort") or []),
+        )
+        return _json(200, {"contacts": contacts, "total": total, "count": len(contacts)})
+
+    def _get_contact(self, request: httpx.Request, id: str, **_: Any) -> httpx.Response:
+        location_id, _, index = id.rpartition("-c")
+        if location_id not in self.contact_counts or not index.isdigit():
+            return _json(400, {"message": "Contact not found"})
+        if int(index) >= self.contact_counts[location_id]:
+            return _json(404, {"message": "Contact not found"})
+        return _json(200, {"contact": self.contact(location_id, int(index), detail=True)})
+
+    def _search_opportunities(
+        self, request: httpx.Request, faults: Faults, **_: Any
+    ) -> httpx.Response:
+        params = request.url.params
+        location_id = params.get("location_id")
+        contacts = self.contact_counts.get(location_id)
+        if not contacts:
+            return _json(200, {"opportunities": [], "meta": {"total": 0}})
+        opportunities, total = self._page(
+            faults,
+            int(contacts * self.opportunities_per_contact),
+            int(params.get("page", 1)),
+            int(params.get("limit", 100)),
+            lambda index: self.opportunity(location_id, index, contacts),
+        )
+        return _json(200, {"opportunities": opportunities, "meta": {"total": total}})
+
+    def _search_tasks(self, request: httpx.Request, faults: Faults, **_: Any) -> httpx.Response:
+        params = request.url.params
+        location_id = params.get("locationId")
+        contacts = self.contact_counts.get(location_id)
+        if not contacts:
+            return _json(200, {"tasks": [], "meta": {"total": 0}})
+        tasks, total = self._page(
+            faults,
+            int(contacts * self.tasks_per_contact),
+            int(params.get("page", 1)),
+            int(params.get("limit", 100)),
+            lambda index: self.task(location_id, index, contacts),
+        )
+        return _json(200, {"tasks": tasks, "meta": {"total": total}})
+
+    def _get_location(self, request: httpx.Request, id: str, **_: Any) -> httpx.Response:
+        if id not in self.contact_counts:
+            return _json(404, {"message": "Location not found"})
+        return _json(200, {"location": self.location(id)})
+
+    # Transport
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        for method, pattern, endpoint, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if request.method == method and match:
+                break
+        else:
+            message = f"No route for {request.method} {path}"
+            return self._count("unrouted", _json(404, {"message": message}))
+
+        faults = self.endpoint_faults.get(endpoint, self.faults)
+        delay = faults.latency + self.random.uniform(0, faults.jitter)
+        if self.random.random() < faults.tail_rate:
+            delay += faults.tail_latency
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.random.random() < faults.throttle_rate:
+            return self._count(endpoint, _json(
+                429, {"message": "Too many requests"},
+                headers={"Retry-After": str(faults.retry_after)},
+            ))
+        if self.random.random() < faults.error_rate:
+            status = self.random.choice([500, 502, 503, 504])
+            return self._count(endpoint, _json(status, {"message": "Upstream error"}))
+
+        authorized = request.headers.get("Authorization", "").startswith("Bearer sim-")
+        if endpoint != "oauth.token" and not authorized:
+            return self._count(endpoint, _json(401, {"message": "Invalid token"}))
+
+        # OAuth endpoints take form bodies
+        form = dict(parse_qsl(request.content.decode())) if endpoint.startswith("oauth.") else {}
+        response = handler(request, faults=faults, form=form, **match.groupdict())
+        return self._count(endpoint, response)
+
+    def _count(self, endpoint: str, response: httpx.Response) -> httpx.Response:
+        self.requests[endpoint] += 1
+        self.statuses[response.status_code] += 1
+        return response
+
+    def transport(self) -> httpx.MockTransport:
+        """Transport to pass to ghl_client.set_transport()"""
+        return httpx.MockTransport(self.handle)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": dict(self.requests), "statuses": dict(self.statuses)}
+
+
+def _json(status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    return httpx.Response(
+        status,
+        content=orjson.dumps(payload),
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
@@ -1,14 +1,34 @@
 """
 CyclSales Dashboard API - Main Application Entry Point
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from app.core.config import settings
 from app.core.security import SecurityHeaders
-from app.api.v1 import oauth, webhooks, locations, contacts, auth
+from app.core.crypto_executor import crypto_executor
+from app.core.session_tracker import session_tracker
+from app.core.cache import response_cache
+from app.core.redis import close_redis
+from app.core.singleflight import ghl_singleflight
+from app.core.circuit_breaker import ghl_breakers
+from app.core.hedging import ghl_hedger
+from app.api.v1 import oauth, webhooks, locations, contacts, opportunities, auth, analytics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background services"""
+    session_tracker.start()
+    yield
+    await session_tracker.stop()
+    crypto_executor.shutdown()
+    await close_redis()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -19,6 +39,8 @@ app = FastAPI(
     docs_url=None,  # Disable default docs
     redoc_url=None,  # Disable default redoc
     openapi_url=None,  # Disable default OpenAPI
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson instead of stdlib json
 )
 
 
@@ -60,8 +82,16 @@ if not settings.DEBUG:
 app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["Authentication"])
 app.include_router(oauth.router, prefix=f"{settings.API_V1_PREFIX}/oauth", tags=["OAuth"])
 app.include_router(webhooks.router, prefix=f"{settings.API_V1_PREFIX}/webhooks", tags=["Webhooks"])
-app.include_router(locations.router, prefix=f"{settings.API_V1_PREFIX}/locations", tags=["Locations"])
+app.include_router(
+    locations.router, prefix=f"{settings.API_V1_PREFIX}/locations", tags=["Locations"]
+)
 app.include_router(contacts.router, prefix=f"{settings.API_V1_PREFIX}/contacts", tags=["Contacts"])
+app.include_router(
+    opportunities.router, prefix=f"{settings.API_V1_PREFIX}/opportunities", tags=["Opportunities"]
+)
+app.include_router(
+    analytics.router, prefix=f"{settings.API_V1_PREFIX}/analytics", tags=["Analytics"]
+)
 
 
 @app.get("/")
@@ -98,6 +128,19 @@ async def get_openapi(admin_ip: str = Depends(check_admin_ip)):
     return JSONResponse(app.openapi())
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(admin_ip: str = Depends(check_admin_ip)):
+    """Protected runtime metrics for internal subsystems"""
+    return {
+        "cryptoPool": crypto_executor.stats(),
+        "sessions": session_tracker.stats(),
+        "responseCache": response_cache.stats(),
+        "ghlRequests": ghl_singleflight.stats(),
+        "ghlBreakers": ghl_breakers.stats(),
+        "ghlHedging": ghl_hedger.stats(),
+    }
+
+
 @app.get("/docs", include_in_schema=False)
 async def get_documentation(admin_ip: str = Depends(check_admin_ip)):
     """Protected Swagger UI documentation"""
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+sys.path.insert(0, BENCHMARKS)
+
+from app.core.database import Base  # noqa: E402
+from app.models.contact import Contact  # noqa: E402
+from app.models.location import Location  # noqa: E402
+from app.services.contact_sync import sync_contacts  # noqa: E402
+from app.services.ghl_client import GHLClient, set_transport  # noqa: E402
+from ghl_simulator import Faults, GHLSimulator  # noqa: E402
+
+CONTACTS = 450
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _simulate(db, faults: Faults):
+    simulator = GHLSimulator(
+        locations_per_company=1, contacts_per_location=CONTACTS, custom_fields=2, faults=faults
+    )
+    set_transport(simulator.transport())
+    company_id = simulator.company_ids[0]
+    location_id = simulator.location_ids(company_id)[0]
+    location = Location(location_id=location_id, name="Simulated", company_id=company_id)
+    db.add(location)
+    db.commit()
+    return simulator, location, GHLClient(access_token=f"sim-location-{location_id}")
+
+
+@pytest.fixture(autouse=True)
+def _restore_transport():
+    yield
+    set_transport(None)
+
+
+def _stored_ids(db, location: Location) -> set:
+    rows = db.query(Contact.external_id).filter(Contact.location_id == location.id)
+    return {external_id for (external_id,) in rows}
+
+
+@pytest.mark.asyncio
+async def test_churn_and_growth_never_delete_live_contacts(db):
+    simulator, location, client = _simulate(db, Faults(growth_per_request=3))
+    live = {simulator.contact(location.location_id, index)["id"] for index in range(CONTACTS)}
+
+    first = await sync_contacts(db, location, client)
+    simulator.churn(0.2)
+    second = await sync_contacts(db, location, client)
+
+    assert first["deleted"] == second["deleted"] == 0
+    assert second["updated"] > 0
+    assert live <= _stored_ids(db, location)
+
+
+@pytest.mark.asyncio
+async def test_capped_pages_skip_the_sweep(db):
+    simulator, location, client = _simulate(db, Faults(page_size_cap=70, growth_per_request=2))
+    await sync_contacts(db, location, client)
+    stored = _stored_ids(db, location)
+
+    simulator.churn(0.1)
+    result = await sync_contacts(db, location, client)
+
+    assert result["deleted"] == 0
+    assert stored <= _stored_ids(db, location)
+
+
+@pytest.mark.asyncio
+async def test_complete_pass_sweeps_contacts_deleted_in_ghl(db):
+    simulator, location, client = _simulate(db, Faults())
+    await sync_contacts(db, location, client)
+
+    # The 10 newest contacts are deleted in GHL
+    simulator.contact_counts[location.location_id] -= 10
+    result = await sync_contacts(db, location, client)
+
+    live = {simulator.contact(location.location_id, index)["id"] for index in range(CONTACTS - 10)}
+    assert result["deleted"] == 10
+    assert _stored_ids(db, location) == live
@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.hedging import Hedger
+
+
+def _hedger() -> Hedger:
+    hedger = Hedger(budget_percent=100, burst=10, min_samples=1, min_delay=0.01)
+    hedger._tokens = 10
+    hedger._endpoint("contacts.get").latencies.append(0.01)
+    return hedger
+
+
+def _attempts(*outcomes):
+    """Attempt factory returning (delay, status) outcomes in call order"""
+    calls = iter(outcomes)
+
+    async def attempt() -> httpx.Response:
+        delay, status = next(calls)
+        await asyncio.sleep(delay)
+        return httpx.Response(status)
+
+    return attempt
+
+
+def _succeeded(response: httpx.Response) -> bool:
+    return response.status_code < 400
+
+
+@pytest.mark.asyncio
+async def test_error_from_hedge_does_not_beat_slower_success():
+    hedger = _hedger()
+    attempt = _attempts((0.2, 200), (0.0, 400))
+
+    response = await hedger.run("contacts.get", attempt, succeeded=_succeeded)
+
+    assert response.status_code == 200
+    stats = hedger.stats()["endpoints"]["contacts.get"]
+    assert stats["hedged"] == 1
+    assert stats["primaryWins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_faster_successful_hedge_wins():
+    hedger = _hedger()
+    attempt = _attempts((0.2, 200), (0.0, 200))
+
+    response = await hedger.run("contacts.get", attempt, succeeded=_succeeded)
+
+    assert response.status_code == 200
+    assert hedger.stats()["endpoints"]["contacts.get"]["hedgeWins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_neither_succeeding_returns_a_failed_response():
+    hedger = _hedger()
+    attempt = _attempts((0.1, 503), (0.0, 404))
+
+    response = await hedger.run("contacts.get", attempt, succeeded=_succeeded)
+
+    assert response.status_code in (404, 503)